@@ -1,11 +1,27 @@
 from django.contrib import admin
+from django.contrib.admin.views.main import ChangeList
+from django.db.models import F
 
+from .calendar import enqueue_activity_update
 from .models import Activity, ActivityStatus, FriendStatus, Category, User
+from .models.activity import CALENDAR_FIELDS
 from .forms import ActivityAdminForm
 
 
+# Rows per changelist page of the large tables, each page is one query
+LARGE_TABLE_PER_PAGE = 50
+
+
+class ActivityChangeList(ChangeList):
+    """Changelist that loads activities without the columns it does not display."""
+
+    def get_queryset(self, request, *args, **kwargs):
+        return super().get_queryset(request, *args, **kwargs).for_listing()
+
+
 class ActivityAdmin(admin.ModelAdmin):
     form = ActivityAdminForm
+    autocomplete_fields = ['owner']
     fieldsets = [
         ('Required', {
             'fields': ['title', 'owner', 'description']
@@ -33,15 +49,38 @@ class ActivityAdmin(admin.ModelAdmin):
         'time_remain', 'is_published', 'was_published_recently',
         'can_participate')
 
-    list_filter = ['owner']
+    list_filter = [('owner', admin.RelatedOnlyFieldListFilter)]
     search_fields = ['title']
     ordering = ('title',)
     filter_horizontal = ('categories',)
+    list_per_page = LARGE_TABLE_PER_PAGE
+    show_full_result_count = False  # Skip the second COUNT of the whole table when filtering
+
+    def get_queryset(self, request):
+        # The remaining space is computed by the database, so the column can be sorted
+        return super().get_queryset(request).annotate(
+            remaining=F('participant_limit') - F('participant_count'))
+
+    def get_changelist(self, request, **kwargs):
+        return ActivityChangeList
+
+    @admin.display(description='Remaining', ordering='remaining')
+    def remaining_space(self, obj: Activity) -> int | None:
+        """Read the remaining space annotated on the changelist row."""
+        return obj.remaining if obj.participant_limit else None
+
+    def save_model(self, request, obj, form, change):
+        super().save_model(request, obj, form, change)
+        if change and CALENDAR_FIELDS.intersection(form.changed_data):
+            enqueue_activity_update(obj)
 
 
 class UserAdmin(admin.ModelAdmin):
     list_display = ['username', 'email', 'bio']
     ordering = ['username']
+    search_fields = ['username']
+    list_per_page = LARGE_TABLE_PER_PAGE
+    show_full_result_count = False
 
 
 class FriendStatusAdmin(admin.ModelAdmin):
@@ -62,6 +101,9 @@ class ActivityStatusAdmin(admin.ModelAdmin):
         'is_favorited', 'participation_date'
     ]
     ordering = ['participants', 'activity']
+    autocomplete_fields = ['participants', 'activity']
+    list_per_page = LARGE_TABLE_PER_PAGE
+    show_full_result_count = False
 
 
 class CategoryAdmin(admin.ModelAdmin):
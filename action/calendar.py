@@ -1,64 +1,264 @@
-from django.contrib.auth.decorators import login_required
-from action.utils import build_service, get_event_json_data, get_event_id
+from google.auth.exceptions import RefreshError
+from googleapiclient.errors import HttpError
 
+from django.db.models import F
 
-@login_required
-def create_event(request, activity_id):
+from action.models import Activity, ActivityStatus, CalendarEventLink, User
+from action.tasks import enqueue, enqueue_many
+from action.utils import build_service, forget_credentials, get_event_body, get_event_id
+
+# The Calendar API accepts at most 50 calls in one batch request
+BATCH_SIZE = 50
+
+# Responses of the Calendar API for an event that does not exist anymore
+GONE_STATUSES = (404, 410)
+
+# Response of the Calendar API to an insert whose event ID is already taken
+CONFLICT_STATUS = 409
+
+
+def create_event(user, activity_id):
     """
     Create a Google Calendar event for the specified activity.
 
+    The event ID is derived from the user and the activity, so an insert that already
+    succeeded in an earlier or concurrent run is refused with 409. The existing event is
+    then updated instead, which also restores an event deleted when the user left before.
+
     Args:
-        request (HttpRequest): The HTTP request object.
+        user (User): A user logged in with Google.
         activity_id (int): ID of the activity.
     """
-    activity_id = str(activity_id)  # use string
-    service = build_service(request)
+    activity = Activity.objects.get(pk=activity_id)
+    service = build_service(user)
 
     if service:
-        data = get_event_json_data(activity_id, generate_event_id=True)
-        request.user.event_encoder[activity_id] = data[activity_id]['id']
-        request.user.save()
-        service.events().insert(calendarId='primary', body=data[activity_id]).execute()
+        event_id = get_event_id(user.id, activity.id)
+        try:
+            service.events().insert(calendarId='primary',
+                                    body={'id': event_id, **get_event_body(activity)}).execute()
+        except HttpError as error:
+            if error.resp.status != CONFLICT_STATUS:
+                raise
+            service.events().update(calendarId='primary', eventId=event_id,
+                                    body={**get_event_body(activity), 'status': 'confirmed'}).execute()
+        CalendarEventLink.objects.update_or_create(
+            user=user, activity=activity,
+            defaults={'event_id': event_id, 'synced_version': activity.calendar_version})
 
 
-@login_required
-def update_event(request, activity_id):
+def update_event(user, activity_id):
     """
     Update the event in Google Calendar associated with the specified activity.
 
     Args:
-        request (HttpRequest): The HTTP request object.
+        user (User): A user logged in with Google.
         activity_id (int): The ID of the activity whose event in Google Calendar is to be updated.
-
-    Returns:
-        HttpResponse: The HTTP response indicating the success or failure of the update.
     """
-    activity_id = str(activity_id)  # use string
-
-    # Get the existing event
-    service = build_service(request)
-    event_id = get_event_id(request, activity_id)
+    link = CalendarEventLink.objects.select_related('activity').get(user=user, activity_id=activity_id)
+    service = build_service(user)
 
     # Update the event in Google Calendar
-    updated_event = get_event_json_data(activity_id)
-    service.events().update(calendarId='primary', eventId=event_id,
-                            body=updated_event[activity_id]).execute()
+    service.events().update(calendarId='primary', eventId=link.event_id,
+                            body=get_event_body(link.activity)).execute()
+    link.synced_version = link.activity.calendar_version
+    link.save(update_fields=['synced_version'])
+
+
+def delete_event(user, event_id: str):
+    """
+    Delete an event from the Google Calendar of a user.
+
+    Args:
+        user (User): A user logged in with Google.
+        event_id (str): The ID of the event.
+    """
+    service = build_service(user)
+    try:
+        service.events().delete(calendarId='primary', eventId=event_id).execute()
+    except HttpError as error:
+        if error.resp.status not in GONE_STATUSES:
+            raise  # Deleted by the user in Google Calendar is fine, anything else is retried
 
 
-@login_required
-def remove_event(request, activity_id):
+def remove_event(user, activity_id):
     """
     Remove the Google Calendar event associated with the specified activity.
 
     Args:
-        request (HttpRequest): The HTTP request object.
+        user (User): A user logged in with Google.
         activity_id (int): ID of the activity.
     """
-    activity_id = str(activity_id)  # use string
-    service = build_service(request)
+    link = CalendarEventLink.objects.get(user=user, activity_id=activity_id)
+    delete_event(user, link.event_id)
+    link.delete()
 
-    if service:
-        encoded_event = get_event_id(request, activity_id)
-        service.events().delete(calendarId='primary', eventId=encoded_event).execute()
-        del request.user.event_encoder[activity_id]  # delete event IN user attribute
-        request.user.save()
+
+def sync_events(user) -> int:
+    """
+    Update the Google Calendar events of the activities that changed since the last sync.
+
+    The events whose activity has a newer calendar_version are selected in one query, and
+    sent through one service in batch requests of up to BATCH_SIZE updates.
+
+    Args:
+        user (User): A user logged in with Google.
+
+    Returns:
+        int: The number of events updated.
+    """
+    links = {
+        str(link.id): link
+        for link in CalendarEventLink.objects.select_related('activity').filter(
+            user=user, synced_version__lt=F('activity__calendar_version'),
+            activity__activity__participants=user, activity__activity__is_participated=True).order_by('id')
+    }
+    if not links:
+        return 0
+
+    service = build_service(user)
+    synced = []
+
+    def record_update(link_id, response, exception):
+        # Failed updates are not recorded, so they are retried on the next sync
+        if exception is None:
+            link = links[link_id]
+            link.synced_version = link.activity.calendar_version
+            synced.append(link)
+
+    link_items = list(links.items())
+    for start in range(0, len(link_items), BATCH_SIZE):
+        batch = service.new_batch_http_request(callback=record_update)
+        for link_id, link in link_items[start:start + BATCH_SIZE]:
+            batch.add(service.events().update(calendarId='primary', eventId=link.event_id,
+                                              body=get_event_body(link.activity)),
+                      request_id=link_id)
+        batch.execute()
+
+    CalendarEventLink.objects.bulk_update(synced, ['synced_version'], batch_size=500)
+    return len(synced)
+
+
+def sync_activity_event(user_id: int, activity_id: int) -> None:
+    """
+    Task: add, update or remove the calendar event of an activity, following the user's
+    participation and the activity's calendar_version.
+
+    The task looks at the current state rather than at what was clicked, so running it
+    late, twice, or after a quick participate-leave-participate always ends up right.
+    Creating the event is safe to repeat too, see create_event.
+
+    Args:
+        user_id (int): The ID of a user logged in with Google.
+        activity_id (int): The ID of the activity.
+    """
+    user = User.objects.get(id=user_id)
+    calendar_version = ActivityStatus.objects.filter(
+        participants=user, activity_id=activity_id, is_participated=True) \
+        .values_list('activity__calendar_version', flat=True).first()
+    link = CalendarEventLink.objects.filter(user=user, activity_id=activity_id).first()
+
+    try:
+        if calendar_version is not None and link is None:
+            create_event(user, activity_id)
+        elif calendar_version is None and link is not None:
+            remove_event(user, activity_id)
+        elif calendar_version is not None and link.synced_version != calendar_version:
+            update_event(user, activity_id)
+    except RefreshError:
+        forget_credentials(user_id)  # The token changed in another process, reload it on retry
+        raise
+
+
+def sync_user_events(user_id: int) -> None:
+    """
+    Task: update the calendar events of a user, see sync_events.
+
+    Args:
+        user_id (int): The ID of a user logged in with Google.
+    """
+    try:
+        sync_events(User.objects.get(id=user_id))
+    except RefreshError:
+        forget_credentials(user_id)  # The token changed in another process, reload it on retry
+        raise
+
+
+def delete_user_event(user_id: int, event_id: str) -> None:
+    """
+    Task: delete an event whose activity does not exist anymore.
+
+    Args:
+        user_id (int): The ID of a user logged in with Google.
+        event_id (str): The ID of the event.
+    """
+    try:
+        delete_event(User.objects.get(id=user_id), event_id)
+    except RefreshError:
+        forget_credentials(user_id)  # The token changed in another process, reload it on retry
+        raise
+
+
+def enqueue_activity_event_sync(user, activity_id: int):
+    """
+    Queue the calendar update of a user's participation in an activity.
+
+    Args:
+        user (User): A user logged in with Google.
+        activity_id (int): The ID of the activity joined or left.
+    """
+    enqueue(sync_activity_event, idempotency_key=f'calendar:{user.id}:{activity_id}',
+            user_id=user.id, activity_id=activity_id)
+
+
+def enqueue_activity_update(activity: Activity) -> int:
+    """
+    Mark an edited activity as changed and queue the update of its participants' events.
+
+    Only users who have an event for the activity are queued, with one task each,
+    inserted in bulk. Each of them then sends exactly this one event update.
+
+    Args:
+        activity (Activity): The activity whose calendar fields were edited.
+
+    Returns:
+        int: The number of participants whose event will be updated.
+    """
+    Activity.objects.filter(pk=activity.pk).update(calendar_version=F('calendar_version') + 1)
+    activity.refresh_from_db(fields=['calendar_version'])
+
+    user_ids = list(CalendarEventLink.objects.filter(activity=activity).values_list('user_id', flat=True))
+    enqueue_many(sync_activity_event, [
+        (f'calendar:{user_id}:{activity.pk}', {'user_id': user_id, 'activity_id': activity.pk})
+        for user_id in user_ids
+    ])
+    return len(user_ids)
+
+
+def enqueue_activity_removal(activity: Activity) -> int:
+    """
+    Queue the deletion of the calendar events of an activity that is being deleted.
+
+    The event IDs are copied into the tasks, since the links are deleted with the activity.
+
+    Args:
+        activity (Activity): The activity being deleted.
+
+    Returns:
+        int: The number of events that will be deleted.
+    """
+    events = list(CalendarEventLink.objects.filter(activity=activity).values_list('user_id', 'event_id'))
+    enqueue_many(delete_user_event, [
+        (None, {'user_id': user_id, 'event_id': event_id}) for user_id, event_id in events
+    ])
+    return len(events)
+
+
+def enqueue_user_events_sync(user):
+    """
+    Queue the update of all calendar events of a user.
+
+    Args:
+        user (User): A user logged in with Google.
+    """
+    enqueue(sync_user_events, idempotency_key=f'calendar:{user.id}', user_id=user.id)
@@ -78,7 +78,7 @@ def get_background_data(cleaned_data, activity_id) -> dict[str, str]:
         activity_id (int): ID of the activity.
 
     Returns:
-        dict: base64-encoded background data.
+        dict: Hashes of the stored background images.
     """
     background_file = cleaned_data.get('background_picture')
     existing_activity = Activity.objects.filter(id=activity_id)
@@ -86,7 +86,7 @@ def get_background_data(cleaned_data, activity_id) -> dict[str, str]:
     if background_file is None and existing_activity.exists():
         return existing_activity[0].background_picture
 
-    return utils.background_image_to_base64(background_file)
+    return utils.store_background_images(background_file)
 
 
 class ActivityForm(forms.ModelForm):
@@ -142,7 +142,7 @@ class ActivityForm(forms.ModelForm):
 
         # Set the activity's picture attribute
         picture_file = self.cleaned_data.get('picture')
-        cleaned_data['picture'] = utils.image_to_base64(picture_file)
+        cleaned_data['picture'] = utils.store_image(picture_file)
         cleaned_data['background_picture'] = get_background_data(cleaned_data, self.instance.id)
 
         return cleaned_data
@@ -33,8 +33,8 @@ class UserEditForm(UserChangeForm):
 
         # Handle the picture
         image_file = self.cleaned_data.get('profile_picture')
-        cleaned_data['profile_picture'] = utils.image_to_base64(image_file)
+        cleaned_data['profile_picture'] = utils.store_image(image_file)
 
         background_image_file = self.cleaned_data.get('background_picture')
-        cleaned_data['background_picture'] = utils.image_to_base64(background_image_file)
+        cleaned_data['background_picture'] = utils.store_image(background_image_file)
         return cleaned_data
@@ -0,0 +1,89 @@
+import random
+import statistics
+import time
+
+from django.contrib.auth.models import AnonymousUser
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.test import RequestFactory
+from django.utils import timezone
+
+from action.models import Activity, User
+from action.utils.search_utils import BaseSearcher
+from action.views.index_view import ACTIVITIES_PER_PAGE
+
+# Publication dates are spread over this many days around now, start dates up to a month later
+SPREAD_DAYS = 365
+
+
+class Command(BaseCommand):
+    help = 'Time the first page of every date-based search on generated activities'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--rows', type=int, default=200_000,
+            help='Number of activities to generate (default: 200000).')
+        parser.add_argument(
+            '--runs', type=int, default=50,
+            help='Number of timed runs of each search (default: 50).')
+
+    def handle(self, *args, **options):
+        # Everything is rolled back at the end
+        with transaction.atomic():
+            self.seed(options['rows'])
+            with connection.cursor() as cursor:
+                cursor.execute(f'ANALYZE {Activity._meta.db_table}')
+
+            self.stdout.write(self.style.MIGRATE_HEADING(
+                f"First page of each search, {options['runs']} runs (ms)"))
+            for name, params in self.get_searches().items():
+                p50, p95 = self.time_search(params, options['runs'])
+                self.stdout.write(f'{name:<18} p50 {p50:8.2f}   p95 {p95:8.2f}')
+
+            transaction.set_rollback(True)
+
+    def seed(self, rows: int) -> None:
+        """Create the benchmark activities, published around now and starting after publication."""
+        self.stdout.write(f'Generating {rows} activities...')
+        now = timezone.now()
+        owners = User.objects.bulk_create(
+            [User(username=f'bench_owner_{i}', password='!') for i in range(100)])
+
+        activities = []
+        for i in range(rows):
+            pub_date = now + timezone.timedelta(minutes=random.randint(-SPREAD_DAYS, SPREAD_DAYS) * 720)
+            start_date = pub_date + timezone.timedelta(minutes=random.randint(0, 30 * 1440))
+            activities.append(Activity(owner=owners[i % len(owners)], title=f'bench {i}',
+                                       pub_date=pub_date, end_date=start_date, start_date=start_date,
+                                       last_date=start_date))
+        Activity.objects.bulk_create(activities, batch_size=5000)
+
+    def get_searches(self) -> dict[str, dict]:
+        """Return the query parameters of every date-based search."""
+        now = timezone.localtime()
+        point_format = '%Y-%m-%dT%H:%M'
+        return {
+            'upcoming': {'tag': 'upcoming'},
+            'recent': {'tag': 'recent'},
+            'date_exact': {'tag': 'date_exact', 'q': now.strftime(point_format)},
+            'date_start_point': {'tag': 'date_start_point', 'q': now.strftime(point_format)},
+            'date_end_point': {'tag': 'date_end_point',
+                               'q': (now - timezone.timedelta(days=30)).strftime(point_format)},
+            'date range': {'tag': ['date_start_point', 'date_end_point'],
+                           'q': [now.strftime(point_format),
+                                 (now + timezone.timedelta(days=7)).strftime(point_format)]},
+        }
+
+    def time_search(self, params: dict, runs: int) -> tuple[float, float]:
+        """Run a search a number of times and return the median and 95th percentile in ms."""
+        request = RequestFactory().get('/', params)
+        request.user = AnonymousUser()
+
+        timings = []
+        for _ in range(runs):
+            started = time.perf_counter()
+            list(BaseSearcher(request).get_index_query()[:ACTIVITIES_PER_PAGE])
+            timings.append((time.perf_counter() - started) * 1000)
+
+        percentiles = statistics.quantiles(timings, n=20, method='inclusive')
+        return statistics.median(timings), percentiles[18]
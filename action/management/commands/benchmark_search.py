@@ -0,0 +1,82 @@
+import random
+import string
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.utils import timezone
+
+from action.models import Activity, User
+
+WORDS = ['run', 'yoga', 'beach', 'cleanup', 'music', 'camp', 'football', 'cooking',
+         'market', 'temple', 'hiking', 'reading', 'bangkok', 'chiang', 'phuket', 'board']
+
+# The indexes created by migration 0011, on the columns searched with icontains
+TRIGRAM_INDEXES = ['action_activity_title_trgm', 'action_activity_place_trgm', 'action_user_username_trgm']
+
+
+def random_word(length: int = 8) -> str:
+    """Return a random lowercase word, so that every row has a rare substring."""
+    return ''.join(random.choices(string.ascii_lowercase, k=length))
+
+
+class Command(BaseCommand):
+    help = 'Compare the query plans of substring searches with and without the trigram indexes'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--rows', type=int, default=100_000,
+            help='Number of users and activities to generate (default: 100000).')
+
+    def handle(self, *args, **options):
+        if connection.vendor != 'postgresql':
+            raise CommandError('The trigram indexes only exist on PostgreSQL.')
+
+        # Everything, including the dropped indexes, is rolled back at the end
+        with transaction.atomic():
+            activity, user = self.seed(options['rows'])
+            searches = {
+                'Activity.title icontains': Activity.objects.filter(title__icontains=activity.title[-6:]),
+                'Activity.place icontains': Activity.objects.filter(place__icontains=activity.place[-6:]),
+                'User.username icontains': User.objects.filter(username__icontains=user.username[-6:]),
+            }
+
+            with connection.cursor() as cursor:
+                # Run the deferred foreign key checks now, PostgreSQL refuses DDL while they are pending
+                cursor.execute('SET CONSTRAINTS ALL IMMEDIATE')
+                cursor.execute(f'ANALYZE {Activity._meta.db_table}')
+                cursor.execute(f'ANALYZE {User._meta.db_table}')
+
+            self.stdout.write(self.style.MIGRATE_HEADING('With trigram indexes'))
+            self.explain(searches)
+
+            with connection.cursor() as cursor:
+                for name in TRIGRAM_INDEXES:
+                    cursor.execute(f'DROP INDEX IF EXISTS {name}')
+            self.stdout.write(self.style.MIGRATE_HEADING('Without trigram indexes'))
+            self.explain(searches)
+
+            transaction.set_rollback(True)
+
+    def seed(self, rows: int) -> tuple[Activity, User]:
+        """Create the benchmark users and activities, return the last of each."""
+        self.stdout.write(f'Generating {rows} users and activities...')
+        now = timezone.now()
+
+        users = User.objects.bulk_create(
+            [User(username=f'bench_{i}_{random_word()}', password='!') for i in range(rows)],
+            batch_size=5000)
+        activities = Activity.objects.bulk_create([
+            Activity(owner=owner,
+                     title=f'{random.choice(WORDS)} {random_word()}',
+                     place=f'{random.choice(WORDS)} {random_word()}',
+                     pub_date=now, end_date=now, start_date=now, last_date=now)
+            for owner in users
+        ], batch_size=5000)
+        return activities[-1], users[-1]
+
+    def explain(self, searches: dict) -> None:
+        """Print the executed plan of every search."""
+        for name, queryset in searches.items():
+            self.stdout.write(self.style.SUCCESS(name))
+            self.stdout.write(queryset.explain(analyze=True))
+            self.stdout.write('')
@@ -0,0 +1,51 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.db.models import Count, Q
+from django.utils import timezone
+
+from action.models import Activity
+from action.utils import invalidate_page_cache
+
+
+class Command(BaseCommand):
+    help = 'Rebuild and verify the participant and favorite counters of every activity'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--check', action='store_true',
+            help='Only verify the counters, exit with an error if any is out of date.')
+
+    def handle(self, *args, **options):
+        activities = Activity.objects.only('id', 'title', 'participant_count', 'favorite_count') \
+            .annotate(
+                actual_participant_count=Count('activity', filter=Q(activity__is_participated=True)),
+                actual_favorite_count=Count('activity', filter=Q(activity__is_favorited=True)),
+            ).order_by('id')
+
+        stale_activities = []
+        for activity in activities.iterator():
+            if (activity.participant_count != activity.actual_participant_count or
+                    activity.favorite_count != activity.actual_favorite_count):
+                self.stdout.write(
+                    f'Activity {activity.id} ({activity.title}): '
+                    f'participants {activity.participant_count} -> {activity.actual_participant_count}, '
+                    f'favorites {activity.favorite_count} -> {activity.actual_favorite_count}')
+                stale_activities.append(activity)
+
+        if not stale_activities:
+            self.stdout.write(self.style.SUCCESS('All activity counters are up to date.'))
+            return
+
+        if options['check']:
+            raise CommandError(f'{len(stale_activities)} activity counters are out of date.')
+
+        now = timezone.now()
+        for activity in stale_activities:
+            activity.updated_at = now
+            activity.participant_count = activity.actual_participant_count
+            activity.favorite_count = activity.actual_favorite_count
+        Activity.objects.bulk_update(stale_activities,
+                                     ['participant_count', 'favorite_count', 'updated_at'], batch_size=500)
+        Activity.objects.filter(pk__in=[activity.id for activity in stale_activities]).refresh_popularity()
+        invalidate_page_cache()
+
+        self.stdout.write(self.style.SUCCESS(f'Rebuilt {len(stale_activities)} activity counters.'))
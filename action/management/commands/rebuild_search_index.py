@@ -0,0 +1,13 @@
+from django.core.management.base import BaseCommand
+
+from action.utils.text_search_utils import get_search_backend
+
+
+class Command(BaseCommand):
+    help = 'Recompute the full-text index of every activity'
+
+    def handle(self, *args, **options):
+        # Saves and deletes keep the index up to date through signals, this repairs it after
+        # QuerySet.update(), bulk_create(), bulk_update(), raw SQL or a change of the weights
+        get_search_backend().update_index()
+        self.stdout.write(self.style.SUCCESS('Rebuilt the full-text index.'))
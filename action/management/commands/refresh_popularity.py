@@ -0,0 +1,18 @@
+from django.core.management.base import BaseCommand
+
+from action.models import Activity
+
+
+class Command(BaseCommand):
+    help = 'Recompute the stored popularity of every activity'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size', type=int, default=1000,
+            help='Number of activities read and written at a time (default: 1000).')
+
+    def handle(self, *args, **options):
+        # Scores follow the counters on every change, this repairs them after bulk
+        # imports, raw SQL or a change of the weights in get_popularity
+        changed = Activity.objects.refresh_popularity(batch_size=options['batch_size'])
+        self.stdout.write(self.style.SUCCESS(f'Refreshed the popularity of {changed} activities.'))
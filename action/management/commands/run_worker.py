@@ -0,0 +1,53 @@
+import time
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from action.models import Task
+from action.tasks import claim_next_task, run_pending_tasks, run_task
+
+# Finished tasks are kept this long, to look into recent runs from the admin or a shell
+DONE_TASK_RETENTION = timezone.timedelta(days=1)
+
+# Seconds between two purges of the finished tasks
+PURGE_INTERVAL = 3600
+
+
+class Command(BaseCommand):
+    help = 'Run the queued background tasks, such as the Google Calendar updates'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--once', action='store_true',
+            help='Run the tasks that are due, then exit.')
+        parser.add_argument(
+            '--sleep', type=float, default=2.0,
+            help='Seconds to wait when no task is due (default: 2).')
+
+    def handle(self, *args, **options):
+        if options['once']:
+            count = run_pending_tasks()
+            self.purge_done_tasks()
+            self.stdout.write(self.style.SUCCESS(f'Ran {count} tasks.'))
+            return
+
+        self.stdout.write('Waiting for tasks...')
+        last_purge = time.monotonic()
+        while True:
+            task = claim_next_task()
+            if task is None:
+                if time.monotonic() - last_purge > PURGE_INTERVAL:
+                    self.purge_done_tasks()
+                    last_purge = time.monotonic()
+                time.sleep(options['sleep'])
+                continue
+
+            if run_task(task):
+                self.stdout.write(f'Done: {task}')
+            else:
+                self.stderr.write(f'Failed: {task} (attempt {task.attempts}): {task.last_error}')
+
+    def purge_done_tasks(self) -> None:
+        """Delete the tasks that finished more than DONE_TASK_RETENTION ago."""
+        Task.objects.filter(status=Task.DONE,
+                            started_at__lt=timezone.now() - DONE_TASK_RETENTION).delete()
@@ -1,10 +1,14 @@
+import logging
 from abc import ABC, abstractmethod
 
 from django.http import Http404, HttpRequest, HttpResponse
 from django.shortcuts import render
 
+from action.utils.query_utils import QueryRecorder
 from mysite.settings import DEBUG
 
+logger = logging.getLogger(__name__)
+
 
 class BaseMiddleware(ABC):
     """Abstract base class for middleware."""
@@ -105,3 +109,28 @@ class UpdateSessionMiddleware(BaseMiddleware):
 
         response = self.get_response(request)
         return response
+
+
+class QueryBudgetMiddleware(BaseMiddleware):
+    """Middleware for measuring the database queries of each request and reporting N+1 queries."""
+
+    def __call__(self, request: HttpRequest) -> HttpResponse:
+        """
+        Process the request while recording its queries.
+
+        The number of queries and the database time are sent in the Server-Timing header,
+        and every query shape repeated N_PLUS_ONE_THRESHOLD times or more is logged.
+
+        Args:
+            request (HttpRequest): The incoming HTTP request.
+
+        Returns:
+            HttpResponse: The HTTP response.
+        """
+        with QueryRecorder() as recorder:
+            response = self.get_response(request)
+
+        response['Server-Timing'] = recorder.server_timing()
+        for shape, count in recorder.repeated_queries().items():
+            logger.warning('N+1 query on %s %s, run %d times: %s', request.method, request.path, count, shape)
+        return response
@@ -0,0 +1,42 @@
+# Generated by Django 5.2.18 on 2026-10-18 13:38
+
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def fill_activity_counters(apps, schema_editor):
+    """Compute the initial counters from the existing activity statuses."""
+    Activity = apps.get_model('action', 'Activity')
+    ActivityStatus = apps.get_model('action', 'ActivityStatus')
+
+    def status_count(**flags):
+        counted = ActivityStatus.objects.filter(activity=OuterRef('pk'), **flags) \
+            .order_by().values('activity').annotate(total=Count('pk')).values('total')
+        return Coalesce(Subquery(counted), 0)
+
+    Activity.objects.update(
+        participant_count=status_count(is_participated=True),
+        favorite_count=status_count(is_favorited=True)
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('action', '0006_alter_friendstatus_request_status'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='activity',
+            name='favorite_count',
+            field=models.PositiveIntegerField(default=0, editable=False, verbose_name='Favorites'),
+        ),
+        migrations.AddField(
+            model_name='activity',
+            name='participant_count',
+            field=models.PositiveIntegerField(default=0, editable=False, verbose_name='Count'),
+        ),
+        migrations.RunPython(fill_activity_counters, migrations.RunPython.noop),
+    ]
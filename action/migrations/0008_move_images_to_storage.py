@@ -0,0 +1,110 @@
+import base64
+import binascii
+import hashlib
+import re
+from io import BytesIO
+
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.db import migrations
+from PIL import Image, UnidentifiedImageError
+
+# A copy of the image store layout at the time of this migration, see action/utils/image_store.py
+IMAGE_SIZES = {
+    'detail': (1024, 1024),
+    'card': (512, 512),
+    'avatar': (128, 128),
+}
+
+IMAGE_HASH_PATTERN = re.compile(r'^[0-9a-f]{64}$')
+
+
+def store_image_bytes(image_data: bytes) -> str:
+    """Store an image and its thumbnails under the hash of its content, an empty string if it is invalid."""
+    try:
+        img = Image.open(BytesIO(image_data))
+        img = img.convert('RGB')
+    except (ValueError, UnidentifiedImageError, OSError):
+        return ''
+
+    image_hash = hashlib.sha256(image_data).hexdigest()
+    for size, dimension in IMAGE_SIZES.items():
+        name = f'images/{image_hash[:2]}/{image_hash}/{size}.jpg'
+        if not default_storage.exists(name):
+            img_byte_array = BytesIO()
+            img.resize(dimension).save(img_byte_array, format='JPEG')
+            default_storage.save(name, ContentFile(img_byte_array.getvalue()))
+    return image_hash
+
+
+def base64_to_stored_image(value: str) -> str:
+    """Store a base64-encoded image and return its hash, an empty string if it is invalid."""
+    if not value or IMAGE_HASH_PATTERN.match(value):
+        return value or ''
+    try:
+        return store_image_bytes(base64.b64decode(value))
+    except (binascii.Error, ValueError):
+        return ''
+
+
+def move_images_to_storage(apps, schema_editor):
+    """Replace the base64 images kept in the database by hashes of stored files."""
+    Activity = apps.get_model('action', 'Activity')
+    User = apps.get_model('action', 'User')
+
+    activities = Activity.objects.only('id', 'picture', 'background_picture')
+    for activity in activities.iterator(chunk_size=100):
+        activity.picture = base64_to_stored_image(activity.picture)
+        if activity.background_picture:
+            stored = {key: base64_to_stored_image(value)
+                      for key, value in activity.background_picture.items()}
+            activity.background_picture = {key: value for key, value in stored.items() if value}
+        activity.save(update_fields=['picture', 'background_picture'])
+
+    users = User.objects.only('id', 'profile_picture', 'background_picture')
+    for user in users.iterator(chunk_size=100):
+        user.profile_picture = base64_to_stored_image(user.profile_picture)
+        user.background_picture = base64_to_stored_image(user.background_picture)
+        user.save(update_fields=['profile_picture', 'background_picture'])
+
+
+def stored_image_to_base64(value: str) -> str:
+    """Encode the largest stored size of a hashed image in base64, an empty string if it is missing."""
+    if not value or not IMAGE_HASH_PATTERN.match(value):
+        return value or ''
+    name = f'images/{value[:2]}/{value}/detail.jpg'
+    if not default_storage.exists(name):
+        return ''
+    with default_storage.open(name) as image_file:
+        return base64.b64encode(image_file.read()).decode()
+
+
+def move_images_to_database(apps, schema_editor):
+    """Replace the hashes of stored files by base64 images kept in the database, as before."""
+    Activity = apps.get_model('action', 'Activity')
+    User = apps.get_model('action', 'User')
+
+    activities = Activity.objects.only('id', 'picture', 'background_picture')
+    for activity in activities.iterator(chunk_size=100):
+        activity.picture = stored_image_to_base64(activity.picture)
+        if activity.background_picture:
+            activity.background_picture = {key: stored_image_to_base64(value)
+                                           for key, value in activity.background_picture.items()}
+        activity.save(update_fields=['picture', 'background_picture'])
+
+    users = User.objects.only('id', 'profile_picture', 'background_picture')
+    for user in users.iterator(chunk_size=100):
+        user.profile_picture = stored_image_to_base64(user.profile_picture)
+        user.background_picture = stored_image_to_base64(user.background_picture)
+        user.save(update_fields=['profile_picture', 'background_picture'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('action', '0007_activity_counters'),
+    ]
+
+    operations = [
+        migrations.RunPython(move_images_to_storage, move_images_to_database),
+    ]
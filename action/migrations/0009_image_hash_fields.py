@@ -0,0 +1,28 @@
+# Generated by Django 5.2.18 on 2026-10-18 13:46
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('action', '0008_move_images_to_storage'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='activity',
+            name='picture',
+            field=models.CharField(blank=True, default='', max_length=64),
+        ),
+        migrations.AlterField(
+            model_name='user',
+            name='background_picture',
+            field=models.CharField(blank=True, max_length=64),
+        ),
+        migrations.AlterField(
+            model_name='user',
+            name='profile_picture',
+            field=models.CharField(blank=True, max_length=64),
+        ),
+    ]
@@ -0,0 +1,63 @@
+# Generated by Django 5.2.18 on 2026-10-18 13:53
+
+import django.contrib.postgres.search
+from django.db import migrations
+
+# A copy of the full-text index at the time of this migration, see action/utils/text_search_utils.py
+POSTGRES_CREATE = [
+    'CREATE INDEX IF NOT EXISTS action_activity_search_vector_gin ON action_activity USING gin (search_vector)',
+    """
+    UPDATE action_activity AS activity SET search_vector =
+        setweight(to_tsvector('simple', coalesce(activity.title, '')), 'A') ||
+        setweight(to_tsvector('simple', coalesce(activity.place, '')), 'B') ||
+        setweight(to_tsvector('simple', coalesce(owner.username, '')), 'B') ||
+        setweight(to_tsvector('simple', coalesce(activity.description, '')), 'C') ||
+        setweight(to_tsvector('simple', coalesce(activity.full_description, '')), 'D')
+    FROM action_user AS owner
+    WHERE owner.id = activity.owner_id
+    """,
+]
+POSTGRES_DROP = ['DROP INDEX IF EXISTS action_activity_search_vector_gin']
+
+SQLITE_CREATE = [
+    "CREATE VIRTUAL TABLE IF NOT EXISTS action_activity_fts USING fts5("
+    "title, place, owner, description, full_description, tokenize='unicode61 remove_diacritics 2')",
+    """
+    INSERT INTO action_activity_fts (rowid, title, place, owner, description, full_description)
+    SELECT activity.id, activity.title, coalesce(activity.place, ''), owner.username,
+           activity.description, coalesce(activity.full_description, '')
+    FROM action_activity AS activity
+    JOIN action_user AS owner ON owner.id = activity.owner_id
+    """,
+]
+SQLITE_DROP = ['DROP TABLE IF EXISTS action_activity_fts']
+
+
+def create_search_index(apps, schema_editor):
+    """Create the full-text index of the database vendor and index every activity."""
+    statements = {'postgresql': POSTGRES_CREATE, 'sqlite': SQLITE_CREATE}
+    for sql in statements.get(schema_editor.connection.vendor, []):
+        schema_editor.execute(sql)
+
+
+def drop_search_index(apps, schema_editor):
+    """Drop the full-text index of the database vendor."""
+    statements = {'postgresql': POSTGRES_DROP, 'sqlite': SQLITE_DROP}
+    for sql in statements.get(schema_editor.connection.vendor, []):
+        schema_editor.execute(sql)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('action', '0009_image_hash_fields'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='activity',
+            name='search_vector',
+            field=django.contrib.postgres.search.SearchVectorField(editable=False, null=True),
+        ),
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
@@ -0,0 +1,42 @@
+from django.db import migrations
+
+# The trigram indexes of substring searches, dropped by the benchmark_search command
+POSTGRES_CREATE = [
+    'CREATE EXTENSION IF NOT EXISTS pg_trgm',
+    'CREATE INDEX IF NOT EXISTS action_activity_title_trgm ON action_activity '
+    'USING gin ((UPPER(title::text)) gin_trgm_ops)',
+    'CREATE INDEX IF NOT EXISTS action_activity_place_trgm ON action_activity '
+    'USING gin ((UPPER(place::text)) gin_trgm_ops)',
+    'CREATE INDEX IF NOT EXISTS action_user_username_trgm ON action_user '
+    'USING gin ((UPPER(username::text)) gin_trgm_ops)',
+]
+POSTGRES_DROP = [
+    'DROP INDEX IF EXISTS action_activity_title_trgm',
+    'DROP INDEX IF EXISTS action_activity_place_trgm',
+    'DROP INDEX IF EXISTS action_user_username_trgm',
+]
+
+
+def create_indexes(apps, schema_editor):
+    """Create the trigram indexes for substring search, on PostgreSQL only."""
+    if schema_editor.connection.vendor == 'postgresql':
+        for sql in POSTGRES_CREATE:
+            schema_editor.execute(sql)
+
+
+def drop_indexes(apps, schema_editor):
+    """Drop the trigram indexes for substring search, on PostgreSQL only, keeping the extension."""
+    if schema_editor.connection.vendor == 'postgresql':
+        for sql in POSTGRES_DROP:
+            schema_editor.execute(sql)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('action', '0010_activity_search_vector'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_indexes, drop_indexes),
+    ]
@@ -0,0 +1,73 @@
+# Generated by Django 5.2.18 on 2026-10-18 14:01
+
+import django.db.models.functions.comparison
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def merge_duplicate_statuses(apps, schema_editor):
+    """Merge the duplicate rows that the unique constraints would reject."""
+    Activity = apps.get_model('action', 'Activity')
+    ActivityStatus = apps.get_model('action', 'ActivityStatus')
+    FriendStatus = apps.get_model('action', 'FriendStatus')
+
+    # Keep the oldest status of a user and activity, with the flags of all its duplicates
+    duplicates = list(ActivityStatus.objects.values('participants', 'activity')
+                      .annotate(total=Count('id')).filter(total__gt=1).order_by())
+    for pair in duplicates:
+        kept, *extra = ActivityStatus.objects.filter(
+            participants=pair['participants'], activity=pair['activity']).order_by('id')
+        kept.is_participated = any(status.is_participated for status in [kept, *extra])
+        kept.is_favorited = any(status.is_favorited for status in [kept, *extra])
+        kept.save()
+        ActivityStatus.objects.filter(id__in=[status.id for status in extra]).delete()
+
+    def status_count(**flags):
+        counted = ActivityStatus.objects.filter(activity=OuterRef('pk'), **flags) \
+            .order_by().values('activity').annotate(total=Count('pk')).values('total')
+        return Coalesce(Subquery(counted), 0)
+
+    Activity.objects.filter(id__in=[pair['activity'] for pair in duplicates]).update(
+        participant_count=status_count(is_participated=True),
+        favorite_count=status_count(is_favorited=True)
+    )
+
+    # Keep one status per pair of users, preferring an established friendship
+    seen_pairs = set()
+    for status in FriendStatus.objects.order_by('-is_friend', 'id'):
+        pair = (min(status.sender_id, status.receiver_id), max(status.sender_id, status.receiver_id))
+        if pair in seen_pairs:
+            status.delete()
+        seen_pairs.add(pair)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('action', '0011_trigram_indexes'),
+    ]
+
+    operations = [
+        migrations.RunPython(merge_duplicate_statuses, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='activitystatus',
+            index=models.Index(condition=models.Q(('is_participated', True)), fields=['activity'], name='status_activity_participated'),
+        ),
+        migrations.AddIndex(
+            model_name='activitystatus',
+            index=models.Index(condition=models.Q(('is_participated', True)), fields=['participants'], name='status_user_participated'),
+        ),
+        migrations.AddIndex(
+            model_name='activitystatus',
+            index=models.Index(condition=models.Q(('is_favorited', True)), fields=['participants'], name='status_user_favorited'),
+        ),
+        migrations.AddConstraint(
+            model_name='activitystatus',
+            constraint=models.UniqueConstraint(fields=('participants', 'activity'), name='unique_activity_status'),
+        ),
+        migrations.AddConstraint(
+            model_name='friendstatus',
+            constraint=models.UniqueConstraint(django.db.models.functions.comparison.Least('sender', 'receiver'), django.db.models.functions.comparison.Greatest('sender', 'receiver'), name='unique_friend_pair'),
+        ),
+    ]
@@ -0,0 +1,40 @@
+# Generated by Django 5.2.18 on 2026-10-18 14:14
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+def fill_friendships(apps, schema_editor):
+    """Create both directions of every accepted friendship."""
+    FriendStatus = apps.get_model('action', 'FriendStatus')
+    Friendship = apps.get_model('action', 'Friendship')
+
+    friendships = []
+    for sender_id, receiver_id in FriendStatus.objects.filter(is_friend=True) \
+            .values_list('sender_id', 'receiver_id').iterator():
+        friendships.append(Friendship(user_id=sender_id, friend_id=receiver_id))
+        friendships.append(Friendship(user_id=receiver_id, friend_id=sender_id))
+    Friendship.objects.bulk_create(friendships, batch_size=1000, ignore_conflicts=True)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('action', '0012_status_constraints'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Friendship',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('friend', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='friend_of', to=settings.AUTH_USER_MODEL)),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='friendships', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('user', 'friend'), name='unique_friendship')],
+            },
+        ),
+        migrations.RunPython(fill_friendships, migrations.RunPython.noop),
+    ]
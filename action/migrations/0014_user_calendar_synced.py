@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-18 14:18
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('action', '0013_friendship'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='user',
+            name='calendar_synced',
+            field=models.JSONField(blank=True, default=dict),
+        ),
+    ]
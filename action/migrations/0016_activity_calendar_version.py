@@ -0,0 +1,23 @@
+# Generated by Django 5.2.18 on 2026-10-18 14:31
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('action', '0015_task'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='activity',
+            name='calendar_version',
+            field=models.PositiveIntegerField(default=1, editable=False),
+        ),
+        migrations.AddField(
+            model_name='activity',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True),
+        ),
+    ]
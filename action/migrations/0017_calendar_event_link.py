@@ -0,0 +1,63 @@
+# Generated by Django 5.2.18 on 2026-10-18 14:34
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+def fill_event_links(apps, schema_editor):
+    """Create a link for every event of User.event_encoder whose activity still exists."""
+    User = apps.get_model('action', 'User')
+    Activity = apps.get_model('action', 'Activity')
+    CalendarEventLink = apps.get_model('action', 'CalendarEventLink')
+    activity_ids = set(Activity.objects.values_list('id', flat=True))
+
+    links = []
+    for user_id, event_encoder, calendar_synced in User.objects.exclude(event_encoder={}) \
+            .values_list('id', 'event_encoder', 'calendar_synced').iterator():
+        for activity_id, event_id in event_encoder.items():
+            if int(activity_id) not in activity_ids:
+                continue
+            synced_version = calendar_synced.get(activity_id)
+            links.append(CalendarEventLink(
+                user_id=user_id, activity_id=int(activity_id), event_id=event_id,
+                # Hashes of the previous sync match no version, those events are sent again
+                synced_version=synced_version if isinstance(synced_version, int) else 0))
+    CalendarEventLink.objects.bulk_create(links, batch_size=1000)
+
+
+def fill_event_encoders(apps, schema_editor):
+    """Copy the links back into User.event_encoder and User.calendar_synced."""
+    User = apps.get_model('action', 'User')
+    CalendarEventLink = apps.get_model('action', 'CalendarEventLink')
+
+    users = {}
+    for link in CalendarEventLink.objects.iterator():
+        user = users.setdefault(link.user_id, User(id=link.user_id, event_encoder={}, calendar_synced={}))
+        user.event_encoder[str(link.activity_id)] = link.event_id
+        user.calendar_synced[str(link.activity_id)] = link.synced_version
+    User.objects.bulk_update(users.values(), ['event_encoder', 'calendar_synced'], batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('action', '0016_activity_calendar_version'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CalendarEventLink',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('event_id', models.CharField(max_length=1024)),
+                ('synced_version', models.PositiveIntegerField(default=0)),
+                ('activity', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='calendar_events', to='action.activity')),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='calendar_events', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('user', 'activity'), name='unique_calendar_event')],
+            },
+        ),
+        migrations.RunPython(fill_event_links, fill_event_encoders),
+    ]
@@ -0,0 +1,21 @@
+# Generated by Django 5.2.18 on 2026-10-18 14:34
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('action', '0017_calendar_event_link'),
+    ]
+
+    operations = [
+        migrations.RemoveField(
+            model_name='user',
+            name='calendar_synced',
+        ),
+        migrations.RemoveField(
+            model_name='user',
+            name='event_encoder',
+        ),
+    ]
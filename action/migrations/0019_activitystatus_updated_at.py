@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-18 14:50
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('action', '0018_remove_user_event_encoder'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='activitystatus',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True),
+        ),
+    ]
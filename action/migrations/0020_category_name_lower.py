@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-18 15:00
+
+import django.db.models.functions.text
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('action', '0019_activitystatus_updated_at'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='category',
+            index=models.Index(django.db.models.functions.text.Lower('name'), name='category_name_lower'),
+        ),
+    ]
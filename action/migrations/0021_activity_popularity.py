@@ -0,0 +1,46 @@
+# Generated by Django 5.2.18 on 2026-10-18 15:03
+
+import math
+from datetime import datetime, timedelta
+
+from django.db import migrations, models
+
+# A copy of the popularity score at the time of this migration, see action/models/activity.py
+POPULARITY_HALF_LIFE = timedelta(days=7)
+FAVORITE_WEIGHT = 0.5
+
+
+def get_popularity(participant_count: int, favorite_count: int, pub_date: datetime) -> float:
+    """Compute the popularity score of an activity, higher is more popular."""
+    points = participant_count + FAVORITE_WEIGHT * favorite_count
+    return math.log2(max(points, 1)) + pub_date.timestamp() / POPULARITY_HALF_LIFE.total_seconds()
+
+
+def fill_popularity(apps, schema_editor):
+    """Compute the popularity of the existing activities."""
+    Activity = apps.get_model('action', 'Activity')
+    activities = []
+    for activity in Activity.objects.only('id', 'participant_count', 'favorite_count', 'pub_date').iterator():
+        activity.popularity = get_popularity(activity.participant_count, activity.favorite_count, activity.pub_date)
+        activities.append(activity)
+    Activity.objects.bulk_update(activities, ['popularity'], batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('action', '0020_category_name_lower'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='activity',
+            name='popularity',
+            field=models.FloatField(default=0, editable=False),
+        ),
+        migrations.RunPython(fill_popularity, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='activity',
+            index=models.Index(models.OrderBy(models.F('popularity'), descending=True), models.OrderBy(models.F('id'), descending=True), condition=models.Q(('participant_count__gt', 0)), name='activity_popularity'),
+        ),
+    ]
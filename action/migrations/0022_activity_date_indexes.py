@@ -0,0 +1,21 @@
+# Generated by Django 5.2.18 on 2026-10-18 15:06
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('action', '0021_activity_popularity'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='activity',
+            index=models.Index(models.OrderBy(models.F('pub_date'), descending=True), models.OrderBy(models.F('id'), descending=True), name='activity_pub_date'),
+        ),
+        migrations.AddIndex(
+            model_name='activity',
+            index=models.Index(fields=['start_date'], name='activity_start_date'),
+        ),
+    ]
@@ -1,5 +1,8 @@
 from .activity import Activity
 from .activity_status import ActivityStatus
+from .calendar_event_link import CalendarEventLink
 from .friend_status import FriendStatus
+from .friendship import Friendship
 from .category import Category
 from .user import User
+from .task import Task
@@ -1,13 +1,131 @@
-from datetime import timedelta
+import math
+from datetime import datetime, timedelta
 
 from django.contrib import admin
-from django.db import models
-from django.db.models import QuerySet
+from django.contrib.postgres.search import SearchVectorField
+from django.db import models, transaction
+from django.db.models import F, Prefetch, Q, QuerySet
 from django.utils import timezone
+from django.utils.functional import cached_property
 
 from .user import User
 from .category import Category
 
+# Fields copied into the Google Calendar events of the participants
+CALENDAR_FIELDS = frozenset(['title', 'place', 'description', 'start_date', 'last_date'])
+
+# Columns that listing pages never render, left out of listing queries
+LISTING_DEFERRED_FIELDS = [
+    'full_description', 'background_picture', 'search_vector',
+    'owner__bio', 'owner__background_picture',
+]
+
+
+# Columns changed with F() updates by other requests, reloaded before a full save so it never writes them back
+LIVE_FIELDS = ['participant_count', 'favorite_count', 'calendar_version']
+
+
+# A participation today weighs as much as two participations one half-life ago
+POPULARITY_HALF_LIFE = timedelta(days=7)
+FAVORITE_WEIGHT = 0.5
+
+# Fields the popularity is computed from
+POPULARITY_FIELDS = frozenset(['participant_count', 'favorite_count', 'pub_date'])
+
+
+def get_popularity(participant_count: int, favorite_count: int, pub_date: datetime) -> float:
+    """
+    Compute the popularity score of an activity.
+
+    The score ranks activities by points * 2 ** (-age / POPULARITY_HALF_LIFE), stored as its
+    logarithm with the age measured from a fixed origin instead of from now. The order of two
+    scores then never changes as time passes, so stored scores only need updating when the
+    counters or the publication date change.
+
+    Args:
+        participant_count (int): The number of participants.
+        favorite_count (int): The number of users who favorited the activity.
+        pub_date (datetime): The publication date.
+
+    Returns:
+        float: The popularity score, higher is more popular.
+    """
+    points = participant_count + FAVORITE_WEIGHT * favorite_count
+    return math.log2(max(points, 1)) + pub_date.timestamp() / POPULARITY_HALF_LIFE.total_seconds()
+
+
+class ActivityQuerySet(QuerySet):
+    """QuerySet with shortcuts for the common ways activities are loaded."""
+
+    def for_listing(self) -> 'ActivityQuerySet':
+        """
+        Load only what a list of activities displays.
+
+        The owner is joined in the same query and the large columns are deferred,
+        so a page of activities costs one query of small rows.
+
+        Returns:
+            ActivityQuerySet: The queryset prepared for listing.
+        """
+        return self.select_related('owner').defer(*LISTING_DEFERRED_FIELDS)
+
+    def with_remaining_space(self) -> 'ActivityQuerySet':
+        """
+        Filter the activities that are not full, by the same rule as Activity.remaining_space.
+
+        Returns:
+            ActivityQuerySet: The activities without a limit or below it.
+        """
+        return self.filter(Q(participant_limit__isnull=True) | Q(participant_limit=0) |
+                           Q(participant_count__lt=F('participant_limit')))
+
+    def with_my_status(self, user) -> 'ActivityQuerySet':
+        """
+        Load the statuses of a user for the activities, in one query for the whole result.
+
+        Each activity then tells the user's participation through Activity.my_status.
+
+        Args:
+            user (User | AnonymousUser): The user viewing the activities.
+
+        Returns:
+            ActivityQuerySet: The queryset with the statuses prefetched, unchanged for guests.
+        """
+        if not user.is_authenticated:
+            return self
+
+        from .activity_status import ActivityStatus
+        return self.prefetch_related(Prefetch(
+            'activity', queryset=ActivityStatus.objects.filter(participants=user), to_attr='my_statuses'))
+
+    def touch(self) -> int:
+        """
+        Mark the activities as modified, for changes saved without Activity.save().
+
+        Returns:
+            int: The number of activities marked.
+        """
+        return self.update(updated_at=timezone.now())
+
+    def refresh_popularity(self, batch_size: int = 1000) -> int:
+        """
+        Recompute the stored popularity of the activities, for counters changed with update().
+
+        Args:
+            batch_size (int): The number of activities read and written at a time.
+
+        Returns:
+            int: The number of activities whose popularity changed.
+        """
+        changed = []
+        for activity in self.only('id', 'popularity', *POPULARITY_FIELDS).order_by().iterator(batch_size):
+            popularity = get_popularity(activity.participant_count, activity.favorite_count, activity.pub_date)
+            if popularity != activity.popularity:
+                activity.popularity = popularity
+                changed.append(activity)
+        self.model.objects.bulk_update(changed, ['popularity'], batch_size=batch_size)
+        return len(changed)
+
 
 class Activity(models.Model):
     """
@@ -31,15 +149,48 @@ class Activity(models.Model):
                                                     default=None)
     place = models.CharField('Place', max_length=200, null=True, blank=True)
     full_description = models.TextField('Full Description', null=True, blank=True)
-    picture = models.TextField(blank=True, default='')
+    # Hashes of images kept in the image store, see action/utils/image_store.py
+    picture = models.CharField(max_length=64, blank=True, default='')
     background_picture = models.JSONField(blank=True, null=True)
     categories = models.ManyToManyField(Category, blank=True)
 
-    @property
+    # Denormalized counters, maintained by ActivityStatus on every change
+    participant_count = models.PositiveIntegerField('Count', default=0,
+                                                    editable=False)
+    favorite_count = models.PositiveIntegerField('Favorites', default=0,
+                                                 editable=False)
+
+    # Incremented when a calendar field changes, compared with CalendarEventLink.synced_version
+    calendar_version = models.PositiveIntegerField(default=1, editable=False)
+    # Last change of anything the detail page displays, used for conditional responses
+    updated_at = models.DateTimeField(auto_now=True)
+    # Ordering of the popular list, see get_popularity
+    popularity = models.FloatField(default=0, editable=False)
+
+    # Full-text document on PostgreSQL, see action/utils/text_search_utils.py
+    search_vector = SearchVectorField(null=True, editable=False)
+
+    objects = ActivityQuerySet.as_manager()
+
+    class Meta:
+        indexes = [
+            # The index and the recent and upcoming lists, newest first as in INDEX_ORDERING
+            models.Index(F('pub_date').desc(), F('id').desc(), name='activity_pub_date'),
+            # Date searches, as ranges of start_date
+            models.Index(fields=['start_date'], name='activity_start_date'),
+            # The popular list reads the top of this index, only activities with participants are listed
+            models.Index(F('popularity').desc(), F('id').desc(), condition=Q(participant_count__gt=0),
+                         name='activity_popularity'),
+        ]
+
+    @cached_property
     def participants(self) -> QuerySet[User]:
         """
         Participants of the activity.
 
+        The queryset is kept on the instance, so its rows are loaded once however many times
+        they are read. It is dropped by clear_participation_cache when a status changes.
+
         Returns:
             QuerySet[User]: Participants of the activity.
         """
@@ -48,15 +199,20 @@ class Activity(models.Model):
         return participants
 
     @property
-    @admin.display(description='Count')
-    def participant_count(self) -> int:
+    def my_status(self) -> 'ActivityStatus | None':
         """
-        Get the count of participants for this activity.
+        The status of the viewing user, loaded by ActivityQuerySet.with_my_status.
 
         Returns:
-            int: The number of participants.
+            ActivityStatus | None: The status, None if the user never joined nor favorited the
+                activity, or if the statuses were not loaded.
         """
-        return self.participants.count()
+        statuses = getattr(self, 'my_statuses', None)
+        return statuses[0] if statuses else None
+
+    def clear_participation_cache(self) -> None:
+        """Forget the loaded participants, after the participation of a user changed."""
+        self.__dict__.pop('participants', None)
 
     @property
     @admin.display(description='Time remain')
@@ -87,6 +243,34 @@ class Activity(models.Model):
             return self.participant_limit - self.participant_count  # Normal case
         return None  # If no limit is set
 
+    def save(self, *args, **kwargs):
+        """
+        Save the activity with its popularity computed from the saved fields.
+
+        A full save of an existing activity first reloads the LIVE_FIELDS under a row lock, so a
+        participation or favorite committed since the activity was loaded is kept, and the
+        popularity is computed from the current counters.
+        """
+        update_fields = kwargs.get('update_fields')
+        if update_fields is None and not self._state.adding:
+            with transaction.atomic(using=kwargs.get('using')):
+                live = type(self).objects.using(kwargs.get('using')).select_for_update() \
+                    .filter(pk=self.pk).values(*LIVE_FIELDS).first()
+                for name, value in (live or {}).items():
+                    setattr(self, name, value)
+                self.save_with_popularity(*args, **kwargs)
+        else:
+            self.save_with_popularity(*args, **kwargs)
+
+    def save_with_popularity(self, *args, **kwargs):
+        """Save the activity, recomputing its popularity when a field it depends on is saved."""
+        update_fields = kwargs.get('update_fields')
+        if update_fields is None or POPULARITY_FIELDS & set(update_fields):
+            self.popularity = get_popularity(self.participant_count, self.favorite_count, self.pub_date)
+            if update_fields is not None:
+                kwargs['update_fields'] = {*update_fields, 'popularity'}
+        super().save(*args, **kwargs)
+
     def __str__(self):
         """
         Return a string of activity name.
@@ -1,9 +1,12 @@
-from django.db import models
+from django.db import models, transaction
+from django.db.models import Case, Exists, F, OuterRef, Q, When
 from django.utils import timezone
 
 from .user import User
 from .activity import Activity
 
+COUNTER_FIELDS = ['participant_count', 'favorite_count']
+
 
 class ActivityStatus(models.Model):
     """Represents the participation status of a user in a specific activity."""
@@ -18,3 +21,123 @@ class ActivityStatus(models.Model):
 
     is_participated = models.BooleanField(default=False)
     is_favorited = models.BooleanField(default=False)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['participants', 'activity'],
+                                    name='unique_activity_status'),
+        ]
+        indexes = [
+            # Participants of an activity, and the activities a user joined or favorited
+            models.Index(fields=['activity'], condition=Q(is_participated=True),
+                         name='status_activity_participated'),
+            models.Index(fields=['participants'], condition=Q(is_participated=True),
+                         name='status_user_participated'),
+            models.Index(fields=['participants'], condition=Q(is_favorited=True),
+                         name='status_user_favorited'),
+        ]
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        """Remember the stored flags so that later saves can compute counter deltas."""
+        instance = super().from_db(db, field_names, values)
+        loaded = dict(zip(field_names, values))
+        instance._saved_flags = (loaded.get('is_participated', False),
+                                 loaded.get('is_favorited', False))
+        return instance
+
+    @property
+    def saved_flags(self) -> tuple[bool, bool]:
+        """
+        The (is_participated, is_favorited) pair as it is currently stored in the database.
+
+        Returns:
+            tuple[bool, bool]: The stored flags, (False, False) for unsaved statuses.
+        """
+        return getattr(self, '_saved_flags', (False, False))
+
+    def save(self, *args, **kwargs):
+        """Save the status and keep the activity counters in sync in the same transaction."""
+        previous = self.saved_flags
+        current = (self.is_participated, self.is_favorited)
+
+        with transaction.atomic():
+            super().save(*args, **kwargs)
+            self.update_activity_counters(previous, current)
+        self._saved_flags = current
+
+    def update_activity_counters(self, previous: tuple[bool, bool],
+                                 current: tuple[bool, bool]) -> None:
+        """
+        Apply the change between two flag states to the activity counters.
+
+        Args:
+            previous (tuple[bool, bool]): The (is_participated, is_favorited) flags before the change.
+            current (tuple[bool, bool]): The (is_participated, is_favorited) flags after the change.
+        """
+        participant_delta = int(current[0]) - int(previous[0])
+        favorite_delta = int(current[1]) - int(previous[1])
+
+        if not participant_delta and not favorite_delta:
+            return
+
+        self.change_activity_counters(self.activity_id, participant_delta, favorite_delta)
+
+        # Keep an already loaded activity in step with the database
+        if ActivityStatus.activity.is_cached(self):
+            self.activity.refresh_from_db(fields=COUNTER_FIELDS)
+            self.activity.clear_participation_cache()
+
+    @staticmethod
+    def change_activity_counters(activity_id: int, participant_delta: int = 0,
+                                 favorite_delta: int = 0) -> None:
+        """
+        Add to the counters of an activity.
+
+        The counters are updated atomically with F-expressions, so concurrent
+        changes on the same activity never overwrite each other. The popularity is
+        then recomputed while the row is still locked by the update.
+
+        Args:
+            activity_id (int): The ID of the activity.
+            participant_delta (int): The change of the participant count.
+            favorite_delta (int): The change of the favorite count.
+        """
+        Activity.objects.filter(pk=activity_id).update(
+            participant_count=F('participant_count') + participant_delta,
+            favorite_count=F('favorite_count') + favorite_delta,
+            updated_at=timezone.now()
+        )
+        Activity.objects.filter(pk=activity_id).refresh_popularity()
+
+    @classmethod
+    def release_user_counters(cls, user_id: int) -> list[int]:
+        """
+        Remove all statuses of a user from the activity counters, before the user is deleted.
+
+        Every activity is updated by one grouped statement, instead of one per status.
+
+        Args:
+            user_id (int): The ID of the user being deleted.
+
+        Returns:
+            list[int]: The IDs of the activities whose counters changed.
+        """
+        activity_ids = list(cls.objects.filter(Q(is_participated=True) | Q(is_favorited=True),
+                                               participants_id=user_id)
+                            .values_list('activity_id', flat=True))
+        if not activity_ids:
+            return []
+
+        statuses = cls.objects.filter(participants_id=user_id, activity=OuterRef('pk'))
+        activities = Activity.objects.filter(pk__in=activity_ids)
+        activities.update(
+            participant_count=F('participant_count') - Case(
+                When(Exists(statuses.filter(is_participated=True)), then=1), default=0),
+            favorite_count=F('favorite_count') - Case(
+                When(Exists(statuses.filter(is_favorited=True)), then=1), default=0),
+            updated_at=timezone.now()
+        )
+        activities.refresh_popularity()
+        return activity_ids
@@ -0,0 +1,34 @@
+from django.db import models
+
+from .activity import Activity
+from .user import User
+
+
+class CalendarEventLink(models.Model):
+    """
+    The Google Calendar event created for a user's participation in an activity.
+
+    Note:
+        The event of each participant is found with one indexed lookup on the activity,
+        so edits and deletions of an activity reach exactly the calendars that have it.
+    """
+
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='calendar_events')
+    activity = models.ForeignKey(Activity, on_delete=models.CASCADE, related_name='calendar_events')
+    event_id = models.CharField(max_length=1024)
+    # Activity.calendar_version last sent to Google Calendar
+    synced_version = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['user', 'activity'], name='unique_calendar_event'),
+        ]
+
+    def __str__(self):
+        """
+        Return a string of the linked user and activity.
+
+        Returns:
+            str: The user and the activity.
+        """
+        return f'{self.user} - {self.activity}'
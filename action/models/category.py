@@ -1,4 +1,5 @@
 from django.db import models
+from django.db.models.functions import Lower
 
 
 class Category(models.Model):
@@ -6,6 +7,12 @@ class Category(models.Model):
 
     name = models.CharField(max_length=50, unique=True)
 
+    class Meta:
+        indexes = [
+            # Searches compare the names case-insensitively
+            models.Index(Lower('name'), name='category_name_lower'),
+        ]
+
     def __str__(self):
         """
         Return a string representation of the category name.
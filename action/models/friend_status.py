@@ -1,6 +1,12 @@
 from django.db import models
+from django.db.models import QuerySet
+from django.db.models.functions import Greatest, Least
+
 from .user import User
 
+# A pair of users is stored once, whichever of them sent the request
+FRIEND_PAIR = (Least('sender', 'receiver'), Greatest('sender', 'receiver'))
+
 
 class FriendStatus(models.Model):
     """
@@ -23,3 +29,25 @@ class FriendStatus(models.Model):
     request_status = models.CharField(max_length=50, choices=STATUS_CHOICES,
                                       null=True, default=None)
     is_friend = models.BooleanField(default=False)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(*FRIEND_PAIR, name='unique_friend_pair'),
+        ]
+
+    @classmethod
+    def between(cls, user1_id: int, user2_id: int) -> QuerySet['FriendStatus']:
+        """
+        Filter the status of a pair of users, in either direction.
+
+        The lookup matches the expressions of the unique pair index, so it is a single index probe.
+
+        Args:
+            user1_id (int): The ID of one user.
+            user2_id (int): The ID of the other user.
+
+        Returns:
+            QuerySet: The status of the pair, at most one row.
+        """
+        return cls.objects.alias(first_user=FRIEND_PAIR[0], second_user=FRIEND_PAIR[1]) \
+            .filter(first_user=min(user1_id, user2_id), second_user=max(user1_id, user2_id))
@@ -0,0 +1,39 @@
+from django.db import models
+
+from .user import User
+
+
+class Friendship(models.Model):
+    """
+    One direction of an accepted friendship.
+
+    Every pair of friends has two rows, (a, b) and (b, a), so the friends of a user are
+    a single lookup on the user column. The rows are derived from FriendStatus and kept
+    in sync with it, see Friendship.sync().
+    """
+
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='friendships')
+    friend = models.ForeignKey(User, on_delete=models.CASCADE, related_name='friend_of')
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['user', 'friend'], name='unique_friendship'),
+        ]
+
+    @classmethod
+    def sync(cls, user1_id: int, user2_id: int, is_friend: bool) -> None:
+        """
+        Create or delete both directions of the friendship between two users.
+
+        Args:
+            user1_id (int): The ID of one user.
+            user2_id (int): The ID of the other user.
+            is_friend (bool): True if the users are friends.
+        """
+        if is_friend:
+            cls.objects.bulk_create([cls(user_id=user1_id, friend_id=user2_id),
+                                     cls(user_id=user2_id, friend_id=user1_id)],
+                                    ignore_conflicts=True)
+        else:
+            cls.objects.filter(models.Q(user_id=user1_id, friend_id=user2_id) |
+                               models.Q(user_id=user2_id, friend_id=user1_id)).delete()
@@ -0,0 +1,56 @@
+from django.db import models
+from django.db.models import Q
+from django.utils import timezone
+
+
+class Task(models.Model):
+    """
+    A function call queued to run outside the request, see action/tasks.py.
+
+    Note:
+        Tasks with the same idempotency key are merged while they are waiting,
+        so repeated requests for the same side effect run it once.
+    """
+
+    PENDING = 'pending'
+    RUNNING = 'running'
+    DONE = 'done'
+    FAILED = 'failed'
+    STATUS_CHOICES = (
+        (PENDING, 'Pending'),
+        (RUNNING, 'Running'),
+        (DONE, 'Done'),
+        (FAILED, 'Failed'),
+    )
+
+    function = models.CharField(max_length=200)
+    kwargs = models.JSONField(blank=True, default=dict)
+    idempotency_key = models.CharField(max_length=200, null=True, blank=True)
+
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default=PENDING)
+    attempts = models.PositiveIntegerField(default=0)
+    last_error = models.TextField(blank=True)
+
+    created_at = models.DateTimeField(default=timezone.now)
+    run_at = models.DateTimeField(default=timezone.now)
+    started_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['idempotency_key'],
+                                    condition=Q(status='pending'),
+                                    name='unique_pending_task_key'),
+        ]
+        indexes = [
+            # The worker polls for the next due task
+            models.Index(fields=['run_at'], condition=Q(status='pending'), name='task_pending_run_at'),
+        ]
+
+    def __str__(self):
+        """
+        Return a string of the queued call.
+
+        Returns:
+            str: The function and its status.
+        """
+        return f'{self.function} ({self.status})'
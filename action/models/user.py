@@ -1,15 +1,16 @@
 from django.contrib.auth.models import AbstractUser
 from django.db import models
-from django.db.models import Q, QuerySet
+from django.db.models import QuerySet
+from django.utils.functional import cached_property
 
 
 class User(AbstractUser):
     """Custom User model extending AbstractUser for additional features."""
 
-    profile_picture = models.TextField(blank=True)
-    background_picture = models.TextField(blank=True)
+    # Hashes of images kept in the image store, see action/utils/image_store.py
+    profile_picture = models.CharField(max_length=64, blank=True)
+    background_picture = models.CharField(max_length=64, blank=True)
     bio = models.TextField(blank=True)
-    event_encoder = models.JSONField(blank=True, default=dict)
 
     @property
     def participated_activity(self) -> QuerySet['Activity']:
@@ -20,7 +21,7 @@ class User(AbstractUser):
             QuerySet: Filtered Activity objects.
         """
         from .activity import Activity
-        return Activity.objects.filter(
+        return Activity.objects.for_listing().filter(
             activity__participants=self, activity__is_participated=True)
 
     @property
@@ -32,7 +33,7 @@ class User(AbstractUser):
             QuerySet: Filtered Activity objects.
         """
         from .activity import Activity
-        return Activity.objects.filter(
+        return Activity.objects.for_listing().filter(
             activity__participants=self, activity__is_favorited=True)
 
     @property
@@ -43,11 +44,21 @@ class User(AbstractUser):
         Returns:
             QuerySet: User objects representing friends.
         """
-        friend_objects = User.objects.filter(
-            Q(sender__is_friend=True, sender__receiver=self) |
-            Q(receiver__is_friend=True, receiver__sender=self)
-        )
-        return friend_objects.distinct()
+        # Friendship has a row per direction, so this is one indexed join without duplicates
+        return User.objects.filter(friend_of__user=self)
+
+    @cached_property
+    def friend_ids(self) -> frozenset[int]:
+        """
+        The IDs of the user's friends, loaded once per user object.
+
+        request.user is created for each request, so this is a per-request cache.
+
+        Returns:
+            frozenset[int]: The IDs of the friends.
+        """
+        from .friendship import Friendship
+        return frozenset(Friendship.objects.filter(user=self).values_list('friend_id', flat=True))
 
     def __str__(self):
         """
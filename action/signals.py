@@ -0,0 +1,242 @@
+from allauth.socialaccount.models import SocialToken
+from django.db.models import Q, QuerySet
+from django.db.models.signals import m2m_changed, post_delete, post_save, pre_delete
+from django.dispatch import receiver
+
+from action.calendar import enqueue_activity_removal
+from action.models import Activity, ActivityStatus, Category, FriendStatus, Friendship, User
+from action.utils.cache_utils import invalidate_page_cache
+from action.utils.calendar_utils import forget_credentials
+from action.utils.text_search_utils import get_search_backend
+
+
+def is_deleted_with(origin, *models) -> bool:
+    """
+    Check if a deletion was started from an instance or a queryset of one of the models.
+
+    Args:
+        origin (Model | QuerySet | None): The origin of the deletion, sent with the delete signals.
+        *models (type): The model classes.
+
+    Returns:
+        bool: True if the deletion cascades from one of the models.
+    """
+    if isinstance(origin, QuerySet):
+        return issubclass(origin.model, models)
+    return isinstance(origin, models)
+
+
+@receiver(post_delete, sender=ActivityStatus)
+def release_activity_counters(sender, instance: ActivityStatus, origin=None, **kwargs):
+    """
+    Remove a deleted status from the activity counters.
+
+    Connected as a signal so that queryset deletes are counted too. Statuses deleted with
+    their activity have no counter left to update, and those deleted with their user were
+    released in one go by release_user_activity_counters.
+
+    Args:
+        sender (type): The ActivityStatus model class.
+        instance (ActivityStatus): The status that has been deleted.
+        origin (Model | QuerySet | None): The instance or queryset whose deletion was requested.
+    """
+    if is_deleted_with(origin, Activity, User):
+        return
+    instance.update_activity_counters(instance.saved_flags, (False, False))
+    invalidate_page_cache()
+
+
+@receiver(pre_delete, sender=User)
+def release_user_activity_counters(sender, instance: User, **kwargs):
+    """
+    Remove the statuses of a user being deleted from the activity counters, in one update.
+
+    Args:
+        sender (type): The User model class.
+        instance (User): The user being deleted.
+    """
+    if ActivityStatus.release_user_counters(instance.pk):
+        invalidate_page_cache()
+
+
+@receiver(post_save, sender=Activity)
+def index_saved_activity(sender, instance: Activity, **kwargs):
+    """
+    Update the full-text index of a created or edited activity.
+
+    Queryset updates and bulk operations send no signal, the rebuild_search_index command
+    repairs the index after them.
+
+    Args:
+        sender (type): The Activity model class.
+        instance (Activity): The saved activity.
+    """
+    get_search_backend().update_index([instance.pk])
+
+
+@receiver(post_delete, sender=Activity)
+def unindex_deleted_activity(sender, instance: Activity, **kwargs):
+    """
+    Remove a deleted activity from the full-text index.
+
+    Args:
+        sender (type): The Activity model class.
+        instance (Activity): The deleted activity.
+    """
+    get_search_backend().remove_from_index([instance.pk])
+
+
+@receiver(pre_delete, sender=Activity)
+def remove_deleted_activity_events(sender, instance: Activity, **kwargs):
+    """
+    Queue the deletion of the calendar events of an activity before its links are deleted.
+
+    Args:
+        sender (type): The Activity model class.
+        instance (Activity): The activity being deleted.
+    """
+    enqueue_activity_removal(instance)
+
+
+@receiver(post_save, sender=User)
+def reindex_owner_activities(sender, instance: User, created: bool, update_fields=None, **kwargs):
+    """
+    Update the full-text index of a user's activities, since it contains the username.
+
+    Saves that cannot change the username, such as the last_login update, are skipped.
+
+    Args:
+        sender (type): The User model class.
+        instance (User): The saved user.
+        created (bool): True if the user has just been created.
+        update_fields (frozenset | None): The fields passed to save(), None if all were saved.
+    """
+    if created or (update_fields is not None and 'username' not in update_fields):
+        return
+
+    activity_ids = list(Activity.objects.filter(owner=instance).values_list('id', flat=True))
+    if activity_ids:
+        get_search_backend().update_index(activity_ids)
+
+
+@receiver(post_save, sender=FriendStatus)
+def sync_saved_friendship(sender, instance: FriendStatus, **kwargs):
+    """
+    Mirror a saved friend status into the friendship edges.
+
+    Args:
+        sender (type): The FriendStatus model class.
+        instance (FriendStatus): The saved status.
+    """
+    Friendship.sync(instance.sender_id, instance.receiver_id, instance.is_friend)
+
+
+@receiver(post_delete, sender=FriendStatus)
+def remove_deleted_friendship(sender, instance: FriendStatus, **kwargs):
+    """
+    Remove the friendship edges of a deleted friend status.
+
+    Args:
+        sender (type): The FriendStatus model class.
+        instance (FriendStatus): The deleted status.
+    """
+    Friendship.sync(instance.sender_id, instance.receiver_id, False)
+
+
+@receiver(post_save, sender=SocialToken)
+@receiver(post_delete, sender=SocialToken)
+def forget_changed_credentials(sender, instance: SocialToken, **kwargs):
+    """
+    Drop the cached Google credentials of a user whose token was saved or deleted.
+
+    Args:
+        sender (type): The SocialToken model class.
+        instance (SocialToken): The saved or deleted token.
+    """
+    forget_credentials(instance.account.user_id)
+
+
+@receiver(post_save, sender=Activity)
+@receiver(post_delete, sender=Activity)
+@receiver(post_save, sender=ActivityStatus)
+@receiver(post_save, sender=Category)
+@receiver(post_delete, sender=Category)
+@receiver(m2m_changed, sender=Activity.categories.through)
+def invalidate_cached_pages(sender, **kwargs):
+    """
+    Make the cached pages stale when something they display changes.
+
+    Deleted statuses are handled by release_activity_counters, which skips cascade deletes.
+
+    Args:
+        sender (type): The model class that changed.
+    """
+    invalidate_page_cache()
+
+
+@receiver(post_save, sender=User)
+def invalidate_cached_user_pages(sender, instance: User, created: bool, update_fields=None, **kwargs):
+    """
+    Make the cached pages stale when a username changes, since owners and participants are listed.
+
+    Args:
+        sender (type): The User model class.
+        instance (User): The saved user.
+        created (bool): True if the user has just been created.
+        update_fields (frozenset | None): The fields passed to save(), None if all were saved.
+    """
+    if not created and (update_fields is None or 'username' in update_fields):
+        invalidate_page_cache()
+
+
+@receiver(m2m_changed, sender=Activity.categories.through)
+def touch_recategorized_activities(sender, instance, action: str, reverse: bool, pk_set=None, **kwargs):
+    """
+    Mark activities whose categories changed as modified, the detail page lists them.
+
+    Args:
+        sender (type): The intermediate model of Activity.categories.
+        instance (Activity | Category): The activity, or the category when changed from its side.
+        action (str): The kind of change, such as 'post_add'.
+        reverse (bool): True if the change was made from the category side.
+        pk_set (set[int] | None): The IDs of the added or removed objects.
+    """
+    if action in ('post_add', 'post_remove'):
+        activities = Activity.objects.filter(pk__in=pk_set) if reverse else Activity.objects.filter(pk=instance.pk)
+    elif action == 'pre_clear' and reverse:
+        activities = Activity.objects.filter(categories=instance)  # After the clear they can't be found
+    elif action == 'post_clear' and not reverse:
+        activities = Activity.objects.filter(pk=instance.pk)
+    else:
+        return
+    activities.touch()
+
+
+@receiver(post_save, sender=Category)
+@receiver(pre_delete, sender=Category)
+def touch_category_activities(sender, instance: Category, **kwargs):
+    """
+    Mark the activities of a renamed or deleted category as modified.
+
+    Args:
+        sender (type): The Category model class.
+        instance (Category): The saved or deleted category.
+    """
+    Activity.objects.filter(categories=instance).touch()
+
+
+@receiver(post_save, sender=User)
+def touch_user_activities(sender, instance: User, created: bool, update_fields=None, **kwargs):
+    """
+    Mark the activities a user owns or joined as modified when the username changes.
+
+    Args:
+        sender (type): The User model class.
+        instance (User): The saved user.
+        created (bool): True if the user has just been created.
+        update_fields (frozenset | None): The fields passed to save(), None if all were saved.
+    """
+    if created or (update_fields is not None and 'username' not in update_fields):
+        return
+    Activity.objects.filter(Q(owner=instance) |
+                            Q(activity__participants=instance, activity__is_participated=True)).touch()
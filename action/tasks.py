@@ -0,0 +1,169 @@
+import logging
+from datetime import timedelta
+
+from django.db import IntegrityError, transaction
+from django.db.models import Q
+from django.utils import timezone
+from django.utils.module_loading import import_string
+
+from action.models import Task
+
+logger = logging.getLogger(__name__)
+
+MAX_ATTEMPTS = 5
+
+# Delay before the first retry, doubled after every failed attempt
+RETRY_DELAY = timedelta(seconds=30)
+
+# Inserts of a keyed task tried before giving up, when its waiting task keeps being claimed
+ENQUEUE_ATTEMPTS = 3
+
+# A task still running after this long belongs to a worker that died, it is run again until MAX_ATTEMPTS
+RUNNING_TIMEOUT = timedelta(minutes=10)
+
+
+def get_function_path(function) -> str:
+    """
+    Get the dotted path the worker imports a task function from.
+
+    Args:
+        function (callable): A module-level function.
+
+    Returns:
+        str: The module and name of the function.
+    """
+    return f'{function.__module__}.{function.__qualname__}'
+
+
+def enqueue(function, idempotency_key: str | None = None, **kwargs) -> Task:
+    """
+    Queue a function call to be run by the worker (manage.py run_worker).
+
+    The task is created in the caller's transaction, so it is only queued if the
+    change that requires it is committed.
+
+    Args:
+        function (callable): A module-level function, called with the keyword arguments.
+        idempotency_key (str | None): Calls with the same key are merged while waiting.
+        **kwargs: JSON-serializable arguments of the call.
+
+    Returns:
+        Task: The queued task, or the already waiting task with the same key.
+    """
+    task = Task(function=get_function_path(function), kwargs=kwargs, idempotency_key=idempotency_key)
+    if idempotency_key is None:
+        task.save()
+        return task
+
+    for attempt in range(1, ENQUEUE_ATTEMPTS + 1):
+        try:
+            with transaction.atomic():
+                task.save()
+            return task
+        except IntegrityError:  # The same call is already waiting
+            waiting = Task.objects.filter(idempotency_key=idempotency_key, status=Task.PENDING).first()
+            if waiting is not None:
+                return waiting
+            if attempt == ENQUEUE_ATTEMPTS:
+                raise
+            # A worker claimed the waiting task in between, maybe before the caller's change, queue it again
+
+
+def enqueue_many(function, calls: list[tuple[str | None, dict]]) -> None:
+    """
+    Queue many calls of a function in bulk inserts.
+
+    Calls whose idempotency key is already waiting are skipped, like in enqueue.
+
+    Args:
+        function (callable): A module-level function, called with the keyword arguments.
+        calls (list[tuple[str | None, dict]]): The idempotency key and keyword arguments of each call.
+    """
+    path = get_function_path(function)
+    Task.objects.bulk_create([Task(function=path, kwargs=kwargs, idempotency_key=key)
+                              for key, kwargs in calls],
+                             batch_size=500, ignore_conflicts=True)
+
+
+def claim_next_task() -> Task | None:
+    """
+    Mark the next due task as running and return it.
+
+    On PostgreSQL, SKIP LOCKED lets several workers claim different tasks at the same time.
+    A task left running past RUNNING_TIMEOUT is claimed again, unless it already used its
+    MAX_ATTEMPTS, in which case it is marked as failed instead.
+
+    Returns:
+        Task | None: The claimed task, or None if no task is due.
+    """
+    now = timezone.now()
+    due = Q(status=Task.PENDING, run_at__lte=now) | \
+        Q(status=Task.RUNNING, started_at__lt=now - RUNNING_TIMEOUT)
+
+    while True:
+        with transaction.atomic():
+            task = Task.objects.select_for_update(skip_locked=True) \
+                .filter(due).order_by('run_at', 'id').first()
+            if task is None:
+                return None
+
+            if task.status == Task.RUNNING and task.attempts >= MAX_ATTEMPTS:
+                # The last attempt killed or hung its worker, do not run it again
+                logger.error('Task %s timed out (attempt %s)', task, task.attempts)
+                task.status = Task.FAILED
+                task.last_error = f'Still running after {RUNNING_TIMEOUT}'
+                task.save(update_fields=['status', 'last_error'])
+                continue
+
+            task.status = Task.RUNNING
+            task.started_at = now
+            task.attempts += 1
+            task.save(update_fields=['status', 'started_at', 'attempts'])
+        return task
+
+
+def run_task(task: Task) -> bool:
+    """
+    Run a claimed task and record the outcome.
+
+    A failed task is scheduled again with an exponential backoff, until MAX_ATTEMPTS.
+
+    Args:
+        task (Task): The task returned by claim_next_task.
+
+    Returns:
+        bool: True if the task succeeded.
+    """
+    try:
+        import_string(task.function)(**task.kwargs)
+    except Exception as error:
+        logger.exception('Task %s failed (attempt %s)', task, task.attempts)
+        task.last_error = repr(error)
+        if task.attempts < MAX_ATTEMPTS:
+            task.status = Task.PENDING
+            task.run_at = timezone.now() + RETRY_DELAY * 2 ** (task.attempts - 1)
+        else:
+            task.status = Task.FAILED
+        try:
+            task.save(update_fields=['status', 'run_at', 'last_error'])
+        except IntegrityError:  # The same call was queued again meanwhile, it will run instead
+            task.delete()
+        return False
+
+    task.status = Task.DONE
+    task.save(update_fields=['status'])
+    return True
+
+
+def run_pending_tasks() -> int:
+    """
+    Run every task that is due, one after another.
+
+    Returns:
+        int: The number of tasks run.
+    """
+    count = 0
+    while (task := claim_next_task()) is not None:
+        run_task(task)
+        count += 1
+    return count
@@ -0,0 +1,23 @@
+from django import template
+from django.urls import reverse
+
+from action.utils.image_store import is_image_hash
+
+register = template.Library()
+
+
+@register.filter
+def image_url(image_hash: str, size: str = 'detail') -> str:
+    """
+    Return the URL of a stored image in the given size.
+
+    Args:
+        image_hash (str): The hash of the stored image.
+        size (str): One of the sizes in IMAGE_SIZES, 'detail' by default.
+
+    Returns:
+        str: The URL of the image, or an empty string if the value is not a stored image.
+    """
+    if not is_image_hash(image_hash):
+        return ''
+    return reverse('action:image', args=(image_hash, size))
@@ -0,0 +1,55 @@
+from django.test import TestCase
+from django.urls import reverse
+
+from action.admin import LARGE_TABLE_PER_PAGE
+from action.tests.utils import create_activity, create_activity_status, create_user, QueryBudgetMixin
+
+
+class ActivityAdminTests(QueryBudgetMixin, TestCase):
+    """Test case for the activity changelist of the admin site."""
+
+    def setUp(self):
+        """
+        Set up common attributes for the test methods.
+
+        1. Create a superuser and log in.
+        2. Create more activities than fit in one page, with limits and a participant.
+        """
+        self.admin = create_user(username='admin')
+        self.admin.is_staff = self.admin.is_superuser = True
+        self.admin.save()
+        self.client.force_login(self.admin)
+
+        owners = [create_user(username=f'owner{i}') for i in range(3)]
+        participant = create_user(username='participant')
+        for i in range(LARGE_TABLE_PER_PAGE + 5):
+            activity = create_activity(owners[i % 3], title=f'activity{i}', participant_limit=i % 4)
+            create_activity_status(participant, activity)
+
+    def test_changelist_query_budget(self):
+        """
+        Test that the changelist page runs a constant number of queries.
+
+        1. Open the changelist and assert that it stays within its query budget.
+        2. Assert that one page of activities is displayed.
+        """
+        with self.assertQueryBudget(10):
+            response = self.client.get(reverse('admin:action_activity_changelist'))
+
+        self.assertEqual(len(response.context['cl'].result_list), LARGE_TABLE_PER_PAGE)
+
+    def test_sort_by_remaining_space(self):
+        """
+        Test that the changelist can be sorted by remaining space.
+
+        1. Sort the changelist by the remaining space column.
+        2. Assert that the limited activities are in ascending order of remaining space.
+        """
+        url = reverse('admin:action_activity_changelist')
+        remaining_column = list(self.client.get(url).context['cl'].list_display).index('remaining_space')
+        response = self.client.get(url, {'o': remaining_column})
+
+        remaining = [activity.remaining for activity in response.context['cl'].result_list
+                     if activity.participant_limit]
+        self.assertTrue(remaining)
+        self.assertListEqual(remaining, sorted(remaining))
@@ -0,0 +1,136 @@
+import json
+import os
+import threading
+from email.parser import BytesParser
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest import mock
+
+import googleapiclient
+from django.test import TestCase
+from google.oauth2.credentials import Credentials
+from googleapiclient.discovery import build_from_document
+
+from action.calendar import BATCH_SIZE, enqueue_activity_update, sync_events
+from action.models import CalendarEventLink
+from action.tests.utils import create_activity, create_activity_status, create_user
+
+DISCOVERY_DOCUMENT = os.path.join(os.path.dirname(googleapiclient.__file__),
+                                  'discovery_cache', 'documents', 'calendar.v3.json')
+
+
+class FakeCalendarHandler(BaseHTTPRequestHandler):
+    """Answers Calendar API batch requests like Google does, and records them."""
+
+    def do_POST(self):
+        body = self.rfile.read(int(self.headers['Content-Length']))
+        header = f"Content-Type: {self.headers['Content-Type']}\r\n\r\n".encode()
+        batch = BytesParser().parsebytes(header + body)
+        self.server.batches.append([])
+
+        boundary = 'fake_batch_boundary'
+        response_parts = []
+        for part in batch.get_payload():
+            lines = part.get_payload().splitlines()
+            method, path, _ = lines[0].split(' ')
+            event = json.loads('\n'.join(lines[lines.index('') + 1:]))
+            self.server.batches[-1].append((method, path.split('?')[0], event))
+
+            event_json = json.dumps(event)
+            response_parts.append(
+                f'--{boundary}\r\n'
+                f'Content-Type: application/http\r\n'
+                f"Content-ID: <response-{part['Content-ID'][1:-1]}>\r\n\r\n"
+                f'HTTP/1.1 200 OK\r\n'
+                f'Content-Type: application/json; charset=UTF-8\r\n'
+                f'Content-Length: {len(event_json)}\r\n\r\n'
+                f'{event_json}\r\n')
+
+        response = (''.join(response_parts) + f'--{boundary}--\r\n').encode()
+        self.send_response(200)
+        self.send_header('Content-Type', f'multipart/mixed; boundary={boundary}')
+        self.send_header('Content-Length', str(len(response)))
+        self.end_headers()
+        self.wfile.write(response)
+
+    def log_message(self, format, *args):
+        pass  # Keep the test output clean
+
+
+class CalendarSyncTests(TestCase):
+    """Test case for the batched Google Calendar sync, against a local fake Calendar API."""
+
+    def setUp(self):
+        """
+        Set up common attributes for the test methods.
+
+        1. Start a fake Calendar API server on a free local port.
+        2. Build a Calendar service pointing to it, from the packaged discovery document.
+        3. Create a user who participates in more activities than fit in one batch,
+           each already linked to a calendar event.
+        """
+        self.server = ThreadingHTTPServer(('127.0.0.1', 0), FakeCalendarHandler)
+        self.server.batches = []
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        self.addCleanup(self.server.server_close)
+        self.addCleanup(self.server.shutdown)
+
+        with open(DISCOVERY_DOCUMENT) as document:
+            discovery = json.load(document)
+        discovery['rootUrl'] = f'http://127.0.0.1:{self.server.server_port}/'
+        self.service = build_from_document(discovery, credentials=Credentials(token='test-token'))
+
+        self.user = create_user()
+        self.activities = [create_activity(owner=self.user, title=f'Activity {i}')
+                           for i in range(BATCH_SIZE + 10)]
+        for activity in self.activities:
+            create_activity_status(self.user, activity)
+        CalendarEventLink.objects.bulk_create([
+            CalendarEventLink(user=self.user, activity=activity, event_id=f'event{activity.id}')
+            for activity in self.activities
+        ])
+
+    def sync(self) -> int:
+        """Run the sync with the service of the fake server."""
+        with mock.patch('action.calendar.build_service', return_value=self.service):
+            return sync_events(self.user)
+
+    def test_sync_in_batches(self):
+        """
+        Test that unsynced events are updated in batches.
+
+        1. Sync and assert that every event was updated.
+        2. Assert that the updates were sent in two batches of at most BATCH_SIZE.
+        3. Assert that each update targets the event of its activity with its title.
+        """
+        self.assertEqual(self.sync(), len(self.activities))
+
+        self.assertListEqual([len(batch) for batch in self.server.batches], [BATCH_SIZE, 10])
+        updates = {path: event for batch in self.server.batches for method, path, event in batch}
+        for activity in self.activities:
+            event = updates[f'/calendar/v3/calendars/primary/events/event{activity.id}']
+            self.assertEqual(event['summary'], activity.title)
+
+    def test_sync_only_changed_events(self):
+        """
+        Test that only activities changed since the last sync are sent.
+
+        1. Sync once, then sync again and assert that no request was made.
+        2. Change the title of one activity.
+        3. Sync and assert that a single update was sent for it.
+        """
+        self.sync()
+        self.server.batches.clear()
+
+        self.assertEqual(self.sync(), 0)
+        self.assertListEqual(self.server.batches, [])
+
+        changed_activity = self.activities[3]
+        changed_activity.title = 'New Title'
+        changed_activity.save()
+        enqueue_activity_update(changed_activity)
+
+        self.assertEqual(self.sync(), 1)
+        self.assertEqual(len(self.server.batches), 1)
+        (method, path, event), = self.server.batches[0]
+        self.assertEqual(path, f'/calendar/v3/calendars/primary/events/event{changed_activity.id}')
+        self.assertEqual(event['summary'], 'New Title')
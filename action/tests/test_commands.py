@@ -0,0 +1,140 @@
+from io import StringIO
+from unittest import skipIf
+
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.db import connection
+from django.test import TestCase
+
+from action.models import Activity
+from action.models.activity import get_popularity
+from action.utils.text_search_utils import get_search_backend
+from action.tests.utils import create_user, create_activity, create_activity_status
+
+
+class RebuildActivityCountersTests(TestCase):
+    """Test case for the rebuild_activity_counters management command."""
+
+    def setUp(self):
+        """
+        Set up common attributes for the test methods.
+
+        1. Create an owner and an activity.
+        2. Let two users participate and one of them favorite the activity.
+        """
+        self.owner = create_user(username='owner')
+        self.activity = create_activity(self.owner)
+        create_activity_status(create_user(username='user1'), self.activity, is_favorited=True)
+        create_activity_status(create_user(username='user2'), self.activity)
+
+    def test_counters_up_to_date(self):
+        """
+        Test that --check passes when the counters are correct.
+
+        1. Run the command with --check.
+        2. Assert that the output reports the counters as up to date.
+        """
+        out = StringIO()
+        call_command('rebuild_activity_counters', '--check', stdout=out)
+        self.assertIn('up to date', out.getvalue())
+
+    def test_rebuild_stale_counters(self):
+        """
+        Test that stale counters are detected and rebuilt.
+
+        1. Corrupt the stored counters with a raw update.
+        2. Assert that --check raises a CommandError.
+        3. Run the command and assert that the counters are rebuilt.
+        """
+        Activity.objects.filter(pk=self.activity.pk).update(participant_count=7, favorite_count=0)
+
+        with self.assertRaises(CommandError):
+            call_command('rebuild_activity_counters', '--check', stdout=StringIO())
+
+        call_command('rebuild_activity_counters', stdout=StringIO())
+        self.activity.refresh_from_db()
+        self.assertEqual(self.activity.participant_count, 2)
+        self.assertEqual(self.activity.favorite_count, 1)
+
+
+class RefreshPopularityTests(TestCase):
+    """Test case for the refresh_popularity management command."""
+
+    def test_refresh_popularity(self):
+        """
+        Test that the stored popularity follows the counters and is repaired by the command.
+
+        1. Create an activity and let a user participate.
+        2. Assert that the stored popularity matches the counters.
+        3. Overwrite the popularity with a raw update, then run the command.
+        4. Assert that the popularity is computed again.
+        """
+        activity = create_activity(create_user(username='owner'))
+        create_activity_status(create_user(username='user1'), activity, is_favorited=True)
+        activity.refresh_from_db()
+        expected = get_popularity(1, 1, activity.pub_date)
+        self.assertAlmostEqual(activity.popularity, expected)
+
+        Activity.objects.filter(pk=activity.pk).update(popularity=0)
+        out = StringIO()
+        call_command('refresh_popularity', stdout=out)
+        self.assertIn('1 activities', out.getvalue())
+        activity.refresh_from_db()
+        self.assertAlmostEqual(activity.popularity, expected)
+
+
+class RebuildSearchIndexTests(TestCase):
+    """Test case for the rebuild_search_index management command."""
+
+    def test_rebuild_after_bulk_update(self):
+        """
+        Test that the command indexes changes made without Activity.save().
+
+        1. Create an activity and rename it with a queryset update, which sends no signal.
+        2. Assert that the new title is not found.
+        3. Run the command and assert that the activity is found by its new title.
+        """
+        activity = create_activity(create_user(username='owner'), title='Marathon')
+        Activity.objects.filter(pk=activity.pk).update(title='Triathlon')
+        backend = get_search_backend()
+        self.assertFalse(backend.filter(Activity.objects.all(), 'triathlon').exists())
+
+        out = StringIO()
+        call_command('rebuild_search_index', stdout=out)
+        self.assertIn('Rebuilt', out.getvalue())
+        self.assertListEqual(list(backend.filter(Activity.objects.all(), 'triathlon')), [activity])
+
+
+class BenchmarkSearchTests(TestCase):
+    """Test case for the benchmark_search management command."""
+
+    @skipIf(connection.vendor == 'postgresql', 'The benchmark runs on PostgreSQL')
+    def test_requires_postgresql(self):
+        """
+        Test that the benchmark refuses to run without the trigram indexes.
+
+        1. Run the command on the SQLite test database.
+        2. Assert that it raises a CommandError and creates no rows.
+        """
+        with self.assertRaises(CommandError):
+            call_command('benchmark_search', rows=10, stdout=StringIO())
+        self.assertFalse(Activity.objects.exists())
+
+
+class BenchmarkDateSearchTests(TestCase):
+    """Test case for the benchmark_date_search management command."""
+
+    def test_benchmark_date_search(self):
+        """
+        Test that the benchmark times every date-based search and leaves no rows behind.
+
+        1. Run the command with a few rows and runs.
+        2. Assert that each search is reported with its percentiles.
+        3. Assert that the generated activities were rolled back.
+        """
+        out = StringIO()
+        call_command('benchmark_date_search', rows=50, runs=3, stdout=out)
+
+        for name in ['upcoming', 'recent', 'date_exact', 'date_start_point', 'date_end_point']:
+            self.assertRegex(out.getvalue(), rf'{name}\s+p50\s+[\d.]+\s+p95')
+        self.assertFalse(Activity.objects.exists())
@@ -1,10 +1,14 @@
 import logging
+from unittest import mock
 
+from django.conf import settings
 from django.http import Http404, HttpResponse, HttpResponseNotFound
-from django.test import Client, RequestFactory, TestCase
+from django.test import Client, RequestFactory, TestCase, override_settings
 from django.urls import reverse
 
-from action.middleware import Render404Middleware, RemoveWhitespaceMiddleware
+from action.middleware import QueryBudgetMiddleware, Render404Middleware, RemoveWhitespaceMiddleware
+from action.models import User
+from action.utils.query_utils import N_PLUS_ONE_THRESHOLD
 
 
 class MiddlewareTests(TestCase):
@@ -26,16 +30,19 @@ class MiddlewareTests(TestCase):
         """
         Test the Render404Middleware.
 
-        1. Create an instance of Render404Middleware with HttpResponseNotFound.
-        2. Make a client request to an invalid URL.
-        3. Assert that accessing the middleware raises Http404 and uses the '404_error.html' template.
+        1. Create an instance of Render404Middleware with a view returning HttpResponseNotFound.
+        2. Make a request to an invalid URL with DEBUG on, and assert that it raises Http404.
+        3. Make it again with DEBUG off, and assert that the '404_error.html' template is rendered.
         """
-        middleware = Render404Middleware(HttpResponseNotFound)
-        response = self.client.get('/invalid')
+        middleware = Render404Middleware(lambda request: HttpResponseNotFound())
+        request = self.factory.get('/invalid')
 
-        with self.assertRaises(Http404):
-            updated_response = middleware(response)
-            self.assertTemplateUsed(updated_response, '404_error.html')
+        with mock.patch('action.middleware.DEBUG', True), self.assertRaises(Http404):
+            middleware(request)
+
+        with mock.patch('action.middleware.DEBUG', False), self.assertTemplateUsed('404_error.html'):
+            response = middleware(request)
+        self.assertEqual(response.status_code, 404)
 
     def test_remove_whitespace_middleware(self):
         """
@@ -65,3 +72,38 @@ class MiddlewareTests(TestCase):
         session = self.client.session
         self.assertEqual(session.get('query'), 'query')
         self.assertEqual(session.get('tag'), 'categories')
+
+    @override_settings(MIDDLEWARE=['action.middleware.QueryBudgetMiddleware',
+                                   *(name for name in settings.MIDDLEWARE
+                                     if name != 'action.middleware.QueryBudgetMiddleware')])
+    def test_query_budget_middleware_server_timing(self):
+        """
+        Test that the QueryBudgetMiddleware reports the queries in the Server-Timing header.
+
+        1. Enable the middleware and make a client request to the index page.
+        2. Assert that the Server-Timing header contains the database time and query count.
+        """
+        response = self.client.get(reverse('action:index'))
+
+        self.assertRegex(response['Server-Timing'], r'^db;dur=\d+\.\d;desc="\d+ queries"$')
+
+    def test_query_budget_middleware_n_plus_one(self):
+        """
+        Test that the QueryBudgetMiddleware logs repeated queries.
+
+        1. Create a view that runs the same query N_PLUS_ONE_THRESHOLD times.
+        2. Call it through the middleware.
+        3. Assert that the query was logged as an N+1 query.
+        """
+        def view(request):
+            for i in range(N_PLUS_ONE_THRESHOLD):
+                User.objects.filter(id=i).exists()
+            return HttpResponse()
+
+        # Enable the logs disabled by other tests, until the end of this one
+        self.addCleanup(logging.disable, logging.root.manager.disable)
+        logging.disable(logging.NOTSET)
+        with self.assertLogs('action.middleware', 'WARNING') as logs:
+            QueryBudgetMiddleware(view)(self.factory.get('/'))
+
+        self.assertIn(f'run {N_PLUS_ONE_THRESHOLD} times', logs.output[0])
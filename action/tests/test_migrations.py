@@ -0,0 +1,69 @@
+import base64
+import shutil
+from io import StringIO
+from unittest import skipIf
+
+from django.core.files.storage import default_storage
+from django.core.management import call_command
+from django.db import connection
+from django.db.migrations.executor import MigrationExecutor
+from django.test import TransactionTestCase, override_settings
+
+from action.tests.test_utils.test_image_store import MEDIA_ROOT, create_image_file
+from action.tests.utils import create_user
+from action.utils import store_image
+from action.utils.image_store import get_image_name
+
+
+@skipIf(connection.vendor != 'sqlite', 'Reverses the PostgreSQL-only operations on SQLite')
+class TrigramMigrationTests(TransactionTestCase):
+    """Test case for the trigram index migration on the SQLite development database."""
+
+    def tearDown(self):
+        """Migrate the database back to the latest migration for the next tests."""
+        call_command('migrate', 'action', verbosity=0, stdout=StringIO())
+
+    def test_migrate_back_past_trigram_indexes(self):
+        """
+        Test that the trigram index migration can be reversed on SQLite.
+
+        1. Migrate the app back to the migration before the trigram indexes.
+        2. Assert that the trigram index migration is no longer applied.
+        """
+        call_command('migrate', 'action', '0010', verbosity=0, stdout=StringIO())
+
+        applied = MigrationExecutor(connection).loader.applied_migrations
+        self.assertIn(('action', '0010_activity_search_vector'), applied)
+        self.assertNotIn(('action', '0011_trigram_indexes'), applied)
+
+
+@override_settings(MEDIA_ROOT=MEDIA_ROOT)
+class ImageMigrationTests(TransactionTestCase):
+    """Test case for moving the stored images back into the database."""
+
+    def tearDown(self):
+        """Migrate the database back to the latest migration and remove the stored images."""
+        call_command('migrate', 'action', verbosity=0, stdout=StringIO())
+        shutil.rmtree(MEDIA_ROOT, ignore_errors=True)
+
+    def test_migrate_back_restores_base64_images(self):
+        """
+        Test that migrating back before the image store puts base64 images back in the database.
+
+        1. Create a user with a stored profile picture.
+        2. Migrate the app back to the migration before the image store.
+        3. Assert that the column holds the stored image encoded in base64.
+        """
+        image_hash = store_image(create_image_file())
+        user = create_user(username='pictured')
+        user.profile_picture = image_hash
+        user.save(update_fields=['profile_picture'])
+        with default_storage.open(get_image_name(image_hash, 'detail')) as image_file:
+            image_data = image_file.read()
+
+        call_command('migrate', 'action', '0007', verbosity=0, stdout=StringIO())
+
+        with connection.cursor() as cursor:
+            cursor.execute('SELECT profile_picture FROM action_user WHERE id = %s', [user.id])
+            profile_picture = cursor.fetchone()[0]
+        self.assertEqual(base64.b64decode(profile_picture), image_data)
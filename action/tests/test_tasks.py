@@ -0,0 +1,271 @@
+import logging
+from io import StringIO
+from unittest import mock
+
+from django.core.management import call_command
+from django.db.models import F
+from django.test import TestCase
+from django.utils import timezone
+from googleapiclient.errors import HttpError
+
+from action.calendar import enqueue_activity_event_sync, sync_activity_event
+from action.models import Activity, CalendarEventLink, Task
+from action.tasks import MAX_ATTEMPTS, RUNNING_TIMEOUT, claim_next_task, enqueue, run_task
+from action.tests.utils import create_activity, create_activity_status, create_user
+from action.utils import get_event_id
+
+calls = []
+
+
+def record_call(value):
+    """A task that records its argument."""
+    calls.append(value)
+
+
+def fail():
+    """A task that always fails."""
+    raise RuntimeError('Calendar API is down')
+
+
+class TaskQueueTests(TestCase):
+    """Test case for the database task queue."""
+
+    def setUp(self):
+        """Forget the calls recorded by the previous test."""
+        calls.clear()
+        logging.disable(logging.CRITICAL)  # Disable error messages of the failing task during unittest
+
+    def test_enqueue_merges_same_key(self):
+        """
+        Test that waiting tasks with the same idempotency key are merged.
+
+        1. Enqueue the same call twice with one key, and once with another key.
+        2. Assert that two tasks are waiting.
+        3. Run the worker and assert that each call ran once.
+        """
+        first = enqueue(record_call, idempotency_key='key', value=1)
+        second = enqueue(record_call, idempotency_key='key', value=1)
+        enqueue(record_call, idempotency_key='other', value=2)
+
+        self.assertEqual(first.id, second.id)
+        self.assertEqual(Task.objects.filter(status=Task.PENDING).count(), 2)
+
+        call_command('run_worker', '--once', stdout=StringIO())
+        self.assertListEqual(calls, [1, 2])
+        self.assertEqual(Task.objects.filter(status=Task.DONE).count(), 2)
+
+    def test_enqueue_after_run(self):
+        """
+        Test that a key can be queued again once its task has started.
+
+        1. Enqueue a call and claim it.
+        2. Enqueue the same key and assert that a new task is waiting.
+        """
+        task = enqueue(record_call, idempotency_key='key', value=1)
+        claim_next_task()
+
+        self.assertNotEqual(enqueue(record_call, idempotency_key='key', value=1).id, task.id)
+
+    def test_enqueue_while_claimed(self):
+        """
+        Test that a call is queued again when its waiting task is claimed during the insert.
+
+        1. Enqueue a call, then enqueue the same key while a worker claims the first task right
+           after the conflicting insert.
+        2. Assert that a new task is waiting for the second call.
+        """
+        task = enqueue(record_call, idempotency_key='key', value=1)
+        filter_tasks = Task.objects.filter
+        claimed = []
+
+        def claim_then_filter(*args, **kwargs):
+            if not claimed:
+                claimed.append(claim_next_task())
+            return filter_tasks(*args, **kwargs)
+
+        with mock.patch.object(Task.objects, 'filter', side_effect=claim_then_filter):
+            second = enqueue(record_call, idempotency_key='key', value=1)
+
+        self.assertEqual(claimed[0].id, task.id)
+        self.assertNotEqual(second.id, task.id)
+        self.assertEqual(Task.objects.get(idempotency_key='key', status=Task.PENDING).id, second.id)
+
+    def test_retry_with_backoff(self):
+        """
+        Test that a failed task is retried later, until MAX_ATTEMPTS.
+
+        1. Enqueue a failing task and run it.
+        2. Assert that it waits again, with a longer delay after each attempt.
+        3. Run it until MAX_ATTEMPTS and assert that it is marked as failed.
+        """
+        task = enqueue(fail)
+        delays = []
+        for attempt in range(1, MAX_ATTEMPTS + 1):
+            Task.objects.filter(id=task.id).update(run_at=timezone.now())
+            task = claim_next_task()
+            self.assertEqual(task.attempts, attempt)
+
+            self.assertFalse(run_task(task))
+            task.refresh_from_db()
+            if attempt < MAX_ATTEMPTS:
+                self.assertEqual(task.status, Task.PENDING)
+                delays.append(task.run_at - timezone.now())
+
+        self.assertEqual(task.status, Task.FAILED)
+        self.assertIn('Calendar API is down', task.last_error)
+        self.assertTrue(all(earlier < later for earlier, later in zip(delays, delays[1:])))
+
+    def test_not_due_task_is_not_run(self):
+        """
+        Test that a task scheduled for later is not claimed.
+
+        1. Enqueue a task and move it to the future.
+        2. Assert that no task is claimed.
+        """
+        task = enqueue(record_call, value=1)
+        Task.objects.filter(id=task.id).update(run_at=timezone.now() + timezone.timedelta(minutes=1))
+
+        self.assertIsNone(claim_next_task())
+
+    def test_timed_out_task_fails_after_max_attempts(self):
+        """
+        Test that a task left running is claimed again only until MAX_ATTEMPTS.
+
+        1. Enqueue two tasks left running past RUNNING_TIMEOUT, one of them at its last attempt.
+        2. Claim a task and assert that the other one is returned, with one more attempt.
+        3. Assert that the task at its last attempt is marked as failed.
+        """
+        started_at = timezone.now() - RUNNING_TIMEOUT - timezone.timedelta(minutes=1)
+        exhausted = enqueue(record_call, value=1)
+        retried = enqueue(record_call, value=2)
+        Task.objects.filter(id=exhausted.id).update(status=Task.RUNNING, started_at=started_at,
+                                                    attempts=MAX_ATTEMPTS)
+        Task.objects.filter(id=retried.id).update(status=Task.RUNNING, started_at=started_at, attempts=1)
+
+        task = claim_next_task()
+        self.assertEqual(task.id, retried.id)
+        self.assertEqual(task.attempts, 2)
+
+        exhausted.refresh_from_db()
+        self.assertEqual(exhausted.status, Task.FAILED)
+        self.assertIsNone(claim_next_task())
+
+
+class CalendarTaskTests(TestCase):
+    """Test case for the calendar task that follows the user's participation."""
+
+    def setUp(self):
+        """
+        Set up common attributes for the test methods.
+
+        1. Create a user and an activity.
+        """
+        self.user = create_user()
+        self.activity = create_activity(owner=create_user(username='owner'))
+
+    def sync(self):
+        """Run the queued calendar task with the calendar calls mocked."""
+        with mock.patch('action.calendar.create_event') as create_event, \
+                mock.patch('action.calendar.remove_event') as remove_event:
+            call_command('run_worker', '--once', stdout=StringIO())
+        return create_event, remove_event
+
+    def test_participate_then_leave_before_run(self):
+        """
+        Test that joining and leaving before the worker runs makes no calendar call.
+
+        1. Queue the sync twice for the same activity, without participating.
+        2. Run the worker and assert that no event was created or removed.
+        """
+        enqueue_activity_event_sync(self.user, self.activity.id)
+        enqueue_activity_event_sync(self.user, self.activity.id)
+
+        create_event, remove_event = self.sync()
+        create_event.assert_not_called()
+        remove_event.assert_not_called()
+
+    def test_create_event_when_participating(self):
+        """
+        Test that an event is created for a joined activity without event.
+
+        1. Participate in the activity and queue the sync.
+        2. Run the worker and assert that the event was created once.
+        """
+        create_activity_status(self.user, self.activity)
+        enqueue_activity_event_sync(self.user, self.activity.id)
+
+        create_event, remove_event = self.sync()
+        create_event.assert_called_once_with(self.user, self.activity.id)
+        remove_event.assert_not_called()
+
+    def test_remove_event_when_left(self):
+        """
+        Test that the event of a left activity is removed.
+
+        1. Link an event to the activity without participating.
+        2. Run the task and assert that the event was removed.
+        """
+        CalendarEventLink.objects.create(user=self.user, activity=self.activity, event_id='event1')
+
+        with mock.patch('action.calendar.remove_event') as remove_event:
+            sync_activity_event(self.user.id, self.activity.id)
+        remove_event.assert_called_once_with(self.user, self.activity.id)
+
+    def test_update_event_when_version_changed(self):
+        """
+        Test that the event of a joined activity is updated only when its version changed.
+
+        1. Participate in the activity with an event synced at the current version.
+        2. Run the task and assert that the event was not updated.
+        3. Increment the calendar version, run the task and assert that the event was updated.
+        """
+        create_activity_status(self.user, self.activity)
+        CalendarEventLink.objects.create(user=self.user, activity=self.activity, event_id='event1',
+                                         synced_version=self.activity.calendar_version)
+
+        with mock.patch('action.calendar.update_event') as update_event:
+            sync_activity_event(self.user.id, self.activity.id)
+        update_event.assert_not_called()
+
+        Activity.objects.filter(pk=self.activity.pk).update(calendar_version=F('calendar_version') + 1)
+        with mock.patch('action.calendar.update_event') as update_event:
+            sync_activity_event(self.user.id, self.activity.id)
+        update_event.assert_called_once_with(self.user, self.activity.id)
+
+    def test_delete_activity_queues_event_deletion(self):
+        """
+        Test that deleting an activity queues the deletion of its events.
+
+        1. Link an event of the user to the activity.
+        2. Delete the activity and assert that the link is gone.
+        3. Run the worker and assert that the event was deleted from the user's calendar.
+        """
+        CalendarEventLink.objects.create(user=self.user, activity=self.activity, event_id='event1')
+
+        self.activity.delete()
+        self.assertFalse(CalendarEventLink.objects.exists())
+
+        with mock.patch('action.calendar.delete_event') as delete_event:
+            call_command('run_worker', '--once', stdout=StringIO())
+        delete_event.assert_called_once_with(self.user, 'event1')
+
+    def test_create_event_again_updates_existing_event(self):
+        """
+        Test that creating an event that was already inserted does not duplicate it.
+
+        1. Participate in the activity, with the insert refused because the event ID is taken.
+        2. Run the task and assert that the event with the derived ID was updated instead.
+        3. Assert that the event is linked to the activity once.
+        """
+        create_activity_status(self.user, self.activity)
+        service = mock.Mock()
+        service.events().insert().execute.side_effect = HttpError(mock.Mock(status=409), b'')
+
+        with mock.patch('action.calendar.build_service', return_value=service):
+            sync_activity_event(self.user.id, self.activity.id)
+
+        event_id = get_event_id(self.user.id, self.activity.id)
+        service.events().update.assert_called_once_with(calendarId='primary', eventId=event_id,
+                                                        body=mock.ANY)
+        self.assertEqual(CalendarEventLink.objects.get(user=self.user, activity=self.activity).event_id,
+                         event_id)
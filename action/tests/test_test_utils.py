@@ -75,7 +75,9 @@ class TestUtilsTest(TestCase):
         self.assertIsNone(friend_status1.request_status)
         self.assertFalse(friend_status1.is_friend)
 
-        friend_status2 = create_friend_status(sender=sender, receiver=receiver, request_status='Accepted')
+        # A pair of users has a single status, so the second one needs another receiver
+        friend = create_user(username='friend_user', password='password', email='friend@example.com')
+        friend_status2 = create_friend_status(sender=sender, receiver=friend, request_status='Accepted')
         self.assertEqual(friend_status2.request_status, 'Accepted')
         self.assertTrue(friend_status2.is_friend)
 
@@ -0,0 +1,177 @@
+import threading
+
+from django.db import connection
+from django.http import Http404
+from django.test import TestCase, TransactionTestCase
+from django.urls import reverse
+from action.models import ActivityStatus
+from action.utils import ParticipationResult, participate_in_activity, set_activity_status_flag
+from action.tests.utils import create_activity, create_user
+
+
+class ActivityStatusUtilsTestCase(TestCase):
+    """Test case for the ActivityStatus utility functions."""
+
+    def setUp(self):
+        """
+        Set up common attributes for the test methods.
+
+        1. Create a user instance.
+        2. Create an activity owned by the user.
+        """
+        self.user = create_user()
+        self.activity = create_activity(owner=self.user)
+
+    def test_view_does_not_create_status(self):
+        """
+        Test that viewing an activity does not create a status for the viewer.
+
+        1. Log in as another user and view the detail page of the activity.
+        2. Assert that the page shows no status and that no status was created.
+        """
+        viewer = create_user(username='viewer')
+        self.client.force_login(viewer)
+        response = self.client.get(reverse('action:detail', args=(self.activity.id,)))
+
+        self.assertFalse(response.context['activity_status'].is_participated)
+        self.assertFalse(ActivityStatus.objects.filter(participants=viewer).exists())
+
+    def test_set_flag_creates_status(self):
+        """
+        Test setting a flag when the user has no status for the activity.
+
+        1. Favorite the activity and assert that the flag changed.
+        2. Assert that a single status was created with only the favorite flag.
+        3. Assert that the favorite counter was incremented.
+        """
+        self.assertTrue(set_activity_status_flag(self.user, self.activity.id, 'is_favorited', True))
+
+        status = ActivityStatus.objects.get(participants=self.user, activity=self.activity)
+        self.assertTrue(status.is_favorited)
+        self.assertFalse(status.is_participated)
+        self.activity.refresh_from_db()
+        self.assertEqual(self.activity.favorite_count, 1)
+
+    def test_set_flag_twice(self):
+        """
+        Test that repeating a change is not applied twice.
+
+        1. Favorite twice and assert that only the first call changed the flag.
+        2. Participate and assert that there is one status and the participant counter is 1.
+        3. Leave twice and assert that only the first call changed the flag.
+        4. Assert that the participant counter is back to 0.
+        """
+        self.assertTrue(set_activity_status_flag(self.user, self.activity.id, 'is_favorited', True))
+        self.assertFalse(set_activity_status_flag(self.user, self.activity.id, 'is_favorited', True))
+        participate_in_activity(self.user, self.activity.id)
+        self.assertEqual(ActivityStatus.objects.count(), 1)
+        self.activity.refresh_from_db()
+        self.assertEqual(self.activity.participant_count, 1)
+
+        self.assertTrue(set_activity_status_flag(self.user, self.activity.id, 'is_participated', False))
+        self.assertFalse(set_activity_status_flag(self.user, self.activity.id, 'is_participated', False))
+        self.activity.refresh_from_db()
+        self.assertEqual(self.activity.participant_count, 0)
+
+    def test_set_flag_cannot_participate(self):
+        """
+        Test that participating is refused, since it would skip the participant limit.
+
+        1. Fill the activity with another user.
+        2. Assert that setting the participation flag raises ValueError.
+        3. Assert that no status was created and the counter did not change.
+        """
+        self.activity.participant_limit = 1
+        self.activity.save()
+        participate_in_activity(create_user(username='other'), self.activity.id)
+
+        with self.assertRaises(ValueError):
+            set_activity_status_flag(self.user, self.activity.id, 'is_participated', True)
+
+        self.assertFalse(ActivityStatus.objects.filter(participants=self.user).exists())
+        self.activity.refresh_from_db()
+        self.assertEqual(self.activity.participant_count, 1)
+
+    def test_set_flag_missing_activity(self):
+        """
+        Test setting a flag on an activity that does not exist.
+
+        1. Assert that favoriting and unfavoriting a missing activity raise Http404.
+        2. Assert that no status was created.
+        """
+        with self.assertRaises(Http404):
+            set_activity_status_flag(self.user, self.activity.id + 1, 'is_favorited', True)
+        with self.assertRaises(Http404):
+            set_activity_status_flag(self.user, self.activity.id + 1, 'is_favorited', False)
+        self.assertFalse(ActivityStatus.objects.exists())
+
+    def test_participate_until_full(self):
+        """
+        Test participating in an activity with a participant limit.
+
+        1. Set the limit of the activity to 1.
+        2. Assert the first user joins and joining again is reported as already joined.
+        3. Assert a second user gets FULL and no status is kept for them.
+        """
+        self.activity.participant_limit = 1
+        self.activity.save()
+        other_user = create_user(username='other')
+
+        self.assertEqual(participate_in_activity(self.user, self.activity.id), ParticipationResult.JOINED)
+        self.assertEqual(participate_in_activity(self.user, self.activity.id),
+                         ParticipationResult.ALREADY_JOINED)
+        self.assertEqual(participate_in_activity(other_user, self.activity.id), ParticipationResult.FULL)
+
+        self.assertFalse(ActivityStatus.objects.filter(participants=other_user).exists())
+        self.activity.refresh_from_db()
+        self.assertEqual(self.activity.participant_count, 1)
+
+
+class ParticipationConcurrencyTests(TransactionTestCase):
+    """Stress test of concurrent participation against the test database."""
+
+    USERS = 20
+    LIMIT = 5
+
+    def setUp(self):
+        """Skip on an in-memory SQLite database, which threads cannot share."""
+        if connection.vendor == 'sqlite' and connection.is_in_memory_db():
+            self.skipTest('The in-memory SQLite test database cannot be shared by threads')
+
+    def test_concurrent_participation_never_overbooks(self):
+        """
+        Test that concurrent requests never exceed the participant limit.
+
+        1. Create an activity with a limit and more users than seats.
+        2. Let every user participate at the same moment, each from its own thread and connection.
+        3. Assert that exactly the limit joined and every other user was told it is full.
+        4. Assert that the counter and the stored statuses both match the limit.
+        """
+        owner = create_user(username='owner')
+        activity = create_activity(owner=owner, participant_limit=self.LIMIT)
+        users = [create_user(username=f'user{i}') for i in range(self.USERS)]
+
+        barrier = threading.Barrier(self.USERS)
+        results = []
+
+        def participate(user):
+            try:
+                barrier.wait()
+                results.append(participate_in_activity(user, activity.id))
+            finally:
+                connection.close()
+
+        threads = [threading.Thread(target=participate, args=(user,)) for user in users]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(len(results), self.USERS)
+        self.assertEqual(results.count(ParticipationResult.JOINED), self.LIMIT)
+        self.assertEqual(results.count(ParticipationResult.FULL), self.USERS - self.LIMIT)
+
+        activity.refresh_from_db()
+        self.assertEqual(activity.participant_count, self.LIMIT)
+        self.assertEqual(ActivityStatus.objects.filter(activity=activity, is_participated=True).count(),
+                         self.LIMIT)
@@ -0,0 +1,105 @@
+from django.core.cache import cache
+from django.test import RequestFactory, TestCase, override_settings
+from django.urls import reverse
+from action.utils.cache_utils import get_request_cache_key
+from action.utils.query_utils import QueryRecorder
+from action.tests.utils import create_activity, create_user
+
+LOCAL_MEMORY_CACHE = {'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}}
+
+
+@override_settings(CACHES=LOCAL_MEMORY_CACHE)
+class PageCacheTestCase(TestCase):
+    """Test case for the page cache of anonymous visitors."""
+
+    def setUp(self):
+        """
+        Set up common attributes for the test methods.
+
+        1. Empty the cache.
+        2. Create a user and an activity.
+        """
+        cache.clear()
+        self.user = create_user()
+        with self.captureOnCommitCallbacks(execute=True):
+            self.activity = create_activity(self.user, title='Cached')
+
+    def test_anonymous_page_cached(self):
+        """
+        Test that anonymous visitors get the cached index and detail pages.
+
+        1. Request each page twice.
+        2. Assert that the first response was rendered and the second one was not.
+        3. Assert that both responses have the same content.
+        """
+        for url in [reverse('action:index'), reverse('action:detail', args=(self.activity.id,))]:
+            first = self.client.get(url)
+            second = self.client.get(url)
+
+            self.assertIsNotNone(first.context)
+            self.assertIsNone(second.context)
+            self.assertEqual(first.content, second.content)
+
+    def test_change_invalidates_pages(self):
+        """
+        Test that saving an activity makes the cached pages stale.
+
+        1. Request the index to cache it.
+        2. Rename the activity.
+        3. Assert that the index is rendered again with the new title.
+        """
+        self.client.get(reverse('action:index'))
+
+        self.activity.title = 'Renamed'
+        with self.captureOnCommitCallbacks(execute=True):
+            self.activity.save()
+
+        response = self.client.get(reverse('action:index'))
+        self.assertIsNotNone(response.context)
+        self.assertContains(response, 'Renamed')
+
+    def test_logged_in_page_not_cached(self):
+        """
+        Test that logged in users always get a rendered page.
+
+        1. Log in and request the index twice.
+        2. Assert that both responses were rendered.
+        """
+        self.client.force_login(self.user)
+
+        self.assertIsNotNone(self.client.get(reverse('action:index')).context)
+        self.assertIsNotNone(self.client.get(reverse('action:index')).context)
+
+    def test_logged_in_fragments_cached(self):
+        """
+        Test that logged in users get the shared parts of the detail page from the cache.
+
+        1. Log in and request the detail page twice, recording the queries.
+        2. Assert that the second request ran fewer queries, without the participants query.
+        """
+        self.client.force_login(self.user)
+        url = reverse('action:detail', args=(self.activity.id,))
+
+        with QueryRecorder() as first:
+            self.client.get(url)
+        with QueryRecorder() as second:
+            self.client.get(url)
+
+        self.assertLess(second.count, first.count)
+
+    def test_request_cache_key(self):
+        """
+        Test that equivalent query strings share a key and different searches do not.
+
+        1. Assert that reordered parameters with different names have the same key.
+        2. Assert that swapping paired search values gives a different key.
+        """
+        factory = RequestFactory()
+
+        def key(query_string):
+            return get_request_cache_key(factory.get('/action/?' + query_string))
+
+        self.assertEqual(key('tag=title&q=run'), key('q=run&tag=title'))
+        self.assertEqual(key('tag=title&q=run'), key('tag=title&q=%20run%20'))
+        self.assertNotEqual(key('tag=title&q=run&tag=place&q=park'),
+                            key('tag=title&q=park&tag=place&q=run'))
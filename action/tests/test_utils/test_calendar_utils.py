@@ -0,0 +1,75 @@
+from unittest import mock
+
+from allauth.socialaccount.models import SocialAccount, SocialToken
+from django.test import TestCase
+from action.utils import build_service, forget_credentials, get_credentials
+from action.utils import calendar_utils
+from action.tests.utils import create_social_app, create_user
+
+
+class CalendarUtilsTestCase(TestCase):
+    """Test case for the cached Google API service and credentials."""
+
+    def setUp(self):
+        """
+        Set up common attributes for the test methods.
+
+        1. Create the Google social app.
+        2. Create a user with a Google account and token.
+        3. Forget the credentials cached by other tests.
+        """
+        self.user = create_user()
+        account = SocialAccount.objects.create(user=self.user, provider='google', uid='123')
+        self.token = SocialToken.objects.create(app=create_social_app(), account=account,
+                                                token='access', token_secret='refresh')
+        forget_credentials(self.user.id)
+        self.addCleanup(forget_credentials, self.user.id)
+
+    def test_credentials_are_cached(self):
+        """
+        Test that the credentials are loaded once per user.
+
+        1. Get the credentials and assert that they use the refresh token.
+        2. Get them again and assert that the same object is returned without a query.
+        """
+        credentials = get_credentials(self.user)
+        self.assertEqual(credentials.refresh_token, 'refresh')
+
+        with self.assertNumQueries(0):
+            self.assertIs(get_credentials(self.user), credentials)
+            build_service(self.user)
+
+    def test_token_change_invalidates_cache(self):
+        """
+        Test that saving the token drops the cached credentials.
+
+        1. Get the credentials.
+        2. Save a new refresh token.
+        3. Assert that the next credentials use the new token.
+        """
+        get_credentials(self.user)
+
+        self.token.token_secret = 'new refresh'
+        self.token.save()
+
+        self.assertEqual(get_credentials(self.user).refresh_token, 'new refresh')
+
+    def test_least_recently_used_evicted(self):
+        """
+        Test that the cache keeps at most CREDENTIALS_CACHE_SIZE users.
+
+        1. Limit the cache to one user.
+        2. Get the credentials of the user, then of another user.
+        3. Assert that only the other user is cached.
+        """
+        other_user = create_user(username='other')
+        account = SocialAccount.objects.create(user=other_user, provider='google', uid='456')
+        SocialToken.objects.create(app=self.token.app, account=account, token_secret='other refresh')
+        self.addCleanup(forget_credentials, other_user.id)
+
+        with mock.patch.object(calendar_utils, 'CREDENTIALS_CACHE_SIZE', 1):
+            get_credentials(self.user)
+            get_credentials(other_user)
+
+        self.assertNotIn(self.user.id, calendar_utils._credentials_cache)
+        self.assertIn(other_user.id, calendar_utils._credentials_cache)
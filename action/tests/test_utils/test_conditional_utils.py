@@ -0,0 +1,106 @@
+from django.test import TestCase
+from django.urls import reverse
+
+from action.models import Activity
+from action.utils import participate_in_activity, set_activity_status_flag
+from action.tests.utils import create_activity, create_user
+
+
+class ConditionalPageTestCase(TestCase):
+    """Test case for the 304 Not Modified responses of the detail, profile and manage pages."""
+
+    def setUp(self):
+        """
+        Set up common attributes for the test methods.
+
+        1. Create an owner, another user and an activity.
+        2. Log in as the owner.
+        """
+        self.owner = create_user(username='owner')
+        self.other_user = create_user(username='other')
+        self.activity = create_activity(self.owner, title='Conditional')
+        self.client.force_login(self.owner)
+
+    def revalidate(self, url: str):
+        """Request a page, then request it again with the ETag of the previous response."""
+        etag = self.client.get(url)['ETag']
+        return self.client.get(url, headers={'If-None-Match': etag})
+
+    def test_not_modified(self):
+        """
+        Test that repeated views of each page are answered without rendering.
+
+        1. Request the detail, profile and manage pages twice, sending back the ETag.
+        2. Assert that the second responses are 304 without a rendered template.
+        """
+        for url in [reverse('action:detail', args=(self.activity.id,)),
+                    reverse('action:profile'), reverse('action:manage')]:
+            response = self.revalidate(url)
+            self.assertEqual(response.status_code, 304)
+            self.assertIsNone(response.context)
+            self.assertIn('no-cache', response['Cache-Control'])
+
+    def test_detail_modified(self):
+        """
+        Test that the detail page is rendered again after anything it displays changes.
+
+        1. Get the ETag of the detail page.
+        2. Edit the activity, let another user join, favorite it, and rename a participant.
+        3. Assert that each change makes the next request render the page.
+        """
+        url = reverse('action:detail', args=(self.activity.id,))
+        changes = [
+            lambda: Activity.objects.get(pk=self.activity.id).save(),
+            lambda: participate_in_activity(self.other_user, self.activity.id),
+            lambda: set_activity_status_flag(self.owner, self.activity.id, 'is_favorited', True),
+            lambda: setattr(self.other_user, 'username', 'renamed') or self.other_user.save(),
+        ]
+        for change in changes:
+            etag = self.client.get(url)['ETag']
+            change()
+            self.assertEqual(self.client.get(url, headers={'If-None-Match': etag}).status_code, 200)
+
+    def test_other_viewer(self):
+        """
+        Test that the ETag of a page depends on who views it.
+
+        1. Get the ETag of the detail page as the owner.
+        2. Log in as the other user and send it back.
+        3. Assert that the page is rendered.
+        """
+        url = reverse('action:detail', args=(self.activity.id,))
+        etag = self.client.get(url)['ETag']
+
+        self.client.force_login(self.other_user)
+        self.assertEqual(self.client.get(url, headers={'If-None-Match': etag}).status_code, 200)
+
+    def test_manage_modified(self):
+        """
+        Test that the manage page is rendered again after an activity is deleted.
+
+        1. Get the ETag of the manage page.
+        2. Delete the activity.
+        3. Assert that the next request renders the page.
+        """
+        url = reverse('action:manage')
+        etag = self.client.get(url)['ETag']
+        self.activity.delete()
+        self.assertEqual(self.client.get(url, headers={'If-None-Match': etag}).status_code, 200)
+
+    def test_pending_message_rendered(self):
+        """
+        Test that a page with a pending message is rendered and has no ETag.
+
+        1. Get the ETag of the profile page.
+        2. Store a message and request the page with the ETag.
+        3. Assert that the page is rendered without an ETag.
+        """
+        url = reverse('action:profile')
+        etag = self.client.get(url)['ETag']
+
+        # Leaving an activity that was not joined only queues a message
+        self.client.get(reverse('action:leave', args=(self.activity.id,)))
+
+        response = self.client.get(url, headers={'If-None-Match': etag})
+        self.assertEqual(response.status_code, 200)
+        self.assertFalse(response.has_header('ETag'))
@@ -1,6 +1,7 @@
 from django.test import TestCase
 from action.models import FriendStatus
-from action.utils import fetch_friend_status
+from action.utils import fetch_friend_status, send_friend_request, accept_friend_request, \
+    remove_friend, are_friends
 from action.tests.utils import create_user, create_friend_status, create_request
 
 
@@ -50,8 +51,30 @@ class FriendStatusUtilsTestCase(TestCase):
 
         1. Create a request instance where user1 is the sender.
         2. Call fetch_friend_status for user2's id.
-        3. Assert that the result is an instance of FriendStatus.
+        3. Assert that there is no status and that none was created.
         """
         request = create_request(self.view, [self.user2.id], user=self.user1)
-        get_friend_status = fetch_friend_status(request, self.user2.id)
-        self.assertTrue(isinstance(get_friend_status, FriendStatus))
+        self.assertIsNone(fetch_friend_status(request, self.user2.id))
+        self.assertFalse(FriendStatus.objects.exists())
+
+    def test_friend_request_upserts(self):
+        """
+        Test the friend request functions keep a single status per pair.
+
+        1. Send a request from user1 and assert that user2 cannot send one back.
+        2. Accept the request as user2, then assert accepting again changes nothing.
+        3. Assert that a single status exists and the users are friends.
+        4. Remove the friend and assert that a new request can be sent by user2.
+        """
+        self.assertTrue(send_friend_request(self.user1, self.user2.id))
+        self.assertFalse(send_friend_request(self.user2, self.user1.id))
+
+        self.assertTrue(accept_friend_request(self.user2, self.user1.id))
+        self.assertFalse(accept_friend_request(self.user2, self.user1.id))
+        self.assertEqual(FriendStatus.objects.count(), 1)
+        self.assertTrue(are_friends(self.user1, self.user2.id))
+
+        self.assertTrue(remove_friend(self.user1, self.user2.id))
+        self.assertTrue(send_friend_request(self.user2, self.user1.id))
+        friend_status = FriendStatus.objects.get()
+        self.assertEqual((friend_status.sender, friend_status.receiver), (self.user2, self.user1))
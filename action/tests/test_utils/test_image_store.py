@@ -0,0 +1,101 @@
+import shutil
+import tempfile
+from io import BytesIO
+
+from django.core.files.storage import default_storage
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import TestCase, override_settings
+from PIL import Image
+
+from action.utils import store_image, store_background_images
+from action.utils.image_store import IMAGE_SIZES, get_image_name, is_image_hash
+
+MEDIA_ROOT = tempfile.mkdtemp()
+
+
+def create_image_file(name='test_image.png', color='red') -> SimpleUploadedFile:
+    """
+    Create an uploaded PNG image file.
+
+    Args:
+        name (str): The file name.
+        color (str): The color of the image, different colors give different files.
+
+    Returns:
+        SimpleUploadedFile: The uploaded image file.
+    """
+    image_bytes = BytesIO()
+    Image.new('RGB', (300, 200), color).save(image_bytes, format='PNG')
+    return SimpleUploadedFile(name, image_bytes.getvalue(), content_type="image/png")
+
+
+@override_settings(MEDIA_ROOT=MEDIA_ROOT)
+class ImageStoreTest(TestCase):
+    """Test case for the image store utility functions."""
+
+    @classmethod
+    def tearDownClass(cls):
+        """Remove the stored test images."""
+        shutil.rmtree(MEDIA_ROOT, ignore_errors=True)
+        super().tearDownClass()
+
+    def test_store_valid_image(self):
+        """
+        Test storing a valid image file.
+
+        1. Store an uploaded PNG image.
+        2. Assert that the result is an image hash.
+        3. Assert that every thumbnail size is stored in its dimension.
+        """
+        image_hash = store_image(create_image_file())
+        self.assertTrue(is_image_hash(image_hash))
+
+        for size, dimension in IMAGE_SIZES.items():
+            with default_storage.open(get_image_name(image_hash, size)) as stored_file:
+                self.assertEqual(Image.open(stored_file).size, dimension)
+
+    def test_store_same_image_twice(self):
+        """
+        Test that identical uploads share the same stored image.
+
+        1. Store the same image twice and a different image once.
+        2. Assert that the identical uploads have the same hash and the other one differs.
+        """
+        self.assertEqual(store_image(create_image_file()), store_image(create_image_file('copy.png')))
+        self.assertNotEqual(store_image(create_image_file()), store_image(create_image_file(color='blue')))
+
+    def test_store_non_image(self):
+        """
+        Test storing invalid values.
+
+        1. Store a text file, None and a string that is not a hash.
+        2. Assert that the results are empty strings.
+        """
+        non_image_file = SimpleUploadedFile("non_image_file.txt", b'text', content_type="text/plain")
+        self.assertEqual(store_image(non_image_file), '')
+        self.assertEqual(store_image(None), '')
+        self.assertEqual(store_image('not a hash'), '')
+
+    def test_store_existing_hash(self):
+        """
+        Test that an image hash that is passed back by a form is kept.
+
+        1. Store an image.
+        2. Assert that storing its hash returns the same hash.
+        """
+        image_hash = store_image(create_image_file())
+        self.assertEqual(store_image(image_hash), image_hash)
+
+    def test_store_background_images(self):
+        """
+        Test storing a list of background images, skipping invalid files.
+
+        1. Store two images with an invalid file between them.
+        2. Assert that the keys are numbered without gaps.
+        """
+        non_image_file = SimpleUploadedFile("non_image_file.txt", b'', content_type="text/plain")
+        background = store_background_images(
+            [create_image_file(), non_image_file, create_image_file(color='blue')])
+
+        self.assertEqual(list(background), ['background 1', 'background 2'])
+        self.assertTrue(all(is_image_hash(value) for value in background.values()))
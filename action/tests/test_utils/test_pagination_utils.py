@@ -0,0 +1,127 @@
+from django.db.models import F
+from django.http import Http404
+from django.test import RequestFactory, TestCase
+from django.urls import reverse
+from django.utils import timezone
+
+from action.models import Activity
+from action.utils.pagination_utils import paginate_keyset, get_keyset_ordering
+from action.utils.search_utils import BaseSearcher
+from action.tests.utils import create_activity, create_user, quick_join
+
+
+class PaginationUtilsTests(TestCase):
+    """Test case for the keyset pagination utility functions."""
+
+    def setUp(self) -> None:
+        """
+        Set up common attributes for the test methods.
+
+        1. Create a user instance.
+        2. Create 7 activities, two of them sharing the same publication date.
+        """
+        self.user = create_user()
+        now = timezone.now()
+        self.activity_list = [
+            create_activity(self.user, title=f'activity{i}',
+                            pub_date=now - timezone.timedelta(hours=i // 2))
+            for i in range(7)
+        ]
+
+    def collect_pages(self, queryset, per_page):
+        """Follow the cursors until the last page and return all rows and the number of pages."""
+        rows, pages, cursor = [], 0, None
+        while True:
+            page = paginate_keyset(queryset, cursor, per_page)
+            rows.extend(page.object_list)
+            pages += 1
+            if not page.has_next:
+                return rows, pages
+            cursor = page.next_cursor
+
+    def test_keyset_ordering_has_tiebreaker(self):
+        """
+        Test that the id is appended to the ordering as a tiebreaker.
+
+        1. Assert that ordering by '-pub_date' becomes ['-pub_date', '-id'].
+        2. Assert that an ordering that already contains the id is left as it is.
+        """
+        self.assertEqual(get_keyset_ordering(Activity.objects.order_by('-pub_date')),
+                         ['-pub_date', '-id'])
+        self.assertEqual(get_keyset_ordering(Activity.objects.order_by('title', 'id')),
+                         ['title', 'id'])
+
+    def test_cursor_walks_all_rows_once(self):
+        """
+        Test that following the cursors returns every row exactly once, in order.
+
+        1. Paginate the activities by 3 per page with cursors.
+        2. Assert that there are 3 pages.
+        3. Assert that the rows equal the fully ordered queryset.
+        """
+        queryset = Activity.objects.order_by('-pub_date', '-id')
+        rows, pages = self.collect_pages(queryset, per_page=3)
+
+        self.assertEqual(pages, 3)
+        self.assertEqual(rows, list(queryset))
+
+    def test_cursor_on_annotated_ordering(self):
+        """
+        Test cursor pagination of the popular searcher, which is ordered by an annotation.
+
+        1. Let different numbers of users join the activities.
+        2. Paginate the popular searcher by 2 per page with cursors.
+        3. Assert that the rows equal the fully ordered queryset.
+        """
+        for i, activity in enumerate(self.activity_list[:4]):
+            for j in range(i % 3 + 1):
+                quick_join(f'user{i}-{j}', activity)
+
+        request = RequestFactory().get(reverse('action:index'), {'tag': 'popular'})
+        request.user = self.user
+        queryset = BaseSearcher(request).get_index_query()
+        rows, _ = self.collect_pages(queryset, per_page=2)
+
+        self.assertEqual(rows, list(queryset))
+        self.assertEqual(len(rows), 4)
+
+    def test_cursor_with_null_values(self):
+        """
+        Test that cursors walk past rows whose ordering value is NULL.
+
+        1. Clear the start date of some activities.
+        2. Paginate by start date, in both directions, by 2 per page with cursors.
+        3. Assert that every activity is returned once, with the NULLs last.
+        """
+        Activity.objects.filter(pk__in=[each.pk for each in self.activity_list[::2]]).update(start_date=None)
+
+        for ordering in ['start_date', '-start_date']:
+            with self.subTest(ordering=ordering):
+                rows, _ = self.collect_pages(Activity.objects.order_by(ordering), per_page=2)
+
+                self.assertCountEqual([each.pk for each in rows], [each.pk for each in self.activity_list])
+                start_dates = [each.start_date for each in rows]
+                self.assertEqual(start_dates[-4:], [None] * 4)
+
+    def test_unsupported_ordering(self):
+        """
+        Test that orderings a cursor cannot hold are rejected.
+
+        1. Paginate by an expression, a related field and at random.
+        2. Assert that each raises ValueError.
+        """
+        for queryset in [Activity.objects.order_by(F('pub_date').desc()),
+                         Activity.objects.order_by('owner__username'),
+                         Activity.objects.order_by('?')]:
+            with self.subTest(ordering=queryset.query.order_by), self.assertRaises(ValueError):
+                paginate_keyset(queryset, None, 3)
+
+    def test_invalid_cursor(self):
+        """
+        Test that a malformed cursor raises Http404.
+
+        1. Paginate with a cursor that is not base64 JSON.
+        2. Assert that Http404 is raised.
+        """
+        with self.assertRaises(Http404):
+            paginate_keyset(Activity.objects.order_by('-pub_date'), 'not-a-cursor', 3)
@@ -2,7 +2,7 @@ import logging
 
 from django.urls import reverse
 from django.utils import timezone
-from django.test import RequestFactory, TestCase
+from django.test import RequestFactory, TestCase, override_settings
 from action.utils.search_utils import BaseSearcher
 from action.tests.utils import create_activity, create_activity_status, \
     create_friend_status, create_category, create_user, quick_join
@@ -147,6 +147,26 @@ class SearchUtilsTests(TestCase):
         query = searcher.get_index_query().first()
         self.assertEqual(query, activity_exact_date)
 
+    @override_settings(TIME_ZONE='Asia/Bangkok')
+    def test_exact_date_search_time_zone(self):
+        """
+        Test that an exact date covers the day in the configured time zone, midnight excluded.
+
+        1. Create activities starting late on May 1st and at midnight on May 2nd, Bangkok time.
+        2. Search May 1st and assert that only the first one is returned.
+        3. Search May 2nd and assert that only the second one is returned.
+        """
+        bangkok = timezone.get_current_timezone()
+        late_evening = create_activity(owner=self.user, title="Late",
+                                       start_date=timezone.datetime(2024, 5, 1, 23, 30, tzinfo=bangkok))
+        midnight = create_activity(owner=self.user, title="Midnight",
+                                   start_date=timezone.datetime(2024, 5, 2, 0, 0, tzinfo=bangkok))
+
+        for day, expected in [('2024-05-01T12:00', late_evening), ('2024-05-02T12:00', midnight)]:
+            request = self.factory.get(reverse('action:index'), {'tag': 'date_exact', 'q': day})
+            request.user = self.user
+            self.assertListEqual(list(BaseSearcher(request).get_index_query()), [expected])
+
     def test_upcoming_search(self):
         """
         Test searching for upcoming activities.
@@ -195,6 +215,26 @@ class SearchUtilsTests(TestCase):
         query_list = list(searcher.get_index_query())
         self.assertListEqual(query_list, [activity1, activity2, activity3])
 
+    def test_popular_search_decay(self):
+        """
+        Test that the popularity of older activities decays.
+
+        1. Create an activity with three participants published three weeks ago.
+        2. Create an activity with one participant published today.
+        3. Assert that the newer activity comes first in the popular list.
+        """
+        request = self.factory.get(reverse('action:index'), {'tag': 'popular'})
+        request.user = self.user
+
+        older = create_activity(owner=self.user, title="Older",
+                                pub_date=timezone.now() - timezone.timedelta(weeks=3))
+        newer = create_activity(owner=self.user, title="Newer")
+        for username in ["user1", "user2", "user3"]:
+            quick_join(username, older)
+        quick_join("user4", newer)
+
+        self.assertListEqual(list(BaseSearcher(request).get_index_query()), [newer, older])
+
     def test_recent_search(self):
         """
         Test searching for recent activities.
@@ -314,13 +354,13 @@ class SearchUtilsTests(TestCase):
 
         # activity1 has category 1-5, activity2 has category 3-7, activity2 has category 6-10
         activity1 = create_activity(owner=create_user("New User 1"),
-                                    title="Test Multiple Categories 1",
+                                    title="Multiple Categories 1",
                                     categories=activity_categories[0:5])
         activity2 = create_activity(owner=create_user("New User 2"),
-                                    title="Test Multiple Categories 2",
+                                    title="Multiple Categories 2",
                                     categories=activity_categories[2:7])
         activity3 = create_activity(owner=create_user("New User 3"),
-                                    title="Test Multiple Categories 3",
+                                    title="Multiple Categories 3",
                                     categories=activity_categories[5:10])
 
         # Case 1: Category 1-2 in activity1
@@ -442,3 +482,101 @@ class SearchUtilsTests(TestCase):
         searcher = BaseSearcher(request)
         query = list(searcher.get_index_query())
         self.assertListEqual(query, [activity1])
+
+    def test_text_search(self):
+        """
+        Test full-text searching across the activity fields.
+
+        1. Create activities matching the words in the title, the description and the place.
+        2. Create an activity that matches only one of the words.
+        3. Search with the 'text' tag for both words.
+        4. Assert that only the activities containing both words are returned, best match first.
+        """
+        title_match = create_activity(owner=self.user, title="Beach Cleanup", place="Bangsaen")
+        description_match = create_activity(owner=self.user, title="Weekend",
+                                            description="Cleanup of the beach at Bangsaen")
+        create_activity(owner=self.user, title="Beach Volleyball")
+
+        request = self.factory.get(reverse('action:index'), {'tag': 'text', 'q': 'beach cleanup'})
+        request.user = self.user
+
+        searcher = BaseSearcher(request)
+        query = list(searcher.get_index_query())
+        self.assertListEqual(query, [title_match, description_match])
+
+    def test_text_search_with_other_tags(self):
+        """
+        Test full-text searching combined with another tag.
+
+        1. Create two activities matching the text in different places.
+        2. Search with the 'text' tag and the 'place' tag.
+        3. Assert that only the activity matching both tags is returned.
+        4. Assert that search operators typed by the user are searched as plain words.
+        """
+        create_activity(owner=self.user, title="Yoga Class", place="Bangkok")
+        activity_chiangmai = create_activity(owner=self.user, title="Yoga Retreat", place="Chiang Mai")
+
+        request = self.factory.get(reverse('action:index'), {
+            'tag': ['text', 'place'],
+            'q': ['yoga', 'Chiang']
+        })
+        request.user = self.user
+
+        searcher = BaseSearcher(request)
+        query = list(searcher.get_index_query())
+        self.assertListEqual(query, [activity_chiangmai])
+
+        request = self.factory.get(reverse('action:index'), {'tag': 'text', 'q': 'yoga "NEAR(*'})
+        request.user = self.user
+        self.assertListEqual(list(BaseSearcher(request).get_index_query()), [])
+
+    def test_categories_compiled_once(self):
+        """
+        Test that all category filters are compiled into one subquery, whatever their number.
+
+        1. Create an activity with three categories and one with two of them.
+        2. Search with the 'categories' tag and a category list, in mixed case.
+        3. Assert that only the activity having all the categories is returned.
+        4. Assert that the query has the same joins and subqueries as a search for one category.
+        """
+        categories = [create_category(name) for name in ["Music", "Art", "Sport"]]
+        activity = create_activity(owner=self.user, title="All categories", categories=categories)
+        create_activity(owner=self.user, title="Some categories", categories=categories[:2])
+
+        request = self.factory.get(reverse('action:index'), {
+            'tag': ['title', 'categories'], 'q': ['categories', 'sport'],
+            'category_q': ['MUSIC', 'art'],
+        })
+        request.user = self.user
+        query = BaseSearcher(request).get_index_query()
+        self.assertListEqual(list(query), [activity])
+
+        request = self.factory.get(reverse('action:index'), {'tag': 'categories', 'q': 'Music'})
+        request.user = self.user
+        single_query = str(BaseSearcher(request).get_index_query().query)
+        for keyword in ['JOIN', 'EXISTS', 'SELECT']:
+            self.assertEqual(str(query.query).count(keyword), single_query.count(keyword))
+
+    def test_any_category_search(self):
+        """
+        Test searching for activities having any of the listed categories.
+
+        1. Create activities with different categories, and one without categories.
+        2. Search with a category list and category_match set to 'any'.
+        3. Assert that every activity with one of the categories is returned once.
+        4. Assert that an invalid match mode redirects to the index page.
+        """
+        music, art, sport = [create_category(name) for name in ["Music", "Art", "Sport"]]
+        both = create_activity(owner=self.user, title="Both", categories=[music, art])
+        only_art = create_activity(owner=self.user, title="Art", categories=[art])
+        create_activity(owner=self.user, title="Sport", categories=[sport])
+        create_activity(owner=self.user, title="None")
+
+        request = self.factory.get(reverse('action:index'), {
+            'category_q': ['music', 'ART'], 'category_match': 'any',
+        })
+        request.user = self.user
+        self.assertListEqual(list(BaseSearcher(request).get_index_query()), [only_art, both])
+
+        response = self.client.get(reverse('action:index'), {'category_q': 'Art', 'category_match': 'some'})
+        self.assertRedirects(response, reverse('action:index'))
@@ -0,0 +1,124 @@
+from unittest import skipUnless
+
+from django.db import connection
+from django.test import TestCase
+
+from action.models import Activity
+from action.utils.text_search_utils import PostgresSearchBackend, get_search_backend
+from action.tests.utils import create_activity, create_user
+
+
+class TextSearchUtilsTests(TestCase):
+    """Test case for keeping the full-text index in sync with activities."""
+
+    def setUp(self) -> None:
+        """
+        Set up common attributes for the test methods.
+
+        1. Create a user instance.
+        2. Get the search backend of the test database.
+        """
+        self.user = create_user(username="Organizer")
+        self.backend = get_search_backend()
+
+    def search(self, text: str) -> list[Activity]:
+        """Return the activities matching the text."""
+        return list(self.backend.filter(Activity.objects.all(), text))
+
+    def test_index_follows_activity_changes(self):
+        """
+        Test that edited and deleted activities are reindexed.
+
+        1. Create an activity and assert it is found by its title.
+        2. Change the title and assert it is found by the new title only.
+        3. Delete the activity and assert it is no longer found.
+        """
+        activity = create_activity(owner=self.user, title="Marathon")
+        self.assertListEqual(self.search("marathon"), [activity])
+
+        activity.title = "Triathlon"
+        activity.save()
+        self.assertListEqual(self.search("marathon"), [])
+        self.assertListEqual(self.search("triathlon"), [activity])
+
+        activity.delete()
+        self.assertListEqual(self.search("triathlon"), [])
+
+    def test_index_follows_owner_rename(self):
+        """
+        Test that activities are found by the new username of their owner.
+
+        1. Create an activity owned by the user.
+        2. Rename the user.
+        3. Assert the activity is found by the new username but not the old one.
+        """
+        activity = create_activity(owner=self.user, title="Cooking")
+        self.assertListEqual(self.search("organizer"), [activity])
+
+        self.user.username = "Chef"
+        self.user.save()
+        self.assertListEqual(self.search("organizer"), [])
+        self.assertListEqual(self.search("chef"), [activity])
+
+    def test_update_index_rebuilds_everything(self):
+        """
+        Test that updating the whole index restores missing entries.
+
+        1. Create an activity and remove it from the index.
+        2. Assert it is not found.
+        3. Update the whole index and assert it is found again.
+        """
+        activity = create_activity(owner=self.user, title="Hiking")
+        self.backend.remove_from_index([activity.id])
+        self.assertListEqual(self.search("hiking"), [])
+
+        self.backend.update_index()
+        self.assertListEqual(self.search("hiking"), [activity])
+
+
+@skipUnless(connection.vendor == 'postgresql', 'The tsvector index only exists on PostgreSQL')
+class PostgresSearchBackendTests(TestCase):
+    """Test case for the tsvector full-text index of PostgreSQL."""
+
+    def setUp(self) -> None:
+        """
+        Set up common attributes for the test methods.
+
+        1. Create a user instance.
+        2. Create an activity with the word in its description and one with it in its title.
+        """
+        self.user = create_user(username="Organizer")
+        self.backend = PostgresSearchBackend()
+        self.in_description = create_activity(owner=self.user, title="Morning run",
+                                              description="Yoga after the run")
+        self.in_title = create_activity(owner=self.user, title="Yoga class", description="Stretching")
+
+    def test_search_vector_saved(self):
+        """
+        Test that saved activities get a search vector with the weighted words.
+
+        1. Load the search vector of the activity with the word in its title.
+        2. Assert that the word is weighted A, as title words are.
+        """
+        search_vector = Activity.objects.values_list('search_vector', flat=True).get(pk=self.in_title.pk)
+        self.assertIn("'yoga':1A", search_vector)
+
+    def test_rank_by_field_weight(self):
+        """
+        Test that a match in the title ranks above a match in the description.
+
+        1. Search and rank the activities by the word.
+        2. Assert that the activity with the word in its title comes first.
+        """
+        queryset = self.backend.rank(self.backend.filter(Activity.objects.order_by('-id'), "yoga"), "yoga")
+        self.assertListEqual(list(queryset), [self.in_title, self.in_description])
+
+    def test_web_search_syntax(self):
+        """
+        Test that searches accept the web search syntax of websearch_to_tsquery.
+
+        1. Search for a word while excluding another.
+        2. Assert that only the activity without the excluded word is found.
+        """
+        queryset = self.backend.filter(Activity.objects.all(), "yoga -run")
+        self.assertListEqual(list(queryset), [self.in_title])
@@ -1,4 +1,8 @@
 from django.test import TestCase
+from action.models import Activity
+from action.models.activity import get_popularity
+from action.utils import participate_in_activity, set_activity_status_flag
+from action.utils.query_utils import QueryRecorder
 from action.tests import utils
 from django.utils import timezone
 
@@ -76,6 +80,127 @@ class ActivityModelTest(TestCase):
             activity_status[i].delete()
             self.assertEqual(self.activity.participant_count, count - i)
 
+    def test_favorite_count(self):
+        """
+        Test the favorite count functionality.
+
+        1. Check the initial favorite count is 0.
+        2. Create favorited activity_status instances and check if favorite count increases.
+        3. Check that the participant count is not affected by favorites.
+        """
+        self.assertEqual(self.activity.favorite_count, 0)
+
+        for i in range(3):
+            utils.create_activity_status(self.user_list[i], self.activity,
+                                         is_participated=False, is_favorited=True)
+            self.assertEqual(self.activity.favorite_count, i + 1)
+
+        self.assertEqual(self.activity.participant_count, 0)
+
+    def test_counters_follow_status_changes(self):
+        """
+        Test that the stored counters follow changes of an existing activity status.
+
+        1. Create an activity_status that is neither participated nor favorited.
+        2. Toggle is_participated and is_favorited and check the stored counters.
+        3. Delete all statuses through a queryset and check that the counters are back to 0.
+        """
+        activity_status = utils.create_activity_status(self.user_list[1], self.activity,
+                                                       is_participated=False)
+        self.assertEqual(self.activity.participant_count, 0)
+
+        activity_status.is_participated = True
+        activity_status.is_favorited = True
+        activity_status.save()
+        self.activity.refresh_from_db()
+        self.assertEqual(self.activity.participant_count, 1)
+        self.assertEqual(self.activity.favorite_count, 1)
+
+        activity_status.save()  # Saving without changes does not count twice
+        self.activity.refresh_from_db()
+        self.assertEqual(self.activity.participant_count, 1)
+
+        activity_status.is_participated = False
+        activity_status.save()
+        self.activity.refresh_from_db()
+        self.assertEqual(self.activity.participant_count, 0)
+        self.assertEqual(self.activity.favorite_count, 1)
+
+        self.activity.activity.all().delete()
+        self.activity.refresh_from_db()
+        self.assertEqual(self.activity.favorite_count, 0)
+
+    def test_cascade_deletes_update_counters_once(self):
+        """
+        Test that deleting a user or an activity does not update the counters once per status.
+
+        1. Let a user join and favorite several activities.
+        2. Delete the user and assert that the counters were updated in one statement.
+        3. Assert that the counters and popularity no longer include the user.
+        4. Delete an activity with participants and assert that its counters were not updated.
+        """
+        activities = [self.activity] + [utils.create_activity(owner=self.user_list[0], title=f'activity0{i}')
+                                        for i in range(2, 6)]
+        leaving_user, staying_user = self.user_list[1], self.user_list[2]
+        for activity in activities:
+            participate_in_activity(leaving_user, activity.pk)
+            set_activity_status_flag(leaving_user, activity.pk, 'is_favorited', True)
+            participate_in_activity(staying_user, activity.pk)
+
+        def counter_updates(recorder):
+            return [sql for sql, _ in recorder.queries
+                    if sql.startswith('UPDATE') and 'participant_count' in sql]
+
+        with QueryRecorder() as recorder:
+            leaving_user.delete()
+        self.assertEqual(len(counter_updates(recorder)), 1)
+
+        for activity in activities:
+            activity.refresh_from_db()
+            self.assertEqual(activity.participant_count, 1)
+            self.assertEqual(activity.favorite_count, 0)
+            self.assertEqual(activity.popularity, get_popularity(1, 0, activity.pub_date))
+
+        with QueryRecorder() as recorder:
+            activities[0].delete()
+        self.assertEqual(counter_updates(recorder), [])
+
+    def test_edit_keeps_concurrent_participation(self):
+        """
+        Test that saving an activity loaded before a participation keeps the participation.
+
+        1. Load the activity, then let a user join it and another favorite it.
+        2. Edit and save the loaded activity.
+        3. Assert that the stored counters and popularity include the participation.
+        """
+        stale = Activity.objects.get(pk=self.activity.pk)
+        participate_in_activity(self.user_list[1], self.activity.pk)
+        set_activity_status_flag(self.user_list[2], self.activity.pk, 'is_favorited', True)
+
+        stale.title = 'edited'
+        stale.save()
+
+        self.activity.refresh_from_db()
+        self.assertEqual(self.activity.title, 'edited')
+        self.assertEqual(self.activity.participant_count, 1)
+        self.assertEqual(self.activity.favorite_count, 1)
+        self.assertEqual(self.activity.popularity, get_popularity(1, 1, self.activity.pub_date))
+
+    def test_for_listing(self):
+        """
+        Test the for_listing queryset method.
+
+        1. Load the activity with for_listing.
+        2. Check that the large columns are deferred.
+        3. Check that the owner is loaded without another query.
+        """
+        activity = Activity.objects.for_listing().get(pk=self.activity.pk)
+
+        self.assertIn('full_description', activity.get_deferred_fields())
+        self.assertIn('background_picture', activity.get_deferred_fields())
+        with self.assertNumQueries(0):
+            self.assertEqual(activity.owner.username, self.user_list[0].username)
+
     def test_time_remain_registration(self):
         """
         Test the time remaining for registration.
@@ -177,3 +302,18 @@ class ActivityModelTest(TestCase):
         self.activity.pub_date = timezone.now() - timezone.timedelta(hours=2)
         self.activity.end_date = timezone.now() - timezone.timedelta(hours=1)
         self.assertFalse(self.activity.can_participate())
+
+    def test_participants_memoized(self):
+        """
+        Test that the participants are loaded once per instance and reloaded after a status change.
+
+        1. Read the participants twice and assert that a single query ran.
+        2. Let a user participate through a status of the same instance.
+        3. Assert that the participants are loaded again and include the user.
+        """
+        with self.assertNumQueries(1):
+            self.assertListEqual(list(self.activity.participants), [])
+            self.assertListEqual(list(self.activity.participants), [])
+
+        utils.create_activity_status(self.user_list[1], self.activity)
+        self.assertListEqual(list(self.activity.participants), [self.user_list[1]])
@@ -1,4 +1,6 @@
+from django.db import IntegrityError
 from django.test import TestCase
+from action.models import ActivityStatus
 from action.tests import utils
 
 
@@ -33,3 +35,14 @@ class ActivityStatusTestCase(TestCase):
                          activity_status.activity.owner)
         self.assertTrue(activity_status.is_participated)
         self.assertFalse(activity_status.is_favorited)
+
+    def test_unique_activity_status(self):
+        """
+        Test that a user has a single status per activity.
+
+        1. Try to create a second status for the same user and activity.
+        2. Assert that it raises an IntegrityError.
+        """
+        with self.assertRaises(IntegrityError):
+            ActivityStatus.objects.create(participants=self.activity_status.participants,
+                                          activity=self.activity_status.activity)
@@ -1,4 +1,6 @@
+from django.db import IntegrityError
 from django.test import TestCase
+from action.models import FriendStatus
 from action.tests import utils
 
 
@@ -51,3 +53,18 @@ class FriendStatusTestCase(TestCase):
             self.assertIn(status.receiver, self.receiver_list)
             self.assertEqual(status.request_status, expected_request_status)
             self.assertEqual(status.is_friend, expected_is_friend)
+
+    def test_unique_friend_pair(self):
+        """
+        Test that a pair of users has a single status in either direction.
+
+        1. Assert that the status of the sender and a receiver is found from both sides.
+        2. Assert that creating the reverse status of an existing pair raises an IntegrityError.
+        """
+        receiver = self.receiver_list[2]
+        status = self.friend_status_list[2]
+        self.assertEqual(FriendStatus.between(self.sender.id, receiver.id).get(), status)
+        self.assertEqual(FriendStatus.between(receiver.id, self.sender.id).get(), status)
+
+        with self.assertRaises(IntegrityError):
+            FriendStatus.objects.create(sender=receiver, receiver=self.sender)
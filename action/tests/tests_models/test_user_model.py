@@ -1,4 +1,5 @@
 from django.test import TestCase
+from action.models import Friendship, User
 from action.tests import utils
 
 
@@ -36,3 +37,25 @@ class UserModelTest(TestCase):
                 self.assertTrue(user.check_password(value))
             else:
                 self.assertEqual(getattr(user, key), value)
+
+    def test_friends_follow_friend_status(self):
+        """
+        Test that the friends of a user follow the friend statuses.
+
+        1. Create a pending request and an accepted friendship.
+        2. Assert that only the accepted friend is listed, from both sides, without duplicates.
+        3. Assert that the cached friend IDs of a fresh user object match.
+        4. Delete the accepted status and assert that the friendship is gone.
+        """
+        pending_user = utils.create_user(username='pending')
+        friend = utils.create_user(username='friend')
+        utils.create_friend_status(self.user, pending_user, request_status='Pending')
+        friend_status = utils.create_friend_status(friend, self.user, request_status='Accepted')
+
+        self.assertListEqual(list(self.user.friends), [friend])
+        self.assertListEqual(list(friend.friends), [self.user])
+        self.assertEqual(User.objects.get(id=self.user.id).friend_ids, {friend.id})
+
+        friend_status.delete()
+        self.assertFalse(self.user.friends.exists())
+        self.assertFalse(Friendship.objects.exists())
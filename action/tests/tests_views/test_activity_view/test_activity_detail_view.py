@@ -3,10 +3,11 @@ from django.test import TestCase
 from django.utils import timezone
 from django.contrib.messages import get_messages
 
-from action.tests.utils import create_user, create_activity, USER_DATA_1
+from action.tests.utils import create_user, create_activity, create_activity_status, USER_DATA_1, \
+    QueryBudgetMixin
 
 
-class ActivityDetailViewTests(TestCase):
+class ActivityDetailViewTests(QueryBudgetMixin, TestCase):
     """Test case for the views related to activity details."""
 
     def setUp(self):
@@ -95,3 +96,21 @@ class ActivityDetailViewTests(TestCase):
         messages = list(get_messages(response.wsgi_request))
         self.assertEqual(len(messages), 1)
         self.assertEqual(str(messages[0]), 'Activity does not exist.')
+
+    def test_detail_query_budget(self):
+        """
+        Test that the participants of the detail page are loaded in a single query.
+
+        1. Let ten users participate in the activity.
+        2. Log in and assert that the detail page stays within its query budget, without N+1 queries.
+        3. Assert that every participant is listed.
+        """
+        for i in range(10):
+            create_activity_status(create_user(f'participant{i}'), self.activity)
+        self.client.force_login(self.user)
+
+        with self.assertQueryBudget(12):
+            response = self.client.get(reverse('action:detail', args=(self.activity.id,)))
+
+        for i in range(10):
+            self.assertContains(response, f'participant{i}')
@@ -2,7 +2,9 @@ from django.utils import timezone
 from django.urls import reverse
 from django.test import TestCase
 from django.contrib.messages import get_messages
-from action.tests.utils import create_activity, create_user, USER_DATA_1, USER_DATA_2
+from action.models import CalendarEventLink, Task
+from action.tests.utils import create_activity, create_activity_status, create_user, USER_DATA_1, \
+    USER_DATA_2
 
 
 class ActivityEditViewTests(TestCase):
@@ -101,3 +103,42 @@ class ActivityEditViewTests(TestCase):
         messages = list(get_messages(response.wsgi_request))
         self.assertEqual(len(messages), 1)
         self.assertEqual(str(messages[0]), "Activity edit failed. Please check the form.")
+
+    def test_edit_queues_calendar_updates(self):
+        """
+        Test that editing an activity queues the calendar update of its participants.
+
+        1. Let two users participate, only one of them with a calendar event.
+        2. Change the title and assert that the calendar version was incremented.
+        3. Assert that a single task was queued, for the participant with an event.
+        4. Change only the full description and assert that nothing more was queued.
+        """
+        with_event = create_user(username='with_event')
+        CalendarEventLink.objects.create(user=with_event, activity=self.activity_1, event_id='event1')
+        create_activity_status(with_event, self.activity_1)
+        create_activity_status(create_user(username='without_event'), self.activity_1)
+
+        self.client.force_login(self.user_1)
+        url = reverse('action:edit', args=(self.activity_1.id,))
+        now = timezone.localtime().replace(second=0, microsecond=0)  # The form has minute precision
+        form_data = {
+            "owner": self.user_1.pk,
+            "title": self.activity_1.title,
+            "pub_date": now.strftime('%Y-%m-%dT%H:%M'),
+            "end_date": (now + timezone.timedelta(days=1)).strftime('%Y-%m-%dT%H:%M'),
+            "start_date": (now + timezone.timedelta(days=2)).strftime('%Y-%m-%dT%H:%M'),
+            "last_date": (now + timezone.timedelta(days=3)).strftime('%Y-%m-%dT%H:%M'),
+            "description": "testdesc",
+            "place": "testplace",
+            "full_description": "testfulldesc",
+        }
+        self.client.post(url, data={**form_data, "title": "Change"})
+
+        self.activity_1.refresh_from_db()
+        self.assertEqual(self.activity_1.calendar_version, 2)
+        task, = Task.objects.all()
+        self.assertDictEqual(task.kwargs, {'user_id': with_event.id, 'activity_id': self.activity_1.id})
+
+        Task.objects.all().delete()
+        self.client.post(url, data={**form_data, "title": "Change", "full_description": "new"})
+        self.assertFalse(Task.objects.exists())
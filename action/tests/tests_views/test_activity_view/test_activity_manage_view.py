@@ -1,9 +1,10 @@
 from django.urls import reverse
 from django.test import TestCase
-from action.tests.utils import create_activity, create_user, USER_DATA_1, USER_DATA_2
+from action.tests.utils import create_activity, create_activity_status, create_user, QueryBudgetMixin, \
+    USER_DATA_1, USER_DATA_2
 
 
-class ActivityManageViewTests(TestCase):
+class ActivityManageViewTests(QueryBudgetMixin, TestCase):
     """Test cases for the ActivityManageView."""
 
     def setUp(self):
@@ -34,3 +35,17 @@ class ActivityManageViewTests(TestCase):
         url = reverse('action:manage')
         response = self.client.get(url)
         self.assertEqual(response.status_code, 200)
+
+    def test_manage_query_budget(self):
+        """
+        Test the query budget of the management page of a user with many activities.
+
+        1. Create activities of the user, each joined by another user.
+        2. Log in and assert that the page stays within its query budget.
+        """
+        for i in range(10):
+            create_activity_status(self.user_2, create_activity(self.user_1, title=f'activity{i}'))
+
+        self.client.force_login(self.user_1)
+        with self.assertQueryBudget(8):
+            self.client.get(reverse('action:manage'))
@@ -1,8 +1,8 @@
 from django.urls import reverse
-from action.tests.utils import create_friend_status, FriendStatusViewSetup
+from action.tests.utils import create_friend_status, create_user, FriendStatusViewSetup, QueryBudgetMixin
 
 
-class DetailViewTest(FriendStatusViewSetup):
+class DetailViewTest(QueryBudgetMixin, FriendStatusViewSetup):
     """Test cases for view friend page."""
 
     def test_friend_view_guest(self):
@@ -67,3 +67,20 @@ class DetailViewTest(FriendStatusViewSetup):
         url = reverse('action:request_view') + f'?q={self.user_2.username}'
         response = self.client.get(url)
         self.assertContains(response, self.user_2.username)
+
+    def test_friend_pages_query_budget(self):
+        """
+        Ensure that the friend pages stay within their query budget with many friends and requests.
+
+        1. Give the user friends, sent requests and received requests.
+        2. Log in and assert that each friend page stays within its query budget.
+        """
+        for i in range(10):
+            create_friend_status(self.user_1, create_user(f'friend{i}'), 'Accepted')
+            create_friend_status(self.user_1, create_user(f'sent{i}'), 'Pending')
+            create_friend_status(create_user(f'received{i}'), self.user_1, 'Pending')
+
+        self.client.force_login(self.user_1)
+        for url, budget in [('action:friends', 6), ('action:add_view', 8), ('action:request_view', 6)]:
+            with self.subTest(url=url), self.assertQueryBudget(budget):
+                self.client.get(reverse(url))
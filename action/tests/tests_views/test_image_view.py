@@ -0,0 +1,51 @@
+import shutil
+
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from action.tests.test_utils.test_image_store import MEDIA_ROOT, create_image_file
+from action.utils import store_image
+
+
+@override_settings(MEDIA_ROOT=MEDIA_ROOT)
+class ImageViewTests(TestCase):
+    """Test cases for serving stored images."""
+
+    @classmethod
+    def tearDownClass(cls):
+        """Remove the stored test images."""
+        shutil.rmtree(MEDIA_ROOT, ignore_errors=True)
+        super().tearDownClass()
+
+    def test_serve_stored_image(self):
+        """
+        Test that a stored image is served with long-lived cache headers.
+
+        1. Store an image and request its card size.
+        2. Assert that the response is a JPEG image.
+        3. Assert that the response may be cached for a year.
+        """
+        image_hash = store_image(create_image_file())
+        response = self.client.get(reverse('action:image', args=(image_hash, 'card')))
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['Content-Type'], 'image/jpeg')
+        self.assertIn('max-age=31536000', response['Cache-Control'])
+        self.assertIn('immutable', response['Cache-Control'])
+
+    def test_missing_image(self):
+        """
+        Test that unknown images and sizes respond with 404.
+
+        1. Request an image hash that is not stored.
+        2. Request a stored image in an unknown size.
+        3. Assert that both respond with 404.
+        """
+        image_hash = store_image(create_image_file())
+
+        with self.settings(DEBUG=True):
+            response = self.client.get(reverse('action:image', args=('0' * 64, 'card')))
+            self.assertEqual(response.status_code, 404)
+
+            response = self.client.get(reverse('action:image', args=(image_hash, 'huge')))
+            self.assertEqual(response.status_code, 404)
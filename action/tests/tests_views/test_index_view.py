@@ -1,13 +1,17 @@
 from django.utils import timezone
 from django.urls import reverse
+from django.db import connection
 from django.test import TestCase
-from action.tests.utils import create_activity, create_user
+from django.test.utils import CaptureQueriesContext
+from action.tests.utils import create_activity, create_activity_status, create_user, quick_join, \
+    QueryBudgetMixin
 from action.tests.end_to_end_base import EndToEndTestBase
+from action.views.index_view import ACTIVITIES_PER_PAGE
 
 from selenium.webdriver.support.ui import Select
 
 
-class ActivityIndexViewTests(TestCase):
+class ActivityIndexViewTests(QueryBudgetMixin, TestCase):
     """Test cases for the activity index view."""
 
     def setUp(self) -> None:
@@ -162,6 +166,108 @@ class ActivityIndexViewTests(TestCase):
             reverse('action:index') + "?tag=friend_joined")
         self.assertEqual(response.status_code, 200)
 
+    def test_index_pagination(self):
+        """
+        Test that the index is split into pages.
+
+        1. Create one activity more than fits on a page.
+        2. Assert that the first page is full and the second page has the remaining activity.
+        3. Assert that the second page keeps the search parameters in its links.
+        """
+        for i in range(ACTIVITIES_PER_PAGE + 1):
+            create_activity(self.user, title=f"activity{i}")
+
+        response = self.client.get(reverse('action:index'))
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.context['is_paginated'])
+        self.assertEqual(len(response.context['activity_list']), ACTIVITIES_PER_PAGE)
+
+        response = self.client.get(reverse('action:index'), {'tag': 'title', 'q': 'activity', 'page': 2})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.context['activity_list']), 1)
+        self.assertEqual(response.context['page_query'], 'tag=title&q=activity')
+
+    def test_index_cursor_pagination(self):
+        """
+        Test that the index can be paginated with keyset cursors.
+
+        1. Create one activity more than fits on a page.
+        2. Request the first cursor page and follow its next cursor.
+        3. Assert that both pages together contain every activity once.
+        4. Assert that an invalid cursor responds with 404.
+        """
+        activity_list = [create_activity(self.user, title=f"activity{i}")
+                         for i in range(ACTIVITIES_PER_PAGE + 1)]
+
+        response = self.client.get(reverse('action:index'), {'cursor': ''})
+        first_page = response.context['page_obj']
+        self.assertTrue(first_page.has_next)
+
+        response = self.client.get(reverse('action:index'), {'cursor': first_page.next_cursor})
+        second_page = response.context['page_obj']
+        self.assertFalse(second_page.has_next)
+        self.assertCountEqual(list(first_page) + list(second_page), activity_list)
+
+        with self.settings(DEBUG=True):
+            response = self.client.get(reverse('action:index'), {'cursor': 'invalid'})
+        self.assertEqual(response.status_code, 404)
+
+    def test_index_query_count_does_not_grow(self):
+        """
+        Test that the number of queries of the index does not depend on the number of activities.
+
+        1. Create one activity with participants and count the queries of the index.
+        2. Create more activities with participants and count the queries again.
+        3. Assert that both counts are equal.
+        """
+        quick_join("participant0", create_activity(self.user, title="activity0"))
+        with CaptureQueriesContext(connection) as one_activity:
+            self.client.get(reverse('action:index'))
+
+        for i in range(1, 6):
+            quick_join(f"participant{i}", create_activity(create_user(f"owner{i}"), title=f"activity{i}"))
+        with CaptureQueriesContext(connection) as many_activities:
+            self.client.get(reverse('action:index'))
+
+        self.assertEqual(len(one_activity), len(many_activities))
+
+    def test_index_query_budget(self):
+        """
+        Test the query budget of a full index page for a logged in user.
+
+        1. Create a page of activities, each joined by the user and another participant.
+        2. Log in and assert that the index stays within its query budget.
+        """
+        for i in range(ACTIVITIES_PER_PAGE):
+            activity = create_activity(create_user(f"owner{i}"), title=f"activity{i}")
+            create_activity_status(self.user, activity)
+            quick_join(f"participant{i}", activity)
+
+        self.client.force_login(self.user)
+        with self.assertQueryBudget(9):
+            self.client.get(reverse('action:index'))
+
+    def test_index_my_status(self):
+        """
+        Test that each card of the index carries the status of the logged in user.
+
+        1. Create an activity joined by the user and one the user never opened.
+        2. Log in and get the index.
+        3. Assert that only the joined activity has a status, read without more queries.
+        """
+        joined = create_activity(create_user("owner1"), title="joined")
+        create_activity_status(self.user, joined)
+        create_activity(create_user("owner2"), title="other")
+
+        self.client.force_login(self.user)
+        response = self.client.get(reverse('action:index'))
+        with self.assertNumQueries(0):
+            statuses = {activity.title: activity.my_status for activity in response.context['activity_list']}
+
+        self.assertTrue(statuses["joined"].is_participated)
+        self.assertIsNone(statuses["other"])
+        self.assertContains(response, 'class="my-status">Joined<')
+
 
 class IndexViewTestsE2E(EndToEndTestBase):
     """End-to-end tests for the activity index view."""
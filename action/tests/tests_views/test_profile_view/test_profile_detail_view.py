@@ -1,10 +1,11 @@
 from django.urls import reverse
 from django.test import TestCase
-from action.tests.utils import create_user, USER_DATA_1, USER_DATA_2
+from action.tests.utils import create_activity, create_activity_status, create_friend_status, create_user, \
+    QueryBudgetMixin, USER_DATA_1, USER_DATA_2
 from django.contrib.messages import get_messages
 
 
-class ProfileDetailViewTests(TestCase):
+class ProfileDetailViewTests(QueryBudgetMixin, TestCase):
     """Test user profile detail view."""
 
     def setUp(self) -> None:
@@ -80,3 +81,20 @@ class ProfileDetailViewTests(TestCase):
         messages = list(get_messages(response.wsgi_request))
         self.assertEqual(len(messages), 1)
         self.assertEqual(str(messages[0]), "Invalid user id.")
+
+    def test_profile_query_budget(self):
+        """
+        Test the query budget of a profile with friends and activities.
+
+        1. Give the user friends, and participated and favorited activities.
+        2. Log in and assert that the profile stays within its query budget.
+        """
+        for i in range(10):
+            friend = create_user(f'friend{i}')
+            create_friend_status(self.user_1, friend, 'Accepted')
+            create_activity_status(self.user_1, create_activity(friend, title=f'activity{i}'),
+                                   is_favorited=True)
+
+        self.client.force_login(self.user_1)
+        with self.assertQueryBudget(12):
+            self.client.get(reverse('action:profile'))
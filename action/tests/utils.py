@@ -1,4 +1,6 @@
 from abc import ABC
+from contextlib import contextmanager
+
 from django.contrib.sites.models import Site
 from django.utils import timezone
 from django.test import RequestFactory, TestCase
@@ -6,6 +8,7 @@ from django.urls import reverse
 from allauth.socialaccount.models import SocialApp
 
 from action.models import User, Activity, ActivityStatus, FriendStatus, Category
+from action.utils.query_utils import N_PLUS_ONE_THRESHOLD, QueryRecorder
 from mysite.settings import SITE_ID, SITE_NAME, SITE_DOMAIN
 
 USER_DATA_1 = {
@@ -46,6 +49,31 @@ class FriendStatusViewSetup(ABC, TestCase):
         self.user_2 = create_user(**USER_DATA_2)
 
 
+class QueryBudgetMixin:
+    """Mixin for test cases asserting how many queries a view may run."""
+
+    @contextmanager
+    def assertQueryBudget(self, max_queries: int, max_repeats: int = N_PLUS_ONE_THRESHOLD - 1):
+        """
+        Assert that the code in the block runs at most max_queries queries, without N+1 queries.
+
+        Unlike assertNumQueries, the budget is an upper bound, so optimizations do not break it.
+
+        Args:
+            max_queries (int): The maximum number of queries.
+            max_repeats (int): The maximum number of calls of the same query shape.
+        """
+        with QueryRecorder() as recorder:
+            yield recorder
+
+        queries = '\n'.join(f'{i}. {sql}' for i, (sql, _) in enumerate(recorder.queries, start=1))
+        self.assertLessEqual(recorder.count, max_queries,
+                             f'{recorder.count} queries run, the budget is {max_queries}:\n{queries}')
+        repeated = recorder.repeated_queries(threshold=max_repeats + 1)
+        self.assertFalse(repeated, 'N+1 queries run:\n' +
+                         '\n'.join(f'{count} times: {shape}' for shape, count in repeated.items()))
+
+
 def create_social_app():
     """
     Create a social app instance.
@@ -78,7 +106,6 @@ def create_user(username='tester', password='password', **kwargs):
     user_fields = {
         "username": username,
         "password": password,
-        "event_encoder": {},
         "email": kwargs.get("email", None),
         "first_name": kwargs.get("first_name", ""),
         "last_name": kwargs.get("last_name", ""),
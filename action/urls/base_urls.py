@@ -15,5 +15,6 @@ urlpatterns = [
     path('activity/', include(activity_patterns)),
     path('profile/', include(profile_patterns)),
     path('friends/', include(friends_patterns)),
-    path('calendar/', views.CalendarView.as_view(), name='calendar')
+    path('calendar/', views.CalendarView.as_view(), name='calendar'),
+    path('image/<slug:image_hash>/<slug:size>.jpg', views.ImageView.as_view(), name='image'),
 ] + static(settings.MEDIA_URL, document_root=settings.MEDIA_ROOT)
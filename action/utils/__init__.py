@@ -1,5 +1,11 @@
 from .activity_status_utils import *
 from .friend_status_utils import *
 from .search_utils import *
-from .encoder import *
 from .calendar_utils import *
+from .pagination_utils import *
+from .image_store import *
+from .text_search_utils import *
+from .upsert_utils import *
+from .query_utils import *
+from .cache_utils import *
+from .conditional_utils import *
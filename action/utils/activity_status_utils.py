@@ -1,7 +1,25 @@
+from enum import Enum
+
 from django.contrib.auth.decorators import login_required
+from django.db import connection, transaction
+from django.db.models import F
+from django.http import Http404
 from django.shortcuts import get_object_or_404
+from django.utils import timezone
+
+from action.models import Activity, ActivityStatus, User
+from .cache_utils import invalidate_page_cache
+from .upsert_utils import upsert
+
+STATUS_FLAGS = ['is_participated', 'is_favorited']
+
+
+class ParticipationResult(Enum):
+    """The outcome of a request to participate in an activity."""
 
-from action.models import Activity, ActivityStatus
+    JOINED = 'joined'
+    ALREADY_JOINED = 'already joined'
+    FULL = 'full'
 
 
 @login_required
@@ -18,18 +36,118 @@ def fetch_activity_status(request, activity_id: int) -> ActivityStatus:
 
     Note:
         This function is intended to be used as a view or in conjunction with views that
-        require the user to be authenticated. It fetches the activity status for the current
-        user and the specified activity, creating a new status if it does not exist.
+        require the user to be authenticated. If the user has no status for the activity yet,
+        an unsaved one with every flag off is returned, so viewing a page never writes.
     """
-    activity = get_object_or_404(Activity, pk=activity_id)
     user = request.user
+    activity_status = ActivityStatus.objects.filter(participants=user, activity_id=activity_id).first()
+    if activity_status is None:
+        activity_status = ActivityStatus(participants=user, activity=get_object_or_404(Activity, pk=activity_id))
 
-    try:
-        activity_status = ActivityStatus.objects. \
-            get(participants=user, activity=activity)
+    return activity_status
 
-    except ActivityStatus.DoesNotExist:
-        activity_status = ActivityStatus.objects. \
-            create(participants=user, activity=activity)
 
-    return activity_status
+def set_activity_status_flag(user: User, activity_id: int, flag: str, value: bool) -> bool:
+    """
+    Set a flag of the user's status for an activity, creating the status if needed.
+
+    Turning a flag on is a single upsert and turning it off a single update, both of which
+    only touch the row if the flag actually changes. The activity counters are then adjusted
+    in the same transaction, so concurrent clicks are counted once.
+
+    Args:
+        user (User): The user whose status changes.
+        activity_id (int): The ID of the activity.
+        flag (str): 'is_participated' or 'is_favorited'.
+        value (bool): The new value of the flag.
+
+    Returns:
+        bool: True if the flag changed, False if it already had this value.
+
+    Raises:
+        Http404: If the activity does not exist.
+        ValueError: If the flag is unknown, or to participate, which must go through
+            participate_in_activity to respect the participant limit.
+    """
+    if flag not in STATUS_FLAGS:
+        raise ValueError(f"Unknown status flag: {flag}")
+    if flag == 'is_participated' and value:
+        raise ValueError("Participate with participate_in_activity, which checks the participant limit")
+
+    table = connection.ops.quote_name(ActivityStatus._meta.db_table)
+    with transaction.atomic():
+        if value:
+            now = timezone.now()
+            values = {'participants': user.id, 'activity': activity_id,
+                      'participation_date': now, 'updated_at': now,
+                      'is_participated': False, 'is_favorited': False, flag: True}
+            changed = upsert(ActivityStatus, values,
+                             conflict_target='participants_id, activity_id',
+                             update_fields=[flag, 'updated_at'],
+                             condition=f'NOT {table}.{flag}',
+                             parent=(Activity, activity_id))
+        else:
+            changed = bool(ActivityStatus.objects.filter(
+                participants=user, activity_id=activity_id, **{flag: True})
+                .update(**{flag: False}, updated_at=timezone.now()))
+
+        if changed:
+            invalidate_page_cache()  # The counters are displayed
+            delta = 1 if value else -1
+            if flag == 'is_participated':
+                ActivityStatus.change_activity_counters(activity_id, participant_delta=delta)
+            else:
+                ActivityStatus.change_activity_counters(activity_id, favorite_delta=delta)
+
+    if not changed and not Activity.objects.filter(pk=activity_id).exists():
+        raise Http404("Activity does not exist.")
+
+    return changed
+
+
+def participate_in_activity(user: User, activity_id: int) -> ParticipationResult:
+    """
+    Let the user participate in an activity without ever exceeding its participant limit.
+
+    The status is upserted first, then a seat is taken with an update that only succeeds while
+    the activity has remaining space. Concurrent updates of the same activity row wait for each
+    other and re-check the limit, so the last seat is given out once. If no seat is left the
+    status change is rolled back.
+
+    Args:
+        user (User): The user who participates.
+        activity_id (int): The ID of the activity.
+
+    Returns:
+        ParticipationResult: JOINED, ALREADY_JOINED, or FULL if the limit has been reached.
+
+    Raises:
+        Http404: If the activity does not exist.
+    """
+    table = connection.ops.quote_name(ActivityStatus._meta.db_table)
+    now = timezone.now()
+    values = {'participants': user.id, 'activity': activity_id,
+              'participation_date': now, 'updated_at': now,
+              'is_participated': True, 'is_favorited': False}
+
+    with transaction.atomic():
+        joined = upsert(ActivityStatus, values,
+                        conflict_target='participants_id, activity_id',
+                        update_fields=['is_participated', 'participation_date', 'updated_at'],
+                        condition=f'NOT {table}.is_participated',
+                        parent=(Activity, activity_id))
+
+        if joined:
+            seat_taken = Activity.objects.filter(pk=activity_id).with_remaining_space() \
+                .update(participant_count=F('participant_count') + 1, updated_at=now)
+            if not seat_taken:
+                transaction.set_rollback(True)
+                return ParticipationResult.FULL
+            Activity.objects.filter(pk=activity_id).refresh_popularity()
+            invalidate_page_cache()  # The participant count is displayed
+            return ParticipationResult.JOINED
+
+    if not Activity.objects.filter(pk=activity_id).exists():
+        raise Http404("Activity does not exist.")
+
+    return ParticipationResult.ALREADY_JOINED
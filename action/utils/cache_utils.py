@@ -0,0 +1,93 @@
+import hashlib
+import uuid
+from functools import wraps
+from urllib.parse import parse_qsl, urlencode
+
+from django.conf import settings
+from django.contrib import messages
+from django.core.cache import cache
+from django.db import transaction
+from django.http import HttpRequest, HttpResponse
+
+# Cache key of the current version of the cached pages, every page key contains it
+PAGE_CACHE_VERSION_KEY = 'page_cache_version'
+
+
+def get_page_cache_version() -> str:
+    """
+    Get the current version of the cached pages, starting a new one if there is none.
+
+    Returns:
+        str: The version token.
+    """
+    version = cache.get(PAGE_CACHE_VERSION_KEY)
+    if version is None:
+        version = uuid.uuid4().hex
+        cache.add(PAGE_CACHE_VERSION_KEY, version, timeout=None)
+        version = cache.get(PAGE_CACHE_VERSION_KEY, version)  # Another process may have won
+    return version
+
+
+def invalidate_page_cache() -> None:
+    """
+    Make every cached page and fragment stale, once the current transaction is committed.
+
+    Instead of deleting the pages one by one, the version in their keys is replaced, so
+    the old entries are never read again and expire on their own.
+    """
+    transaction.on_commit(lambda: cache.set(PAGE_CACHE_VERSION_KEY, uuid.uuid4().hex, timeout=None))
+
+
+def get_request_cache_key(request: HttpRequest) -> str:
+    """
+    Get a key identifying what a request displays, the same for equivalent query strings.
+
+    The parameters are sorted by name only, since the paired tag and q parameters are matched
+    by their order. The search tag kept in the session is included, as the index preselects it.
+
+    Args:
+        request (HttpRequest): The HTTP request object.
+
+    Returns:
+        str: A hash of the path, the parameters and the session tag.
+    """
+    params = parse_qsl(request.META.get('QUERY_STRING', ''), keep_blank_values=True)
+    params = sorted(((key, value.strip()) for key, value in params), key=lambda param: param[0])
+    session_tag = request.session.get('tag', '') if hasattr(request, 'session') else ''
+    key = f'{request.path}?{urlencode(params)}#{session_tag}'
+    return hashlib.sha256(key.encode()).hexdigest()
+
+
+def cache_anonymous_page(view):
+    """
+    Decorate a view so that its pages are cached for anonymous visitors.
+
+    Only successful GET responses are cached, and never while a message is waiting to be
+    displayed. Logged in users always get a fresh page, whose shared parts may be cached
+    as template fragments, like the activity details.
+
+    Args:
+        view (Callable): The view function.
+
+    Returns:
+        Callable: The caching view function.
+    """
+    @wraps(view)
+    def cached_view(request: HttpRequest, *args, **kwargs) -> HttpResponse:
+        if request.method != 'GET' or request.user.is_authenticated or len(messages.get_messages(request)):
+            return view(request, *args, **kwargs)
+
+        key = f'page:{get_page_cache_version()}:{get_request_cache_key(request)}'
+        cached = cache.get(key)
+        if cached is not None:
+            content, content_type = cached
+            return HttpResponse(content, content_type=content_type)
+
+        response = view(request, *args, **kwargs)
+        if hasattr(response, 'render') and not response.is_rendered:
+            response.render()
+        if response.status_code == 200 and not response.streaming:
+            cache.set(key, (response.content, response['Content-Type']), settings.PAGE_CACHE_TIMEOUT)
+        return response
+
+    return cached_view
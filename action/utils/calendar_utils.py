@@ -1,80 +1,141 @@
-from allauth.socialaccount.models import SocialApp, SocialToken, SocialAccount
-from django.http import HttpRequest
+import hashlib
+import json
+import threading
+from collections import OrderedDict
+
+from allauth.socialaccount.models import SocialToken, SocialAccount
 from google.oauth2.credentials import Credentials
-from googleapiclient.discovery import build, Resource
+from googleapiclient.discovery import build_from_document, Resource
+from googleapiclient.discovery_cache import get_static_doc
 from decouple import config
 
-from django.contrib.auth.decorators import login_required
-from django.shortcuts import get_object_or_404
-from django.utils.crypto import get_random_string
-
 from action.models.activity import Activity
 
 API_NAME = 'calendar'
 API_VERSION = 'v3'
-CHARSET = "0123456789abcdefghijklmnopqrstuv"
+SCOPES = ['https://www.googleapis.com/auth/calendar']
+
+# Number of users whose credentials are kept in memory by each process
+CREDENTIALS_CACHE_SIZE = 256
+
+_discovery_document = None
+_credentials_cache = OrderedDict()  # user ID -> Credentials, least recently used first
+_credentials_lock = threading.Lock()
+
 
+def get_discovery_document() -> dict:
+    """
+    Get the Calendar API discovery document packaged with googleapiclient.
+
+    It is parsed once per process, so building a service never reads it or fetches it again.
 
-@login_required
-def build_service(request) -> Resource:
+    Returns:
+        dict: The parsed discovery document.
     """
-    Build and return a Google Calendar API service instance for the authenticated user.
+    global _discovery_document
+    if _discovery_document is None:
+        _discovery_document = json.loads(get_static_doc(API_NAME, API_VERSION))
+    return _discovery_document
+
+
+def get_credentials(user) -> Credentials:
+    """
+    Get the Google credentials of a user, from the cache when possible.
+
+    The cached credentials keep their refreshed access token until it expires, so
+    consecutive calendar calls neither query the token nor refresh it again.
 
     Args:
-        request (HttpRequest): The HTTP request object.
+        user (User): A user logged in with Google.
 
     Returns:
-         Google Calendar API service instance.
+        Credentials: The OAuth credentials of the user.
     """
-    app = SocialApp.objects.get(provider="google")
-    token = SocialToken.objects.get(app=app, account__user=request.user)
-    refresh_token = token.token_secret
-    scope = ['https://www.googleapis.com/auth/calendar']
+    with _credentials_lock:
+        credentials = _credentials_cache.get(user.id)
+        if credentials is not None:
+            _credentials_cache.move_to_end(user.id)
+            return credentials
+
+    token = SocialToken.objects.get(app__provider='google', account__user=user)
     user_info = {
         "client_id": config('GOOGLE_OAUTH_CLIENT_ID', str),
         "client_secret": config('GOOGLE_OAUTH_SECRET_KEY', str),
-        "refresh_token": str(refresh_token),
+        "refresh_token": str(token.token_secret),
     }
-    creds = Credentials.from_authorized_user_info(info=user_info,
-                                                  scopes=scope)
-    return build(API_NAME, API_VERSION, credentials=creds)
+    credentials = Credentials.from_authorized_user_info(info=user_info, scopes=SCOPES)
+
+    with _credentials_lock:
+        _credentials_cache[user.id] = credentials
+        if len(_credentials_cache) > CREDENTIALS_CACHE_SIZE:
+            _credentials_cache.popitem(last=False)
+    return credentials
+
+
+def forget_credentials(user_id: int) -> None:
+    """
+    Remove the cached credentials of a user, they are loaded again on the next call.
+
+    Args:
+        user_id (int): The ID of the user.
+    """
+    with _credentials_lock:
+        _credentials_cache.pop(user_id, None)
 
 
-def get_event_json_data(activity_id, generate_event_id=False) -> dict[str, dict]:
+def build_service(user) -> Resource:
     """
-    Get JSON data for creating a Google Calendar event based on the activity details.
+    Build and return a Google Calendar API service instance for a user.
 
     Args:
-        activity_id (int): ID of the activity.
+        user (User): A user logged in with Google.
 
     Returns:
-        dict: JSON data for creating a Google Calendar event.
+         Google Calendar API service instance.
     """
-    activity = get_object_or_404(Activity, pk=activity_id)
-
-    data = {
-        activity_id: {
-            'summary': activity.title,
-            'location': activity.place,
-            'description': activity.description,
-            'start': {
-                'dateTime': activity.start_date.strftime('%Y-%m-%dT%H:%M:%S'),
-                'timeZone': config('TIME_ZONE', default='UTC'),
-            },
-            'end': {
-                'dateTime': activity.last_date.strftime('%Y-%m-%dT%H:%M:%S'),
-                'timeZone': config('TIME_ZONE', default='UTC'),
-            },
-        }
-    }
+    return build_from_document(get_discovery_document(), credentials=get_credentials(user))
+
 
-    if generate_event_id:
-        data[activity_id]['id'] = get_random_string(length=100, allowed_chars=CHARSET)
-    return data
+def get_event_id(user_id: int, activity_id: int) -> str:
+    """
+    Get the Google Calendar event ID of a user's participation in an activity.
+
+    The ID is derived from the user and the activity, so a retried insert of the same
+    event is refused by Google instead of creating a duplicate.
 
+    Args:
+        user_id (int): The ID of the user.
+        activity_id (int): The ID of the activity.
 
-def get_event_id(request: HttpRequest, activity_id: str) -> str:  # return random string
-    return request.user.event_encoder.get(activity_id, None)
+    Returns:
+        str: 64 hexadecimal digits, which are part of the base32hex alphabet accepted by the Calendar API.
+    """
+    return hashlib.sha256(f'ku-active:{user_id}:{activity_id}'.encode()).hexdigest()
+
+
+def get_event_body(activity: Activity) -> dict:
+    """
+    Get the Google Calendar event body of an activity.
+
+    Args:
+        activity (Activity): The activity.
+
+    Returns:
+        dict: The event fields, without the event ID.
+    """
+    return {
+        'summary': activity.title,
+        'location': activity.place,
+        'description': activity.description,
+        'start': {
+            'dateTime': activity.start_date.strftime('%Y-%m-%dT%H:%M:%S'),
+            'timeZone': config('TIME_ZONE', default='UTC'),
+        },
+        'end': {
+            'dateTime': activity.last_date.strftime('%Y-%m-%dT%H:%M:%S'),
+            'timeZone': config('TIME_ZONE', default='UTC'),
+        },
+    }
 
 
 def user_is_login_with_google(user) -> bool:
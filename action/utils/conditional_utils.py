@@ -0,0 +1,165 @@
+import hashlib
+from datetime import datetime
+from functools import wraps
+
+from django.contrib import messages
+from django.db.models import Count, Max, OuterRef, Q, Subquery
+from django.http import HttpRequest, HttpResponse
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.http import http_date, quote_etag
+
+from action.models import Activity, ActivityStatus, Friendship, User
+
+# What a page displays is summed up as (validator parts, last modified time or None)
+PageState = tuple[tuple, datetime | None]
+
+
+def get_viewer_state(request: HttpRequest) -> tuple:
+    """
+    Get what the navigation bar displays about the current user, it is part of every page.
+
+    Args:
+        request (HttpRequest): The HTTP request object.
+
+    Returns:
+        tuple: The user's ID, name, avatar and admin flag, or a marker for guests.
+    """
+    user = request.user
+    if not user.is_authenticated:
+        return ('guest',)
+    return (user.id, user.username, user.profile_picture, user.is_superuser)
+
+
+def make_etag(*parts) -> str:
+    """
+    Hash the values a page is rendered from into an entity tag.
+
+    Args:
+        *parts: Values with a stable repr.
+
+    Returns:
+        str: The unquoted entity tag.
+    """
+    return hashlib.sha256(repr(parts).encode()).hexdigest()[:32]
+
+
+def get_activity_detail_state(request: HttpRequest, pk: int) -> PageState | None:
+    """
+    Get the state of an activity detail page in one query, without loading the activity.
+
+    Activity.updated_at covers the activity, its counters, participants and categories, and the
+    status updated_at covers the buttons of the current user.
+
+    Args:
+        request (HttpRequest): The HTTP request object.
+        pk (int): The ID of the activity.
+
+    Returns:
+        PageState | None: The state of the page, or None if the activity does not exist.
+    """
+    activities = Activity.objects.filter(pk=pk)
+    if request.user.is_authenticated:
+        status_updated_at = ActivityStatus.objects \
+            .filter(participants=request.user, activity=OuterRef('pk')).values('updated_at')
+        activities = activities.annotate(status_updated_at=Subquery(status_updated_at[:1]))
+        row = activities.values_list('updated_at', 'status_updated_at').first()
+    else:
+        row = activities.values_list('updated_at').first()
+
+    if row is None:
+        return None
+    return ('detail', pk, *row), max(filter(None, row))
+
+
+def get_profile_state(request: HttpRequest, user_id: int | None = None) -> PageState | None:
+    """
+    Get the state of a profile page: the profile, its joined and favorited activities and its friend count.
+
+    Args:
+        request (HttpRequest): The HTTP request object.
+        user_id (int | None): The ID of the profile, None for the current user.
+
+    Returns:
+        PageState | None: The state of the page, or None if there is no such profile.
+    """
+    user_id = user_id or request.user.id
+    statuses = ActivityStatus.objects.filter(Q(is_participated=True) | Q(is_favorited=True),
+                                             participants=OuterRef('pk')) \
+        .order_by().values('participants')
+    friendships = Friendship.objects.filter(user=OuterRef('pk')).order_by().values('user')
+
+    # One row with the displayed fields, and the aggregates of the lists as subqueries
+    profile = User.objects.filter(pk=user_id).annotate(
+        status_count=Subquery(statuses.annotate(value=Count('id')).values('value')),
+        status_updated_at=Subquery(statuses.annotate(value=Max('updated_at')).values('value')),
+        activity_updated_at=Subquery(statuses.annotate(value=Max('activity__updated_at')).values('value')),
+        friend_count=Subquery(friendships.annotate(value=Count('id')).values('value')),
+    ).values_list('username', 'first_name', 'last_name', 'email', 'bio', 'profile_picture',
+                  'background_picture', 'status_count', 'status_updated_at', 'activity_updated_at',
+                  'friend_count').first()
+    if profile is None:
+        return None
+    return ('profile', user_id, *profile), None
+
+
+def get_activity_manage_state(request: HttpRequest) -> PageState | None:
+    """
+    Get the state of the manage page, the activities owned by the current user.
+
+    Args:
+        request (HttpRequest): The HTTP request object.
+
+    Returns:
+        PageState | None: The state of the page, or None for guests, who are redirected.
+    """
+    if not request.user.is_authenticated:
+        return None
+    owned = Activity.objects.filter(owner=request.user) \
+        .aggregate(count=Count('id'), updated_at=Max('updated_at'))
+    return ('manage', *owned.values()), None
+
+
+def conditional_page(state_func):
+    """
+    Decorate a view so that repeated GET requests are answered with 304 Not Modified.
+
+    The state function sums up what the page displays in one small query. Its hash is the
+    ETag of the page, so while it is unchanged the browser keeps its copy and the view is not
+    called at all. Pages with a pending message are always rendered, since they display it once.
+
+    Args:
+        state_func (Callable): Called with the view arguments, returns a PageState or None to
+            render the page without validators.
+
+    Returns:
+        Callable: The decorator.
+    """
+    def decorator(view):
+        @wraps(view)
+        def conditional_view(request: HttpRequest, *args, **kwargs) -> HttpResponse:
+            if request.method not in ('GET', 'HEAD') or len(messages.get_messages(request)):
+                return view(request, *args, **kwargs)
+
+            state = state_func(request, *args, **kwargs)
+            if state is None:
+                return view(request, *args, **kwargs)
+
+            parts, last_modified = state
+            etag = quote_etag(make_etag(*get_viewer_state(request), *parts))
+            timestamp = int(last_modified.timestamp()) if last_modified else None
+
+            response = get_conditional_response(request, etag=etag, last_modified=timestamp)
+            if response is None:
+                response = view(request, *args, **kwargs)
+
+            if response.status_code in (200, 304):
+                response.headers.setdefault('ETag', etag)
+                if timestamp is not None:
+                    response.headers.setdefault('Last-Modified', http_date(timestamp))
+                # Browsers check with the server before reusing the page, shared caches never store it
+                patch_cache_control(response, private=True, no_cache=True)
+            return response
+
+        return conditional_view
+
+    return decorator
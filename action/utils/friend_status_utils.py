@@ -1,32 +1,150 @@
 from django.contrib.auth.decorators import login_required
-from django.db.models import Q
+from django.db import connection, transaction
 
-from action.models import FriendStatus, User
+from action.models import FriendStatus, Friendship, User
+from .upsert_utils import upsert
 
 
 @login_required
-def fetch_friend_status(request, friend_id: int) -> FriendStatus:
+def fetch_friend_status(request, friend_id: int) -> FriendStatus | None:
     """
     Fetch the friendship status between the authenticated user and the specified friend.
 
-    If a friendship status does not exist, it will be created.
-
     Args:
         request (HttpRequest): The HTTP request object.
         friend_id (int): The user ID of the friend.
 
     Returns:
-        FriendStatus: The friendship status between the authenticated user and the friend.
+        FriendStatus | None: The friendship status between the authenticated user and the friend,
+            None if neither of them ever sent a request. Requests are created by send_friend_request.
+    """
+    return FriendStatus.between(request.user.id, friend_id).first()
+
+
+def get_friend_pair_target() -> str:
+    """Return the SQL of the unique pair index of FriendStatus, as an ON CONFLICT target."""
+    least, greatest = ('MIN', 'MAX') if connection.vendor == 'sqlite' else ('LEAST', 'GREATEST')
+    return f'{least}(sender_id, receiver_id), {greatest}(sender_id, receiver_id)'
+
+
+def send_friend_request(user: User, friend_id: int) -> bool:
+    """
+    Send a friend request in a single upsert.
+
+    Args:
+        user (User): The user sending the request.
+        friend_id (int): The user ID of the receiver.
+
+    Returns:
+        bool: True if the request was sent, False if the users are already friends
+              or a request between them is pending.
+    """
+    table = connection.ops.quote_name(FriendStatus._meta.db_table)
+    values = {'sender': user.id, 'receiver': friend_id,
+              'request_status': 'Pending', 'is_friend': False}
+    return upsert(FriendStatus, values,
+                  conflict_target=get_friend_pair_target(),
+                  update_fields=['sender', 'receiver', 'request_status'],
+                  condition=f'NOT {table}.is_friend AND {table}.request_status IS NULL',
+                  parent=(User, friend_id))
+
+
+def accept_friend_request(user: User, friend_id: int) -> bool:
+    """
+    Make two users friends in a single upsert.
+
+    Args:
+        user (User): The user accepting the request.
+        friend_id (int): The user ID of the sender.
+
+    Returns:
+        bool: True if the users became friends, False if they already were.
+    """
+    table = connection.ops.quote_name(FriendStatus._meta.db_table)
+    values = {'sender': friend_id, 'receiver': user.id,
+              'request_status': 'Accepted', 'is_friend': True}
+    with transaction.atomic():
+        accepted = upsert(FriendStatus, values,
+                          conflict_target=get_friend_pair_target(),
+                          update_fields=['request_status', 'is_friend'],
+                          condition=f'NOT {table}.is_friend',
+                          parent=(User, friend_id))
+        if accepted:
+            Friendship.sync(user.id, friend_id, True)
+            clear_friend_ids(user)
+    return accepted
+
+
+def decline_friend_request(user: User, friend_id: int) -> bool:
+    """
+    Delete the status between two users who are not friends.
+
+    Args:
+        user (User): The user declining the request.
+        friend_id (int): The user ID of the sender.
+
+    Returns:
+        bool: True if a status was deleted.
     """
-    user1 = request.user
-    user2 = User.objects.get(id=friend_id)
+    deleted, _ = FriendStatus.between(user.id, friend_id).filter(is_friend=False).delete()
+    return bool(deleted)
 
-    try:
-        friend_status = FriendStatus.objects.get(
-            Q(sender=user1, receiver=user2) | Q(sender=user2, receiver=user1))
 
-    except FriendStatus.DoesNotExist:
-        friend_status = FriendStatus.objects. \
-            create(sender=user1, receiver=user2)
+def cancel_friend_request(user: User, friend_id: int) -> bool:
+    """
+    Delete a pending friend request sent by the user.
 
-    return friend_status
+    Args:
+        user (User): The user who sent the request.
+        friend_id (int): The user ID of the receiver.
+
+    Returns:
+        bool: True if a pending request was deleted.
+    """
+    deleted, _ = FriendStatus.between(user.id, friend_id) \
+        .filter(sender=user, request_status='Pending').delete()
+    return bool(deleted)
+
+
+def remove_friend(user: User, friend_id: int) -> bool:
+    """
+    End the friendship between two users.
+
+    Args:
+        user (User): The user removing the friend.
+        friend_id (int): The user ID of the friend.
+
+    Returns:
+        bool: True if the users were friends.
+    """
+    with transaction.atomic():
+        removed = bool(FriendStatus.between(user.id, friend_id).filter(is_friend=True)
+                       .update(request_status=None, is_friend=False))
+        if removed:
+            Friendship.sync(user.id, friend_id, False)
+            clear_friend_ids(user)
+    return removed
+
+
+def are_friends(user: User, friend_id: int) -> bool:
+    """
+    Check whether two users are friends.
+
+    Args:
+        user (User): One user.
+        friend_id (int): The user ID of the other user.
+
+    Returns:
+        bool: True if the users are friends.
+    """
+    return friend_id in user.friend_ids
+
+
+def clear_friend_ids(user: User) -> None:
+    """
+    Drop the cached friend IDs of a user after the friendships changed.
+
+    Args:
+        user (User): The user whose friends changed.
+    """
+    user.__dict__.pop('friend_ids', None)
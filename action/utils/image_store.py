@@ -0,0 +1,131 @@
+import hashlib
+import re
+from io import BytesIO
+
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from PIL import Image, UnidentifiedImageError
+
+IMAGE_DIRECTORY = 'images'
+
+# Every stored image is pre-rendered in these sizes
+IMAGE_SIZES = {
+    'detail': (1024, 1024),
+    'card': (512, 512),
+    'avatar': (128, 128),
+}
+
+# Stored images never change under the same name, so browsers may keep them for a year
+IMAGE_CACHE_SECONDS = 60 * 60 * 24 * 365
+
+IMAGE_HASH_PATTERN = re.compile(r'^[0-9a-f]{64}$')
+
+
+def is_image_hash(value) -> bool:
+    """
+    Check if a value is the hash of a stored image.
+
+    Args:
+        value: The value to check.
+
+    Returns:
+        bool: True if the value is an image hash, False otherwise.
+    """
+    return isinstance(value, str) and bool(IMAGE_HASH_PATTERN.match(value))
+
+
+def get_image_name(image_hash: str, size: str) -> str:
+    """
+    Get the storage name of an image in the given size.
+
+    Args:
+        image_hash (str): The SHA-256 hash of the image.
+        size (str): One of IMAGE_SIZES.
+
+    Returns:
+        str: The path of the file inside the storage, e.g. 'images/ab/ab12.../card.jpg'.
+    """
+    return f'{IMAGE_DIRECTORY}/{image_hash[:2]}/{image_hash}/{size}.jpg'
+
+
+def store_image_bytes(image_data: bytes) -> str:
+    """
+    Store an image and its thumbnails under the hash of its content.
+
+    Identical uploads share the same files, so each is only rendered once.
+
+    Args:
+        image_data (bytes): The raw content of the image file.
+
+    Returns:
+        str: The hash of the stored image, or an empty string if the data is not an image.
+    """
+    try:
+        img = Image.open(BytesIO(image_data))
+        img = img.convert('RGB')
+    except (ValueError, UnidentifiedImageError, OSError):
+        return ''
+
+    image_hash = hashlib.sha256(image_data).hexdigest()
+
+    for size, dimension in IMAGE_SIZES.items():
+        name = get_image_name(image_hash, size)
+        if default_storage.exists(name):
+            continue
+
+        img_byte_array = BytesIO()
+        img.resize(dimension).save(img_byte_array, format='JPEG')
+        default_storage.save(name, ContentFile(img_byte_array.getvalue()))
+
+    return image_hash
+
+
+def store_image(image_file) -> str:
+    """
+    Store an uploaded image file.
+
+    Args:
+        image_file (django.core.files.uploadedfile.UploadedFile | str | None):
+            The uploaded file, or the hash of an image that is already stored.
+
+    Returns:
+        str: The hash of the stored image, or an empty string if there is no valid image.
+
+    Note:
+        Forms pass the current value of the field back when no new file is uploaded,
+        so an existing image hash is returned as it is.
+    """
+    if isinstance(image_file, str):
+        return image_file if is_image_hash(image_file) else ''
+
+    try:
+        image_file.seek(0)
+        image_data = image_file.read()
+    except AttributeError:  # No file
+        return ''
+
+    return store_image_bytes(image_data)
+
+
+def store_background_images(background_file: list) -> dict[str, str]:
+    """
+    Store a list of background files.
+
+    Args:
+        background_file (list): A list of background files.
+
+    Returns:
+        dict: A dictionary where keys are in the format 'background i' and values are
+              the hashes of the corresponding stored images.
+    """
+    background_image_data = {}
+    num = 1
+
+    for image in background_file:
+        image_hash = store_image(image)
+        if image_hash != '':
+            image_key = f'background {num}'
+            background_image_data.update({image_key: image_hash})
+            num += 1
+
+    return background_image_data
@@ -0,0 +1,231 @@
+import base64
+import json
+
+from django.core.exceptions import FieldDoesNotExist, ValidationError
+from django.db.models import F, Q, QuerySet
+from django.db.models.constants import LOOKUP_SEP
+from django.http import Http404
+
+TIEBREAK_ORDERING = '-id'
+
+
+class KeysetPage:
+    """A page of results fetched after a keyset cursor."""
+
+    def __init__(self, object_list: list, next_cursor: str | None = None):
+        """
+        Initialize a KeysetPage with its rows and the cursor of the next page.
+
+        Args:
+            object_list (list): The rows of this page.
+            next_cursor (str | None): The cursor of the next page, None if this is the last page.
+        """
+        self.object_list = object_list
+        self.next_cursor = next_cursor
+
+    @property
+    def has_next(self) -> bool:
+        """Return True if there are more results after this page."""
+        return self.next_cursor is not None
+
+    def __iter__(self):
+        return iter(self.object_list)
+
+    def __len__(self):
+        return len(self.object_list)
+
+
+def get_keyset_ordering(queryset: QuerySet) -> list[str]:
+    """
+    Get the ordering used for keyset pagination of the queryset.
+
+    The unique id is appended as a tiebreaker so that every row has a distinct position.
+    Only fields and annotations of the model, ordered by name, can be used in a cursor.
+
+    Args:
+        queryset (QuerySet): The ordered queryset.
+
+    Returns:
+        list: The ordering field names, e.g. ['-pub_date', '-id'].
+
+    Raises:
+        ValueError: If the queryset is ordered by an expression, a related field or at random.
+    """
+    ordering = list(queryset.query.order_by or queryset.model._meta.ordering)
+    for each in ordering:
+        if not isinstance(each, str) or each == '?' or LOOKUP_SEP in each:
+            raise ValueError(f"Keyset pagination needs an ordering by field names, not {each!r}.")
+    if not {'id', '-id', 'pk', '-pk'} & set(ordering):
+        ordering.append(TIEBREAK_ORDERING)
+    return ordering
+
+
+def get_nullable_fields(queryset: QuerySet, ordering: list[str]) -> set[str]:
+    """
+    Get the ordering fields that may hold NULL, the nullable model fields and every annotation.
+
+    Args:
+        queryset (QuerySet): The queryset being paginated.
+        ordering (list): The ordering field names.
+
+    Returns:
+        set: The names of the nullable fields, without direction.
+    """
+    nullable = set()
+    for each_field in ordering:
+        name = each_field.lstrip('-')
+        if name == 'pk':
+            continue
+        try:
+            if queryset.model._meta.get_field(name).null:
+                nullable.add(name)
+        except FieldDoesNotExist:
+            nullable.add(name)  # Annotation, e.g. a rank
+    return nullable
+
+
+def get_keyset_order_by(ordering: list[str], nullable: set[str]) -> list:
+    """
+    Get the order_by() arguments of the ordering, with the NULLs of nullable fields last.
+
+    Databases disagree on where NULLs sort, so keyset_filter relies on them being last.
+    Fields that cannot be NULL keep their plain ordering, which their indexes match.
+
+    Args:
+        ordering (list): The ordering field names.
+        nullable (set): The names of the nullable fields.
+
+    Returns:
+        list: Field names and ordering expressions.
+    """
+    order_by = []
+    for each_field in ordering:
+        name = each_field.lstrip('-')
+        if name not in nullable:
+            order_by.append(each_field)
+        elif each_field.startswith('-'):
+            order_by.append(F(name).desc(nulls_last=True))
+        else:
+            order_by.append(F(name).asc(nulls_last=True))
+    return order_by
+
+
+def encode_cursor(values: list) -> str:
+    """
+    Encode the ordering values of the last row of a page into an opaque cursor.
+
+    Args:
+        values (list): The values of the ordering fields.
+
+    Returns:
+        str: URL-safe cursor string.
+    """
+    # isoformat() keeps microseconds, which DjangoJSONEncoder would truncate
+    data = json.dumps(values, default=lambda value: value.isoformat()).encode()
+    return base64.urlsafe_b64encode(data).decode()
+
+
+def decode_cursor(queryset: QuerySet, ordering: list[str], cursor: str) -> list:
+    """
+    Decode a cursor back into typed ordering values.
+
+    Args:
+        queryset (QuerySet): The queryset being paginated.
+        ordering (list): The ordering field names.
+        cursor (str): The cursor created by encode_cursor.
+
+    Returns:
+        list: The ordering values in python types.
+
+    Raises:
+        Http404: If the cursor is malformed.
+    """
+    try:
+        values = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        if not isinstance(values, list) or len(values) != len(ordering):
+            raise ValueError(cursor)
+
+        typed_values = []
+        for each_field, value in zip(ordering, values):
+            typed_values.append(to_python_value(queryset, each_field.lstrip('-'), value))
+        return typed_values
+    except (ValueError, TypeError, ValidationError):
+        raise Http404("Invalid cursor.")
+
+
+def to_python_value(queryset: QuerySet, name: str, value):
+    """Convert a decoded JSON value to the python type of the model field, if it is one."""
+    if name == 'pk':
+        name = queryset.model._meta.pk.name
+    try:
+        model_field = queryset.model._meta.get_field(name)
+    except FieldDoesNotExist:
+        return value  # Annotation, e.g. a count
+    return model_field.to_python(value)
+
+
+def keyset_filter(ordering: list[str], values: list, nullable: set[str] = frozenset()) -> Q:
+    """
+    Build the condition selecting the rows that come after the given position.
+
+    NULLs of the nullable fields are sorted last, see get_keyset_order_by. A NULL value is
+    followed only by other NULLs, and a value is followed by the smaller values and the NULLs.
+
+    Args:
+        ordering (list): The ordering field names.
+        values (list): The ordering values of the last row already shown.
+        nullable (set): The names of the ordering fields that may hold NULL.
+
+    Returns:
+        Q: (f1 < v1) OR (f1 = v1 AND f2 < v2) OR ... for descending fields.
+    """
+    condition = Q()
+    equal_so_far = Q()
+
+    for each_field, value in zip(ordering, values):
+        name = each_field.lstrip('-')
+        if value is None:
+            equal_so_far &= Q(**{f'{name}__isnull': True})
+            continue
+
+        lookup = 'lt' if each_field.startswith('-') else 'gt'
+        after = Q(**{f'{name}__{lookup}': value})
+        if name in nullable:
+            after |= Q(**{f'{name}__isnull': True})
+        condition |= equal_so_far & after
+        equal_so_far &= Q(**{name: value})
+
+    return condition
+
+
+def paginate_keyset(queryset: QuerySet, cursor: str | None, per_page: int) -> KeysetPage:
+    """
+    Return one page of the queryset, starting after the cursor.
+
+    Unlike offset pagination, the database seeks directly to the cursor position,
+    so the cost of a page does not grow with how deep into the results it is.
+
+    Args:
+        queryset (QuerySet): The ordered queryset to paginate.
+        cursor (str | None): The cursor of the previous page, or None for the first page.
+        per_page (int): The number of rows per page.
+
+    Returns:
+        KeysetPage: The rows of the page and the cursor for the next one.
+    """
+    ordering = get_keyset_ordering(queryset)
+    nullable = get_nullable_fields(queryset, ordering)
+    queryset = queryset.order_by(*get_keyset_order_by(ordering, nullable))
+
+    if cursor:
+        values = decode_cursor(queryset, ordering, cursor)
+        queryset = queryset.filter(keyset_filter(ordering, values, nullable))
+
+    # Fetch one extra row to know whether a next page exists
+    rows = list(queryset[:per_page + 1])
+    if len(rows) <= per_page:
+        return KeysetPage(rows)
+
+    rows = rows[:per_page]
+    last_values = [getattr(rows[-1], each.lstrip('-')) for each in ordering]
+    return KeysetPage(rows, encode_cursor(last_values))
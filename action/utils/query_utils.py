@@ -0,0 +1,102 @@
+import re
+import time
+
+from django.db import connection
+
+# A query shape run this many times in one request is reported as an N+1 query
+N_PLUS_ONE_THRESHOLD = 5
+
+# Lists of placeholders, such as the values of IN (...), whose length varies between calls
+PLACEHOLDER_LIST = re.compile(r'\((?:%s, )+%s\)')
+
+
+def get_query_shape(sql: str) -> str:
+    """
+    Get the shape of a query, which is the same for every call of the same ORM code.
+
+    The parameters are already separate from the SQL, so only the lists of placeholders
+    are collapsed.
+
+    Args:
+        sql (str): The SQL sent to the database, with placeholders.
+
+    Returns:
+        str: The SQL with every list of placeholders replaced by (%s...).
+    """
+    return PLACEHOLDER_LIST.sub('(%s...)', sql)
+
+
+class QueryRecorder:
+    """
+    Context manager recording the queries of the default database and their durations.
+
+    It is installed as a database execute wrapper, so it also records queries when DEBUG is off.
+    """
+
+    def __init__(self):
+        """Initialize an empty recording."""
+        self.queries = []  # (sql, seconds) of every executed query
+        self._wrapper = None
+
+    def __call__(self, execute, sql, params, many, context):
+        """
+        Execute a query and record its SQL and duration.
+
+        Args:
+            execute (Callable): The next wrapper, or the cursor method executing the query.
+            sql (str): The SQL of the query.
+            params: The parameters of the query.
+            many (bool): True for executemany().
+            context (dict): The connection and cursor.
+
+        Returns:
+            The result of execute.
+        """
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.queries.append((sql, time.perf_counter() - start))
+
+    def __enter__(self) -> 'QueryRecorder':
+        self._wrapper = connection.execute_wrapper(self)
+        self._wrapper.__enter__()
+        return self
+
+    def __exit__(self, *exc_info):
+        self._wrapper.__exit__(*exc_info)
+
+    @property
+    def count(self) -> int:
+        """The number of executed queries."""
+        return len(self.queries)
+
+    @property
+    def duration(self) -> float:
+        """The total time spent in the database, in seconds."""
+        return sum(seconds for _, seconds in self.queries)
+
+    def repeated_queries(self, threshold: int = N_PLUS_ONE_THRESHOLD) -> dict[str, int]:
+        """
+        Find the query shapes executed at least threshold times, the sign of an N+1 query.
+
+        Args:
+            threshold (int): The number of calls from which a shape is reported.
+
+        Returns:
+            dict[str, int]: The number of calls of each repeated shape.
+        """
+        counts = {}
+        for sql, _ in self.queries:
+            shape = get_query_shape(sql)
+            counts[shape] = counts.get(shape, 0) + 1
+        return {shape: count for shape, count in counts.items() if count >= threshold}
+
+    def server_timing(self) -> str:
+        """
+        Format the recording as a Server-Timing header value, shown by browser dev tools.
+
+        Returns:
+            str: The database time in milliseconds and the number of queries.
+        """
+        return f'db;dur={self.duration * 1000:.1f};desc="{self.count} queries"'
@@ -1,11 +1,27 @@
-from datetime import datetime
+from datetime import date, datetime, time, timedelta
 from django.contrib.auth.mixins import LoginRequiredMixin
-from django.db.models import Count, QuerySet
+from django.db.models import Count, Exists, OuterRef, Q, QuerySet
+from django.db.models.functions import Lower
 from django.http import HttpRequest
 from django.utils import timezone
+from django.utils.dateparse import parse_datetime
 from urllib.parse import parse_qs
 
 from action.models import Activity, ActivityStatus
+from .text_search_utils import get_search_backend
+
+# Newest first, id breaks ties so that keyset cursors are unique
+INDEX_ORDERING = ('-pub_date', '-id')
+
+# Tags that filter the activities by their 'q' value, combined into one SearchSpec
+FILTER_TAGS = frozenset(['title', 'text', 'owner', 'place', 'categories',
+                         'date_start_point', 'date_end_point', 'date_exact'])
+
+# How the category_q list is matched: activities with all the categories, or with any of them
+CATEGORY_MATCH_MODES = ('all', 'any')
+
+# Tags that select a list of activities, see BaseSearcher.set_searcher
+LISTING_TAGS = frozenset(['upcoming', 'popular', 'recent', 'friend_joined', 'registered', 'favorited'])
 
 
 def get_query_dict(request: HttpRequest) -> dict[list, list]:
@@ -39,6 +55,213 @@ def get_categories_list(request: HttpRequest) -> list[str]:
     return values_category_q
 
 
+def get_category_match_mode(request: HttpRequest) -> str:
+    """
+    Get how the category list of the request is matched.
+
+    Args:
+        request (HttpRequest): The HTTP request object.
+
+    Returns:
+        str: 'all' (the default) or 'any'.
+
+    Raises:
+        ValueError: If the mode is not one of CATEGORY_MATCH_MODES.
+    """
+    mode = request.GET.get('category_match') or 'all'
+    if mode not in CATEGORY_MATCH_MODES:
+        raise ValueError(f"Invalid category match: {mode}")
+    return mode
+
+
+def get_day_range(day: date) -> tuple[datetime, datetime]:
+    """
+    Get the start of a day and of the next one in the current time zone.
+
+    Filtering on start <= value < end compares the column itself, so its index is used,
+    unlike the __date transform which converts every row.
+
+    Args:
+        day (date): The calendar day.
+
+    Returns:
+        tuple[datetime, datetime]: The aware start of the day and of the next day.
+    """
+    return (timezone.make_aware(datetime.combine(day, time.min)),
+            timezone.make_aware(datetime.combine(day + timedelta(days=1), time.min)))
+
+
+def get_date_point(value: str) -> datetime:
+    """
+    Parse a date point of a search, in the current time zone unless it has an offset.
+
+    Args:
+        value (str): A datetime, such as '2024-05-01T12:00' from the date inputs.
+
+    Returns:
+        datetime: The aware datetime.
+
+    Raises:
+        ValueError: If the value is not a valid datetime.
+    """
+    point = parse_datetime(value)
+    if point is None:
+        raise ValueError(f"Invalid date: {value}")
+    return timezone.make_aware(point) if timezone.is_naive(point) else point
+
+
+class SearchSpec:
+    """
+    The filters of a search, parsed from all the tags of a request.
+
+    The spec is compiled into a single filter() call: one join per relation, and at most one
+    EXISTS subquery per category match mode, so the query stays the same size whatever the tags.
+    """
+
+    def __init__(self):
+        """
+        Initialize an empty SearchSpec, which matches every activity.
+
+        Attributes:
+            title (str | None): Text contained in the title.
+            text (str | None): Words searched in the full-text index.
+            owner (str | None): Text contained in the owner's username.
+            place (str | None): Text contained in the place.
+            categories (set[str]): Lowercase names of categories the activities must all have.
+            any_categories (set[str]): Lowercase names of categories the activities must have one of.
+            date_start_point (str | None): Earliest start date.
+            date_end_point (str | None): Latest start date.
+            date_exact (str | None): Day of the start date, replaces the two points.
+            listing_tag (str | None): The tag of the list of activities that is filtered.
+        """
+        self.title = None
+        self.text = None
+        self.owner = None
+        self.place = None
+        self.categories = set()
+        self.any_categories = set()
+        self.date_start_point = None
+        self.date_end_point = None
+        self.date_exact = None
+        self.listing_tag = None
+
+    @classmethod
+    def from_request(cls, request: HttpRequest) -> 'SearchSpec':
+        """
+        Parse the tags, queries and category list of a request.
+
+        Args:
+            request (HttpRequest): The HTTP request object.
+
+        Returns:
+            SearchSpec: The filters of the search.
+
+        Raises:
+            ValueError: If an invalid tag is encountered.
+        """
+        spec = cls()
+        query_dict = get_query_dict(request)
+        category_list = get_categories_list(request)
+        category_names = {category.lower() for category in category_list if category}
+        if get_category_match_mode(request) == 'any':
+            spec.any_categories = category_names
+        else:
+            spec.categories = category_names
+
+        # Case where query is None (not empty string), for tags without 'q' as url parameters.
+        # Tags: upcoming, popular, recent, friend_joined, registered, favorited tags.
+        if not query_dict and not category_list:
+            # This returns the last value of tag=, assuming there's only one tag= in url
+            tag = request.GET.get('tag')
+            if tag is not None and tag not in FILTER_TAGS | LISTING_TAGS:
+                raise ValueError(f"Invalid Tag: {tag}")
+            if tag in LISTING_TAGS:
+                spec.listing_tag = tag
+            return spec
+
+        for tag, query in query_dict.items():
+            if not query:
+                continue  # Skip if query is an empty string
+
+            if tag in LISTING_TAGS:
+                spec.listing_tag = tag
+            elif tag == 'categories':
+                spec.categories.add(query.lower())
+            elif tag in FILTER_TAGS:
+                setattr(spec, tag, query)
+            else:
+                raise ValueError(f"Invalid Tag: {tag}")
+        return spec
+
+    def get_filter(self) -> Q:
+        """
+        Compile the filters, except the full-text search, into one condition.
+
+        Returns:
+            Q: The condition on activities, empty if nothing is filtered.
+        """
+        condition = Q()
+        if self.title:
+            condition &= Q(title__icontains=self.title)
+        if self.owner:
+            condition &= Q(owner__username__icontains=self.owner)
+        if self.place:
+            condition &= Q(place__icontains=self.place)
+
+        # Set the value to None if not specified, using an empty string
+        # (default for empty URL params) will cause an invalid datetime format
+        if self.date_exact:
+            day_start, day_end = get_day_range(datetime.strptime(self.date_exact, '%Y-%m-%dT%H:%M').date())
+            condition &= Q(start_date__gte=day_start, start_date__lt=day_end)
+        else:
+            if self.date_start_point:
+                condition &= Q(start_date__gte=get_date_point(self.date_start_point))
+            if self.date_end_point:
+                condition &= Q(start_date__lte=get_date_point(self.date_end_point))
+
+        if self.categories:
+            condition &= Exists(self.get_category_links(self.categories)
+                                .values('activity').annotate(matched=Count('category', distinct=True))
+                                .filter(matched=len(self.categories)))
+        if self.any_categories:
+            condition &= Exists(self.get_category_links(self.any_categories))
+        return condition
+
+    @staticmethod
+    def get_category_links(names: set[str]) -> QuerySet:
+        """
+        Get the links of the outer query's activity to the named categories.
+
+        The names are compared in lowercase, which the category_name_lower index serves.
+        Grouped by activity and counted, the links tell whether it has all the categories.
+
+        Args:
+            names (set[str]): Lowercase category names.
+
+        Returns:
+            QuerySet: The matching rows of the activity-category table, for an EXISTS.
+        """
+        return Activity.categories.through.objects.filter(activity=OuterRef('pk')) \
+            .annotate(category_name=Lower('category__name')) \
+            .filter(category_name__in=names)
+
+    def apply(self, activities: QuerySet[Activity]) -> QuerySet[Activity]:
+        """
+        Filter a queryset of activities by the spec, best text match first if there's a text.
+
+        Args:
+            activities (QuerySet): The activities to filter.
+
+        Returns:
+            QuerySet: The filtered queryset of activities.
+        """
+        activities = activities.filter(self.get_filter())
+        if self.text:
+            backend = get_search_backend()
+            activities = backend.rank(backend.filter(activities, self.text), self.text)
+        return activities
+
+
 class BaseSearcher:
     """Base class for searching activities based on various criteria."""
 
@@ -52,17 +275,15 @@ class BaseSearcher:
         Attributes:
             request (HttpRequest): The HTTP request object associated with the instance.
             user (User): The authenticated user associated with the request.
-            query_dict (dict): A dictionary mapping tag names to their corresponding query values.
-            tag (str): The current tag being processed, initially set to None.
+            tag (str): The tag of the list of activities, initially set to None.
             activities (QuerySet): The base queryset of activities filtered by publication date.
         """
         self.request = request
         self.user = request.user
-        self.query_dict = get_query_dict(request)
         self.tag = None
 
-        self.activities = Activity.objects.filter(
-            pub_date__lte=timezone.now()).order_by('-pub_date')
+        self.activities = Activity.objects.for_listing().filter(
+            pub_date__lte=timezone.now()).order_by(*INDEX_ORDERING)
 
     def set_searcher(self):
         """
@@ -74,22 +295,6 @@ class BaseSearcher:
         match self.tag:
             case None:
                 searcher = IndexSearcher
-            case 'title':
-                searcher = TitleSearcher
-            case 'owner':
-                searcher = OwnerSearcher
-            case 'date_start_point':
-                searcher = DateSearcher
-            case 'date_end_point':
-                searcher = DateSearcher
-            case 'date_exact':
-                searcher = DateSearcher
-            case 'categories':
-                searcher = CategoriesSearcher
-            case 'category_list':
-                searcher = CategoryListSearcher
-            case 'place':
-                searcher = PlaceSearcher
             case 'upcoming':
                 searcher = UpcomingSearcher
             case 'popular':
@@ -113,32 +318,10 @@ class BaseSearcher:
         Returns:
             QuerySet: The final queryset of activities.
         """
-        category_list = get_categories_list(self.request)
-
-        # Case where there's a list of category
-        if category_list:
-            self.tag = 'category_list'
-            self.set_searcher()
-            self.activities = self.searcher.get_index_query()
-
-        # Case where query is None (not empty string), for tags without 'q' as url parameters.
-        # Tags: upcoming, popular, recent, friend_joined, registered, favorited tags.
-        if not self.query_dict and not category_list:
-            # This returns the last value of tag=, assuming there's only one tag= in url
-            self.tag = self.request.GET.get('tag')
-            self.set_searcher()
-            return self.searcher.get_index_query()
-
-        # Case where query exists
-        for each_tag, each_query in self.query_dict.items():
-            if not each_query:
-                continue  # Skip if query is an empty string
-
-            self.tag = each_tag
-            self.set_searcher()
-            self.activities &= self.searcher.get_index_query()
-
-        return self.activities
+        spec = SearchSpec.from_request(self.request)
+        self.tag = spec.listing_tag
+        self.set_searcher()
+        return spec.apply(self.searcher.get_index_query())
 
 
 class IndexSearcher(BaseSearcher):
@@ -154,111 +337,6 @@ class IndexSearcher(BaseSearcher):
         return self.activities
 
 
-class TitleSearcher(BaseSearcher):
-    """Searcher for filtering activities by title."""
-
-    def get_index_query(self) -> QuerySet[Activity]:
-        """
-        Return the queryset of activities filtered by title.
-
-        Returns:
-            QuerySet: The filtered queryset of activities.
-        """
-        title_query = self.query_dict.get('title', None)
-        return self.activities.filter(title__icontains=title_query)
-
-
-class OwnerSearcher(BaseSearcher):
-    """Searcher for filtering activities by owner."""
-
-    def get_index_query(self) -> QuerySet[Activity]:
-        """
-        Return the queryset of activities filtered by owner.
-
-        Returns:
-            QuerySet: The filtered queryset of activities.
-        """
-        owner_query = self.query_dict.get('owner', None)
-        return self.activities.filter(owner__username__icontains=owner_query)
-
-
-class DateSearcher(BaseSearcher):
-    """Searcher for filtering activities by date."""
-
-    def get_index_query(self) -> QuerySet[Activity]:
-        """
-        Return the queryset of activities filtered by date.
-
-        Returns:
-            QuerySet: The filtered queryset of activities.
-        """
-        # Set the value to None if not specified, using an empty string
-        # (default for empty URL params) will cause an invalid datetime format
-        start_point = self.query_dict.get('date_start_point', None)
-        end_point = self.query_dict.get('date_end_point', None)
-        exact_point = self.query_dict.get('date_exact', None)
-
-        filtered_activity = self.activities
-
-        if exact_point:
-            exact_date = datetime.strptime(exact_point, '%Y-%m-%dT%H:%M').date()
-            filtered_activity &= self.activities.filter(start_date__date=exact_date)
-            return filtered_activity
-
-        if start_point:
-            filtered_activity &= self.activities.filter(start_date__gte=start_point)
-
-        if end_point:
-            filtered_activity &= self.activities.filter(start_date__lte=end_point)
-
-        return filtered_activity
-
-
-class CategoriesSearcher(BaseSearcher):
-    """Searcher for filtering activities by categories."""
-
-    def get_index_query(self) -> QuerySet[Activity]:
-        """
-        Return the queryset of activities filtered by categories.
-
-        Returns:
-            QuerySet: The filtered queryset of activities.
-        """
-        categories_query = self.query_dict.get('categories', None)
-        return self.activities.filter(categories__name__iexact=categories_query)
-
-
-class CategoryListSearcher(BaseSearcher):
-    """Searcher for filtering activities by a list of categories."""
-
-    def get_index_query(self) -> QuerySet[Activity]:
-        """
-        Return the queryset of activities filtered by a list of categories.
-
-        Returns:
-            QuerySet: The filtered queryset of activities.
-        """
-        category_list = get_categories_list(self.request)
-        for each_category in category_list:
-            if each_category:
-                self.activities &= self.activities.filter(categories__name__iexact=each_category)
-        return self.activities
-
-
-class PlaceSearcher(BaseSearcher):
-    """Searcher for filtering activities by place."""
-
-    def get_index_query(self) -> QuerySet[Activity]:
-        """
-        Return the queryset of activities filtered by place.
-
-        Returns:
-            QuerySet: The filtered queryset of activities.
-        """
-        place_query = self.query_dict.get('place', None)
-        return self.activities.filter(place__icontains=place_query)
-
-
 class UpcomingSearcher(BaseSearcher):
     """Searcher for retrieving upcoming activities."""
 
@@ -271,7 +349,7 @@ class UpcomingSearcher(BaseSearcher):
         """
         now = timezone.now()
         delay = timezone.timedelta(days=7)
-        activities = Activity.objects.order_by('-pub_date')
+        activities = Activity.objects.for_listing().order_by(*INDEX_ORDERING)
         return activities.filter(pub_date__range=(now, now + delay))
 
 
@@ -282,16 +360,12 @@ class PopularSearcher(BaseSearcher):
         """
         Return the queryset of popular activities.
 
+        The stored popularity is read from the top of its index, nothing is counted.
+
         Returns:
             QuerySet: The queryset of popular activities.
         """
-        self.activities = self.activities.filter(activity__is_participated=True)
-
-        # Add a temporary column and filter by it (temp_participant_count), descending
-        self.activities = self.activities.annotate(
-            temp_participant_count=Count('activity__participants'))
-        self.activities = self.activities.order_by('-temp_participant_count')
-        return self.activities
+        return self.activities.filter(participant_count__gt=0).order_by('-popularity', '-id')
 
 
 class RecentSearcher(BaseSearcher):
@@ -306,7 +380,7 @@ class RecentSearcher(BaseSearcher):
         """
         now = timezone.now()
         delay = timezone.timedelta(days=7)
-        activities = Activity.objects.order_by('-pub_date')
+        activities = Activity.objects.for_listing().order_by(*INDEX_ORDERING)
         return activities.filter(pub_date__range=(now - delay, now))
 
 
@@ -326,7 +400,7 @@ class FriendJoinedSearcher(LoginRequiredMixin, BaseSearcher):
 
         # Get ActivityStatus objects for your friends and is_participated=True
         user_activity_status = ActivityStatus.objects.filter(
-            participants__in=self.user.friends, is_participated=True)
+            participants__friend_of__user=self.user, is_participated=True)
 
         return self.activities.filter(activity__in=user_activity_status).distinct()
 
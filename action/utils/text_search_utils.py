@@ -0,0 +1,217 @@
+import re
+from abc import ABC, abstractmethod
+
+from django.contrib.postgres.search import SearchQuery, SearchRank
+from django.db import connection
+from django.db.models import F, Q, QuerySet
+from django.db.models.expressions import RawSQL
+
+from action.models import Activity, User
+
+# 'simple' does not stem, so Thai and English words are both matched as written
+SEARCH_CONFIG = 'simple'
+
+FTS_TABLE = 'action_activity_fts'
+
+WORD_PATTERN = re.compile(r'\w+')
+
+
+class BaseSearchBackend(ABC):
+    """
+    Abstract base class for the full-text index of activities.
+
+    The database objects holding the index are created by migration 0010, the backends only
+    keep their content up to date and query it.
+    """
+
+    @abstractmethod
+    def update_index(self, activity_ids: list[int] | None = None) -> None:
+        """
+        Recompute the indexed document of activities.
+
+        Args:
+            activity_ids (list[int] | None): The activities to update, None for all of them.
+        """
+        pass
+
+    def remove_from_index(self, activity_ids: list[int]) -> None:
+        """
+        Remove deleted activities from the index.
+
+        Args:
+            activity_ids (list[int]): The deleted activities.
+        """
+        pass
+
+    @abstractmethod
+    def filter(self, queryset: QuerySet[Activity], text: str) -> QuerySet[Activity]:
+        """
+        Filter the activities matching all words of the text.
+
+        Args:
+            queryset (QuerySet): The activities to search in.
+            text (str): The search text.
+
+        Returns:
+            QuerySet: The matching activities.
+        """
+        pass
+
+    def rank(self, queryset: QuerySet[Activity], text: str) -> QuerySet[Activity]:
+        """
+        Order the activities by relevance to the text, best match first.
+
+        Args:
+            queryset (QuerySet): The matching activities.
+            text (str): The search text.
+
+        Returns:
+            QuerySet: The activities ordered by relevance, then by their previous ordering.
+        """
+        return queryset
+
+
+class PostgresSearchBackend(BaseSearchBackend):
+    """Full-text index kept in Activity.search_vector with a GIN index."""
+
+    def update_index(self, activity_ids: list[int] | None = None) -> None:
+        # Title weighs most, then place and owner, then the descriptions
+        sql = f"""
+            UPDATE {Activity._meta.db_table} AS activity SET search_vector =
+                setweight(to_tsvector('{SEARCH_CONFIG}', coalesce(activity.title, '')), 'A') ||
+                setweight(to_tsvector('{SEARCH_CONFIG}', coalesce(activity.place, '')), 'B') ||
+                setweight(to_tsvector('{SEARCH_CONFIG}', coalesce(owner.username, '')), 'B') ||
+                setweight(to_tsvector('{SEARCH_CONFIG}', coalesce(activity.description, '')), 'C') ||
+                setweight(to_tsvector('{SEARCH_CONFIG}', coalesce(activity.full_description, '')), 'D')
+            FROM {User._meta.db_table} AS owner
+            WHERE owner.id = activity.owner_id
+        """
+        params = []
+        if activity_ids is not None:
+            sql += ' AND activity.id = ANY(%s)'
+            params.append(list(activity_ids))
+
+        with connection.cursor() as cursor:
+            cursor.execute(sql, params)
+
+    def remove_from_index(self, activity_ids: list[int]) -> None:
+        # Rows of deleted activities are gone along with their vector
+        Activity.objects.filter(id__in=activity_ids).update(search_vector=None)
+
+    def get_search_query(self, text: str) -> SearchQuery:
+        return SearchQuery(text, config=SEARCH_CONFIG, search_type='websearch')
+
+    def filter(self, queryset: QuerySet[Activity], text: str) -> QuerySet[Activity]:
+        return queryset.filter(search_vector=self.get_search_query(text))
+
+    def rank(self, queryset: QuerySet[Activity], text: str) -> QuerySet[Activity]:
+        ordering = queryset.query.order_by
+        queryset = queryset.annotate(
+            search_rank=SearchRank(F('search_vector'), self.get_search_query(text)))
+        return queryset.order_by('-search_rank', *ordering)
+
+
+class SQLiteSearchBackend(BaseSearchBackend):
+    """Full-text index kept in an FTS5 virtual table, for development and tests."""
+
+    # Columns of the FTS5 table and their weights for ranking
+    COLUMN_WEIGHTS = {
+        'title': 10.0,
+        'place': 5.0,
+        'owner': 5.0,
+        'description': 2.0,
+        'full_description': 1.0,
+    }
+
+    def update_index(self, activity_ids: list[int] | None = None) -> None:
+        condition, params = '', []
+        if activity_ids is not None:
+            activity_ids = list(activity_ids)
+            if not activity_ids:
+                return
+            condition = f"WHERE activity.id IN ({', '.join(['%s'] * len(activity_ids))})"
+            params = activity_ids
+
+        with connection.cursor() as cursor:
+            self.remove_from_index(activity_ids, cursor)
+            cursor.execute(f"""
+                INSERT INTO {FTS_TABLE} (rowid, {', '.join(self.COLUMN_WEIGHTS)})
+                SELECT activity.id, activity.title, coalesce(activity.place, ''), owner.username,
+                       activity.description, coalesce(activity.full_description, '')
+                FROM {Activity._meta.db_table} AS activity
+                JOIN {User._meta.db_table} AS owner ON owner.id = activity.owner_id
+                {condition}
+            """, params)
+
+    def remove_from_index(self, activity_ids: list[int] | None, cursor=None) -> None:
+        if cursor is None:
+            with connection.cursor() as cursor:
+                return self.remove_from_index(activity_ids, cursor)
+
+        if activity_ids is None:
+            cursor.execute(f'DELETE FROM {FTS_TABLE}')
+        elif activity_ids:
+            cursor.execute(
+                f"DELETE FROM {FTS_TABLE} WHERE rowid IN ({', '.join(['%s'] * len(activity_ids))})",
+                list(activity_ids))
+
+    def get_match_expression(self, text: str) -> str:
+        """Quote every word, so that FTS5 operators typed by users are searched as plain words."""
+        return ' '.join(f'"{word}"' for word in WORD_PATTERN.findall(text))
+
+    def filter(self, queryset: QuerySet[Activity], text: str) -> QuerySet[Activity]:
+        match = self.get_match_expression(text)
+        if not match:
+            return queryset.none()
+        return queryset.filter(id__in=RawSQL(
+            f'SELECT rowid FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH %s', (match,)))
+
+    def rank(self, queryset: QuerySet[Activity], text: str) -> QuerySet[Activity]:
+        match = self.get_match_expression(text)
+        if not match:
+            return queryset
+
+        # bm25() is lower for better matches
+        weights = ', '.join(str(weight) for weight in self.COLUMN_WEIGHTS.values())
+        ordering = queryset.query.order_by
+        queryset = queryset.annotate(search_rank=RawSQL(
+            f'SELECT bm25({FTS_TABLE}, {weights}) FROM {FTS_TABLE} '
+            f'WHERE {FTS_TABLE} MATCH %s AND {FTS_TABLE}.rowid = {Activity._meta.db_table}.id',
+            (match,)))
+        return queryset.order_by('search_rank', *ordering)
+
+
+class FallbackSearchBackend(BaseSearchBackend):
+    """Unindexed search for databases without a full-text backend."""
+
+    SEARCH_FIELDS = ['title', 'description', 'full_description', 'place', 'owner__username']
+
+    def update_index(self, activity_ids: list[int] | None = None) -> None:
+        pass
+
+    def filter(self, queryset: QuerySet[Activity], text: str) -> QuerySet[Activity]:
+        for word in WORD_PATTERN.findall(text):
+            word_condition = Q()
+            for field in self.SEARCH_FIELDS:
+                word_condition |= Q(**{f'{field}__icontains': word})
+            queryset = queryset.filter(word_condition)
+        return queryset
+
+
+def get_search_backend(vendor: str | None = None) -> BaseSearchBackend:
+    """
+    Get the full-text search backend for the database in use.
+
+    Args:
+        vendor (str | None): The database vendor, the default connection's vendor if None.
+
+    Returns:
+        BaseSearchBackend: The search backend of the vendor.
+    """
+    match vendor or connection.vendor:
+        case 'postgresql':
+            return PostgresSearchBackend()
+        case 'sqlite':
+            return SQLiteSearchBackend()
+        case _:
+            return FallbackSearchBackend()
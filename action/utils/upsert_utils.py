@@ -0,0 +1,49 @@
+from django.db import connection
+from django.db.models import Model
+
+
+def upsert(model: type[Model], values: dict, conflict_target: str, update_fields: list[str],
+           condition: str, parent: tuple[type[Model], int]) -> bool:
+    """
+    Insert a row, or update the row it conflicts with, in a single statement.
+
+    Uses INSERT ... ON CONFLICT DO UPDATE ... WHERE, which PostgreSQL and SQLite share, so
+    concurrent calls never create duplicate rows and never apply the same change twice.
+
+    Args:
+        model (type[Model]): The model of the table.
+        values (dict): The field values of the new row.
+        conflict_target (str): The SQL of the unique index the row may conflict with.
+        update_fields (list[str]): The fields copied from the new row into the existing one.
+        condition (str): SQL condition on the existing row, it is only updated if this holds.
+        parent (tuple[type[Model], int]): A model and primary key that must exist for the row
+            to be inserted, so that a missing parent does not violate a foreign key.
+
+    Returns:
+        bool: True if a row was inserted or updated, False if nothing changed.
+    """
+    quote = connection.ops.quote_name
+    table = quote(model._meta.db_table)
+    parent_model, parent_id = parent
+
+    fields = [model._meta.get_field(name) for name in values]
+    columns = ', '.join(quote(field.column) for field in fields)
+    placeholders = ', '.join(['%s'] * len(fields))
+    params = [field.get_db_prep_save(values[field.name], connection) for field in fields]
+    assignments = ', '.join(
+        f'{quote(column)} = excluded.{quote(column)}'
+        for column in (model._meta.get_field(name).column for name in update_fields))
+
+    sql = f"""
+        INSERT INTO {table} ({columns})
+        SELECT {placeholders}
+        WHERE EXISTS (SELECT 1 FROM {quote(parent_model._meta.db_table)}
+                      WHERE {quote(parent_model._meta.pk.column)} = %s)
+        ON CONFLICT ({conflict_target}) DO UPDATE SET {assignments}
+        WHERE {condition}
+        RETURNING {quote(model._meta.pk.column)}
+    """
+
+    with connection.cursor() as cursor:
+        cursor.execute(sql, [*params, parent_id])
+        return cursor.fetchone() is not None
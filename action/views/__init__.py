@@ -4,3 +4,4 @@ from .friend import *
 
 from .index_view import *
 from .calendar_view import *
+from .image_view import *
@@ -1,12 +1,16 @@
+from django.conf import settings
 from django.contrib import messages
 from django.http import Http404, HttpResponse
 from django.shortcuts import render, redirect
+from django.utils.decorators import method_decorator
 from django.views import generic
 
 from action.models import Activity
 from action import utils
 
 
+@method_decorator(utils.conditional_page(utils.get_activity_detail_state), name='dispatch')
+@method_decorator(utils.cache_anonymous_page, name='dispatch')
 class ActivityDetailView(generic.DetailView):
     """DetailView for displaying details of a specific Activity."""
 
@@ -31,6 +35,8 @@ class ActivityDetailView(generic.DetailView):
 
         context = {
             "activity": activity_object,
-            "activity_status": utils.fetch_activity_status(request, self.kwargs['pk'])
+            "activity_status": utils.fetch_activity_status(request, self.kwargs['pk']),
+            "page_cache_version": utils.get_page_cache_version(),
+            "page_cache_timeout": settings.PAGE_CACHE_TIMEOUT,
         }
         return render(request, self.template_name, context)
@@ -6,8 +6,10 @@ from django.shortcuts import redirect
 from django.urls import reverse
 from django.views import generic
 
+from action.calendar import enqueue_activity_update
 from action.forms import ActivityForm
 from action.models import Activity
+from action.models.activity import CALENDAR_FIELDS
 
 
 class ActivityEditView(LoginRequiredMixin, generic.UpdateView):
@@ -43,6 +45,8 @@ class ActivityEditView(LoginRequiredMixin, generic.UpdateView):
         """Render the form with success messages if it's valid."""
         super().form_valid(form)
         form.save()
+        if CALENDAR_FIELDS.intersection(form.changed_data):
+            enqueue_activity_update(form.instance)  # Update the participants' calendar events
         messages.success(self.request, 'Activity edited successfully.')
         return redirect(self.get_success_url())
 
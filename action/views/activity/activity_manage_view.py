@@ -1,10 +1,13 @@
 from django.contrib.auth.mixins import LoginRequiredMixin
 from django.db.models import QuerySet
+from django.utils.decorators import method_decorator
 from django.views import generic
 
 from action.models import Activity
+from action import utils
 
 
+@method_decorator(utils.conditional_page(utils.get_activity_manage_state), name='dispatch')
 class ActivityManageView(LoginRequiredMixin, generic.ListView):
     """View for managing and displaying a list of activities owned by the current user."""
 
@@ -13,4 +16,4 @@ class ActivityManageView(LoginRequiredMixin, generic.ListView):
 
     def get_queryset(self) -> QuerySet[Activity]:
         """Return the queryset of activities owned by the current user."""
-        return Activity.objects.filter(owner=self.request.user)
+        return Activity.objects.for_listing().filter(owner=self.request.user).with_my_status(self.request.user)
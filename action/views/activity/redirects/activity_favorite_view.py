@@ -5,7 +5,7 @@ from django.shortcuts import redirect
 from django.urls import reverse
 from django.views import View
 
-from action.utils import fetch_activity_status
+from action.utils import set_activity_status_flag
 
 
 class ActivityFavoriteView(LoginRequiredMixin, View):
@@ -21,13 +21,9 @@ class ActivityFavoriteView(LoginRequiredMixin, View):
     """
 
     def get(self, request: HttpRequest, activity_id: int) -> HttpResponse:
-        activity_status = fetch_activity_status(request, activity_id)
-
-        if activity_status.is_favorited:
-            messages.info(request, "You have already favorited this activity.")
-        else:
-            activity_status.is_favorited = True
-            activity_status.save()
+        if set_activity_status_flag(request.user, activity_id, 'is_favorited', True):
             messages.success(request, "You have successfully favorited this activity.")
+        else:
+            messages.info(request, "You have already favorited this activity.")
 
         return redirect(reverse("action:detail", args=(activity_id,)))
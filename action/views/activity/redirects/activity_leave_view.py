@@ -4,10 +4,9 @@ from django.http import HttpRequest, HttpResponse
 from django.shortcuts import redirect
 from django.urls import reverse
 from django.views import View
-from googleapiclient.errors import HttpError
 
-from action.calendar import remove_event
-from action.utils import fetch_activity_status
+from action.calendar import enqueue_activity_event_sync
+from action.utils import set_activity_status_flag
 from action.utils.calendar_utils import user_is_login_with_google
 
 
@@ -24,18 +23,11 @@ class ActivityLeaveView(LoginRequiredMixin, View):
     """
 
     def get(self, request: HttpRequest, activity_id: int) -> HttpResponse:
-        activity_status = fetch_activity_status(request, activity_id)
-
-        if activity_status.is_participated:
-            activity_status.is_participated = False
-            activity_status.save()
+        if set_activity_status_flag(request.user, activity_id, 'is_participated', False):
             messages.success(request, "You have left this activity.")
 
             if user_is_login_with_google(request.user):
-                try:
-                    remove_event(request, activity_id)  # Remove activity from user calendar
-                except HttpError:
-                    messages.info(request, "Calendar is not working, please Login again.")
+                enqueue_activity_event_sync(request.user, activity_id)  # Remove activity from user calendar
 
         else:
             messages.info(request, "You are not currently participating in this activity.")
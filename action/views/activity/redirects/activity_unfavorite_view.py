@@ -5,7 +5,7 @@ from django.shortcuts import redirect
 from django.urls import reverse
 from django.views import View
 
-from action.utils import fetch_activity_status
+from action.utils import set_activity_status_flag
 
 
 class ActivityUnfavoriteView(LoginRequiredMixin, View):
@@ -21,11 +21,7 @@ class ActivityUnfavoriteView(LoginRequiredMixin, View):
     """
 
     def get(self, request: HttpRequest, activity_id: int) -> HttpResponse:
-        activity_status = fetch_activity_status(request, activity_id)
-
-        if activity_status.is_favorited:
-            activity_status.is_favorited = False
-            activity_status.save()
+        if set_activity_status_flag(request.user, activity_id, 'is_favorited', False):
             messages.success(request, "You have unfavorited this activity.")
         else:
             messages.info(request, "You have not currently favorited this activity.")
@@ -3,7 +3,7 @@ from django.contrib.auth.mixins import LoginRequiredMixin
 from django.http import HttpResponse
 from django.views import generic
 
-from action.calendar import update_event
+from action.calendar import enqueue_user_events_sync
 from action.utils.calendar_utils import user_is_login_with_google
 
 
@@ -27,8 +27,7 @@ class CalendarView(LoginRequiredMixin, generic.TemplateView):
             - `HttpResponse`: The HTTP response for rendering the calendar template.
         """
         if user_is_login_with_google(self.request.user):
-            for each_activity in self.request.user.participated_activity:
-                update_event(self.request, each_activity.id)
+            enqueue_user_events_sync(self.request.user)  # Only changed activities are sent, in batches
         else:
             # If the user doesn't have a Google social account
             messages.warning(self.request, "Please login to Google to use the calendar feature.")
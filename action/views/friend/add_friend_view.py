@@ -17,7 +17,7 @@ def get_user_friend_add_list(user: User) -> QuerySet[User]:
         QuerySet[User]: A queryset of users that the specified user can send friend requests to.
     """
     # Exclude yourself from the list and people you are already friends with
-    add_list = User.objects.exclude(id=user.id).exclude(id__in=user.friends)
+    add_list = User.objects.exclude(id=user.id).exclude(id__in=user.friend_ids)
     return add_list
 
 
@@ -21,4 +21,4 @@ class FriendListView(LoginRequiredMixin, generic.ListView):
         query = self.request.GET.get('q')
         user_friend: QuerySet[User] = self.request.user.friends.filter(username__icontains=query)
 
-        return user_friend.distinct()
+        return user_friend
@@ -20,7 +20,7 @@ class FriendRequestView(LoginRequiredMixin, generic.ListView):
         """
         query = self.request.GET.get('q')
 
-        friend_request = FriendStatus.objects.filter(
+        friend_request = FriendStatus.objects.select_related('sender').filter(
             receiver=self.request.user,
             request_status='Pending'
         )
@@ -3,7 +3,7 @@ from django.contrib import messages
 from django.shortcuts import redirect
 from django.urls import reverse
 from django.views import View
-from django.http import HttpRequest, HttpResponse
+from django.http import Http404, HttpRequest, HttpResponse
 from action import utils
 
 
@@ -20,14 +20,11 @@ class AcceptFriendRequestView(LoginRequiredMixin, View):
     """
 
     def get(self, request: HttpRequest, friend_id: int) -> HttpResponse:
-        friend_status = utils.fetch_friend_status(request, friend_id)
-
-        if friend_status.is_friend:
+        if utils.accept_friend_request(request.user, friend_id):
+            messages.success(request, "You are now friend with this person.")
+        elif utils.are_friends(request.user, friend_id):
             messages.warning(request, "You are already friend with this person.")
         else:
-            friend_status.request_status = 'Accepted'
-            friend_status.is_friend = True
-            friend_status.save()
-            messages.success(request, "You are now friend with this person.")
+            raise Http404("User does not exist.")
 
         return redirect(reverse("action:request_view"))
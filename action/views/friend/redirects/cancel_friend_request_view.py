@@ -20,12 +20,9 @@ class CancelFriendRequestView(LoginRequiredMixin, View):
     """
 
     def get(self, request: HttpRequest, friend_id: int) -> HttpResponse:
-        friend_status = utils.fetch_friend_status(request, friend_id)
-
-        if friend_status.request_status == 'Pending' and request.user == friend_status.sender:
-            friend_status.delete()
+        if utils.cancel_friend_request(request.user, friend_id):
             messages.success(request, "Request cancelled.")
-        elif friend_status.is_friend:
+        elif utils.are_friends(request.user, friend_id):
             messages.warning(request, "You are already friends with that person.")
         else:
             messages.warning(request, "There is no friend request for that person.")
@@ -20,12 +20,10 @@ class DeclineFriendRequestView(LoginRequiredMixin, View):
     """
 
     def get(self, request: HttpRequest, friend_id: int) -> HttpResponse:
-        friend_status = utils.fetch_friend_status(request, friend_id)
-
-        if friend_status.is_friend:
+        if not utils.decline_friend_request(request.user, friend_id) and \
+                utils.are_friends(request.user, friend_id):
             messages.warning(request, "You are already friend with this person.")
         else:
-            friend_status.delete()
             messages.success(request, "You have declined this person.")
 
         return redirect(reverse("action:request_view"))
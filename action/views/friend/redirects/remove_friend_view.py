@@ -20,12 +20,7 @@ class RemoveFriendView(LoginRequiredMixin, View):
     """
 
     def get(self, request: HttpRequest, friend_id: int) -> HttpResponse:
-        friend_status = utils.fetch_friend_status(request, friend_id)
-
-        if friend_status.is_friend:
-            friend_status.request_status = None
-            friend_status.is_friend = False
-            friend_status.save()
+        if utils.remove_friend(request.user, friend_id):
             messages.success(request, "This person is no longer friend with you.")
         else:
             messages.warning(request, "This person is not friend with you.")
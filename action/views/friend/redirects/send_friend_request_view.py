@@ -3,8 +3,9 @@ from django.contrib import messages
 from django.shortcuts import redirect
 from django.urls import reverse
 from django.views import View
-from django.http import HttpRequest, HttpResponse
+from django.http import Http404, HttpRequest, HttpResponse
 from action import utils
+from action.models import FriendStatus
 
 
 class SendFriendRequestView(LoginRequiredMixin, View):
@@ -20,17 +21,20 @@ class SendFriendRequestView(LoginRequiredMixin, View):
     """
 
     def get(self, request: HttpRequest, friend_id: int) -> HttpResponse:
-        friend_status = utils.fetch_friend_status(request, friend_id)
+        if utils.send_friend_request(request.user, friend_id):
+            messages.success(request, "Request Sent.")
+            return redirect(reverse("action:add_view"))
+
+        # Nothing was sent, find out why
+        friend_status = FriendStatus.between(request.user.id, friend_id).first()
+        if friend_status is None:
+            raise Http404("User does not exist.")
 
         if friend_status.is_friend:
             messages.warning(request, "You are already friend with this person.")
-        elif friend_status.sender == request.user and friend_status.request_status == "Pending":
+        elif friend_status.sender == request.user:
             messages.warning(request, "You have already sent a friend request to that person.")
-        elif friend_status.receiver == request.user and friend_status.request_status == "Pending":
-            messages.warning(request, "That person has already sent a friend request to you.")
         else:
-            friend_status.request_status = "Pending"
-            friend_status.save()
-            messages.success(request, "Request Sent.")
+            messages.warning(request, "That person has already sent a friend request to you.")
 
         return redirect(reverse("action:add_view"))
@@ -0,0 +1,33 @@
+from django.core.files.storage import default_storage
+from django.http import FileResponse, Http404, HttpRequest
+from django.utils.cache import patch_cache_control
+from django.views import View
+
+from action.utils.image_store import IMAGE_CACHE_SECONDS, IMAGE_SIZES, \
+    get_image_name, is_image_hash
+
+
+class ImageView(View):
+    """
+    View for serving a stored image in one of its pre-rendered sizes.
+
+    Args:
+        request (HttpRequest): The HTTP request object.
+        image_hash (str): The hash of the stored image.
+        size (str): One of the sizes in IMAGE_SIZES.
+
+    Returns:
+        FileResponse: The image, cacheable for a year since its content never changes.
+    """
+
+    def get(self, request: HttpRequest, image_hash: str, size: str) -> FileResponse:
+        if not is_image_hash(image_hash) or size not in IMAGE_SIZES:
+            raise Http404("Image does not exist.")
+
+        name = get_image_name(image_hash, size)
+        if not default_storage.exists(name):
+            raise Http404("Image does not exist.")
+
+        response = FileResponse(default_storage.open(name, 'rb'), content_type='image/jpeg')
+        patch_cache_control(response, public=True, max_age=IMAGE_CACHE_SECONDS, immutable=True)
+        return response
@@ -1,15 +1,21 @@
 from typing import Any
+from urllib.parse import parse_qsl, urlencode
+
 from django.contrib import messages
 from django.db.models import QuerySet
 from django.http import HttpRequest, HttpResponse
 from django.shortcuts import redirect
+from django.utils.decorators import method_decorator
 from django.views import generic
 
 from action.models import Category
 from action.models.activity import Activity
+from action.utils.cache_utils import cache_anonymous_page
+from action.utils.pagination_utils import paginate_keyset
 from action.utils.search_utils import BaseSearcher
 
 TAG_OPTIONS = [
+    ('text', 'Everything'),
     ('title', 'Title'),
     ('owner', 'Owner'),
     ('categories', 'Categories'),
@@ -20,6 +26,11 @@ TAG_OPTIONS = [
 # Some tag requires login
 LOGIN_REQUIRED_TAG_LIST = ['registered', 'favorited', 'friend_joined']
 
+ACTIVITIES_PER_PAGE = 12
+
+# URL parameters used for moving between pages
+PAGE_PARAMETERS = ['page', 'cursor']
+
 
 def guest_access_login_tag(request: HttpRequest) -> bool:
     """Check if the user has guest access to a tag that requires login."""
@@ -27,6 +38,24 @@ def guest_access_login_tag(request: HttpRequest) -> bool:
     return tag in LOGIN_REQUIRED_TAG_LIST and not request.user.is_authenticated
 
 
+def get_page_query_string(request: HttpRequest) -> str:
+    """
+    Get the search parameters of the request without the page parameters.
+
+    The original query string is used, since the paired tag and q parameters
+    must be kept in order for the next page to run the same search.
+
+    Args:
+        request (HttpRequest): The HTTP request object.
+
+    Returns:
+        str: The query string to prefix page links with.
+    """
+    params = parse_qsl(request.META.get('QUERY_STRING', ''), keep_blank_values=True)
+    return urlencode([(key, value) for key, value in params if key not in PAGE_PARAMETERS])
+
+
+@method_decorator(cache_anonymous_page, name='dispatch')
 class IndexView(generic.ListView):
     """
     View for displaying a list of activities.
@@ -38,6 +67,7 @@ class IndexView(generic.ListView):
 
     template_name = 'action/index.html'
     context_object_name = 'activity_list'
+    paginate_by = ACTIVITIES_PER_PAGE
 
     def get(self, request, *args, **kwargs) -> HttpResponse:
         """
@@ -63,7 +93,24 @@ class IndexView(generic.ListView):
     def get_queryset(self) -> QuerySet[Activity]:
         """Return the queryset of activities based on the applied filters."""
         searcher = BaseSearcher(self.request)
-        return searcher.get_index_query()
+        return searcher.get_index_query().with_my_status(self.request.user)
+
+    def paginate_queryset(self, queryset, page_size):
+        """
+        Paginate the activities by page number, or by keyset cursor when one is given.
+
+        The page links of the template are numbered, which the database reaches with OFFSET.
+        Keyset pages start from a URL with a cursor parameter, then link to the next one.
+
+        Returns:
+            tuple: (paginator, page, object_list, is_paginated) as expected by ListView.
+        """
+        cursor = self.request.GET.get('cursor')
+        if cursor is None:  # Classic page numbers
+            return super().paginate_queryset(queryset, page_size)
+
+        page = paginate_keyset(queryset, cursor, page_size)
+        return None, page, page.object_list, True
 
     def get_context_data(self, **kwargs) -> dict[str, Any]:
         """Return the context data with categories and tags."""
@@ -72,4 +119,5 @@ class IndexView(generic.ListView):
         # Add the tag options to the context
         context['categories'] = Category.objects.all()
         context['tags'] = TAG_OPTIONS
+        context['page_query'] = get_page_query_string(self.request)
         return context
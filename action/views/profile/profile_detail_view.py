@@ -2,9 +2,11 @@ from django.contrib import messages
 from django.db.models import QuerySet
 from django.http import HttpRequest, HttpResponse
 from django.shortcuts import render, redirect
+from django.utils.decorators import method_decorator
 from django.views import generic
 
 from action.models import User
+from action import utils
 
 
 def get_profile(request, user_id) -> QuerySet[User]:
@@ -42,6 +44,7 @@ def guest_view_their_profile(request, user_id) -> bool:
     return user_id is None and request.user.id is None
 
 
+@method_decorator(utils.conditional_page(utils.get_profile_state), name='dispatch')
 class ProfileDetailView(generic.ListView):
     """View for displaying user profiles."""
 
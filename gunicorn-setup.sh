@@ -8,5 +8,8 @@ echo 10 > /proc/sys/vm/swappiness
 swapon /swapfile
 echo 1 > /proc/sys/vm/overcommit_memory
 
+# Run the background task worker
+python manage.py run_worker &
+
 # Run Gunicorn
 gunicorn --bind :8000 --workers 2 mysite.wsgi
\ No newline at end of file
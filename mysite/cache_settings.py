@@ -0,0 +1,52 @@
+import logging
+import os
+import sys
+import tempfile
+from urllib.parse import urlparse
+
+from decouple import config
+
+LOCAL_MEMORY_CACHE = 'django.core.cache.backends.locmem.LocMemCache'
+FILE_CACHE = 'django.core.cache.backends.filebased.FileBasedCache'
+REDIS_CACHE = 'django.core.cache.backends.redis.RedisCache'
+DUMMY_CACHE = 'django.core.cache.backends.dummy.DummyCache'
+
+# Directory of the default cache, shared by the web processes of the host
+DEFAULT_CACHE_DIR = os.path.join(tempfile.gettempdir(), 'ku_active_cache')
+
+
+def configure_cache_settings():
+    """
+    Configure the cache of the Django application from the CACHE_URL environment variable.
+
+    Returns:
+        dict: The CACHES setting.
+
+    Note:
+        - If running tests (identified by the 'test' argument in sys.argv), nothing is cached,
+          so that pages cached by one test are never served to another.
+        - redis:// and rediss:// URLs use Redis, or any server speaking its protocol.
+          The redis package must be installed.
+        - file:///path URLs store the cache in that directory, shared by the processes of a host.
+        - Without CACHE_URL, the cache is stored in DEFAULT_CACHE_DIR. The cached pages are made
+          stale by the process handling a change, so every web process must share the cache.
+        - locmem:// gives each process its own cache in memory, only right with a single process.
+    """
+    testing = sys.argv[1:2] == ['test']
+    if testing:
+        return {'default': {'BACKEND': DUMMY_CACHE}}
+
+    cache_url = config('CACHE_URL', default='')
+    scheme = urlparse(cache_url).scheme
+
+    if scheme in ('redis', 'rediss'):
+        logging.info('Using the Redis cache.')
+        return {'default': {'BACKEND': REDIS_CACHE, 'LOCATION': cache_url}}
+    if scheme == 'file':
+        return {'default': {'BACKEND': FILE_CACHE, 'LOCATION': urlparse(cache_url).path}}
+    if scheme == 'locmem':
+        return {'default': {'BACKEND': LOCAL_MEMORY_CACHE}}
+    if cache_url:
+        logging.warning('Invalid CACHE_URL. Falling back to the file cache.')
+
+    return {'default': {'BACKEND': FILE_CACHE, 'LOCATION': DEFAULT_CACHE_DIR}}
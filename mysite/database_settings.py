@@ -3,7 +3,9 @@
 # in the same way as for standalone Postgres.
 import dj_database_url
 import logging
+import os
 import sys
+import tempfile
 
 from decouple import config
 
@@ -21,7 +23,8 @@ def configure_database_settings(BASE_DIR):
 
     Note:
         - If running tests (identified by the 'test' argument in sys.argv), the function returns
-          settings for the local SQLite database.
+          settings for the TEST_DATABASE_URL database if it is set, such as a PostgreSQL server
+          in CI, or else for a SQLite database file in the temp directory.
         - If a valid DATABASE_URL environment variable is found, it configures the database
           using the settings from the DATABASE_URL.
         - If DATABASE_URL is not found or invalid, it falls back to the local SQLite database.
@@ -31,11 +34,19 @@ def configure_database_settings(BASE_DIR):
         'default': {
             'ENGINE': 'django.db.backends.sqlite3',
             'NAME': BASE_DIR / 'db.sqlite3',
+            # A file, unlike the default in-memory database, can be shared by the threads of
+            # the concurrency tests. It is named after the process, so a file left by an
+            # interrupted run never stops the next one at a prompt.
+            'TEST': {'NAME': os.path.join(tempfile.gettempdir(), f'ku_active_test_{os.getpid()}.sqlite3')},
         }
     }
 
     testing = sys.argv[1:2] == ['test']
     if testing:
+        test_database_url = config("TEST_DATABASE_URL", default=None)
+        if test_database_url:
+            logging.debug('Running tests on the TEST_DATABASE_URL database.')
+            return {'default': dj_database_url.parse(test_database_url)}
         logging.debug('Running tests on the local database.')
         return local_database
 
@@ -13,6 +13,7 @@ import os
 from pathlib import Path
 from decouple import config, Csv
 
+from mysite.cache_settings import configure_cache_settings
 from mysite.database_settings import configure_database_settings
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
@@ -63,6 +64,12 @@ MIDDLEWARE = [
     'action.middleware.UpdateSessionMiddleware'
 ]
 
+# Record the queries of every request, logging N+1 queries and sending the count and time to the
+# browser in a Server-Timing header, for development only by default
+QUERY_BUDGET_MIDDLEWARE = config('QUERY_BUDGET_MIDDLEWARE', default=DEBUG, cast=bool)
+if QUERY_BUDGET_MIDDLEWARE:
+    MIDDLEWARE.insert(0, 'action.middleware.QueryBudgetMiddleware')
+
 ROOT_URLCONF = 'mysite.urls'
 
 TEMPLATES = [
@@ -88,6 +95,13 @@ WSGI_APPLICATION = 'mysite.wsgi.application'
 
 DATABASES = configure_database_settings(BASE_DIR)
 
+# Cache
+
+CACHES = configure_cache_settings()
+
+# Seconds an anonymous page is served from the cache, see action/utils/cache_utils.py
+PAGE_CACHE_TIMEOUT = config('PAGE_CACHE_TIMEOUT', default=300, cast=int)
+
 # Password validation
 # https://docs.djangoproject.com/en/4.2/ref/settings/#auth-password-validators
 
@@ -152,6 +166,11 @@ USE_TZ = True
 
 STATIC_URL = 'static/'
 
+# Uploaded images, stored by content hash (see action/utils/image_store.py)
+
+MEDIA_URL = 'media/'
+MEDIA_ROOT = config('MEDIA_ROOT', default=BASE_DIR / 'media')
+
 # Default primary key field type
 # https://docs.djangoproject.com/en/4.2/ref/settings/#default-auto-field
 
@@ -177,6 +196,9 @@ else:
     MIDDLEWARE.append('whitenoise.middleware.WhiteNoiseMiddleware')
     STATIC_ROOT = BASE_DIR / "staticfiles"
     STORAGES = {
+        "default": {
+            "BACKEND": "django.core.files.storage.FileSystemStorage",
+        },
         "staticfiles": {
             "BACKEND":
                 "whitenoise.storage.CompressedManifestStaticFilesStorage",